@@ -20,7 +20,7 @@ from alembic import context
 # Ensure all models are imported so their metadata is registered on Base.
 from app.core.config import settings
 from app.db.session import Base
-from app.models import user, project, task, notification, rbac, activity  # noqa: F401
+from app.models import user, project, task, notification, rbac, activity, employee_stats, review_job, ai_review_cache, brief_snapshot, storage_upload, stored_object  # noqa: F401
 
 # ── Alembic Config ────────────────────────────────────────────────────────────
 config = context.config
@@ -0,0 +1,42 @@
+"""Add notification_outbox table for asynchronous e-mail delivery
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'notification_outbox',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('notification_id', UUID(as_uuid=True), sa.ForeignKey('notifications.id'), nullable=True),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id'), nullable=True),
+        sa.Column('to_email', sa.String(), nullable=True),
+        sa.Column('subject', sa.String(), nullable=False),
+        sa.Column('body', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        'ix_notification_outbox_status_next_attempt',
+        'notification_outbox',
+        ['status', 'next_attempt_at'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_notification_outbox_status_next_attempt', table_name='notification_outbox')
+    op.drop_table('notification_outbox')
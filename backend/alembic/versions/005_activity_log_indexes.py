@@ -0,0 +1,43 @@
+"""Composite indexes for keyset pagination and entity timelines on activity_logs
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+_INDEXES = [
+    ('ix_activity_logs_created_at_id', ['created_at', 'id']),
+    ('ix_activity_logs_user_created_at', ['user_id', 'created_at', 'id']),
+    ('ix_activity_logs_entity_created_at', ['entity_type', 'entity_id', 'created_at']),
+]
+
+
+def upgrade():
+    # CONCURRENTLY keeps activity_logs writable while the indexes build;
+    # it cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        for name, columns in _INDEXES:
+            op.create_index(
+                name,
+                'activity_logs',
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(_INDEXES):
+            op.drop_index(
+                name,
+                table_name='activity_logs',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,51 @@
+"""Add employee_stats rollup table and index task_submissions.submitted_by
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+
+After upgrading, populate the table once with:
+    python -m app.services.employee_stats_service backfill
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'employee_stats',
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('total_tasks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completed_tasks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('on_time_tasks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('ai_score_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('ai_score_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    # CONCURRENTLY keeps task_submissions writable while the index builds;
+    # it cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_task_submissions_submitted_by',
+            'task_submissions',
+            ['submitted_by'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_task_submissions_submitted_by',
+            table_name='task_submissions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_table('employee_stats')
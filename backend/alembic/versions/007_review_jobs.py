@@ -0,0 +1,38 @@
+"""Add review_jobs queue for asynchronous submission reviews
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'review_jobs',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('submission_id', UUID(as_uuid=True), sa.ForeignKey('task_submissions.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('status', sa.String(), nullable=False, server_default='queued'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('run_after', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_review_jobs_submission_id', 'review_jobs', ['submission_id'])
+    op.create_index('ix_review_jobs_status_run_after', 'review_jobs', ['status', 'run_after'])
+
+
+def downgrade():
+    op.drop_index('ix_review_jobs_status_run_after', table_name='review_jobs')
+    op.drop_index('ix_review_jobs_submission_id', table_name='review_jobs')
+    op.drop_table('review_jobs')
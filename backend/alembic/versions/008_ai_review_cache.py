@@ -0,0 +1,38 @@
+"""Add ai_review_cache for reusing AI verdicts on identical resubmissions
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+# Same storage as app.db.types.JSONDocument: JSONB on PostgreSQL, JSON elsewhere
+_JSON = sa.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+
+
+def upgrade():
+    op.create_table(
+        'ai_review_cache',
+        sa.Column('cache_key', sa.String(64), primary_key=True),
+        sa.Column('workflow_version', sa.String(), nullable=False),
+        sa.Column('files_hash', sa.String(64), nullable=False),
+        sa.Column('brief_hash', sa.String(64), nullable=False),
+        sa.Column('result', _JSON, nullable=False),
+        sa.Column('raw_response', _JSON, nullable=True),
+        sa.Column('hits', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index('ix_ai_review_cache_expires_at', 'ai_review_cache', ['expires_at'])
+
+
+def downgrade():
+    op.drop_index('ix_ai_review_cache_expires_at', table_name='ai_review_cache')
+    op.drop_table('ai_review_cache')
@@ -0,0 +1,128 @@
+"""Move submission brief snapshots into content-addressed brief_snapshots
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18
+
+task_submissions.brief_snapshot (full text per attempt) is replaced by
+brief_snapshot_hash → brief_snapshots.hash. Existing texts are deduplicated
+in batches and the bytes before/after are printed at the end.
+"""
+import hashlib
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+_BATCH = 500
+_COMPRESS_MIN_BYTES = 256
+
+
+def _encode(text):
+    # Same encoding as services/brief_snapshot_service.encode_snapshot (frozen here)
+    raw = text.encode("utf-8")
+    compression, data = "none", raw
+    if len(raw) >= _COMPRESS_MIN_BYTES:
+        packed = zlib.compress(raw, 6)
+        if len(packed) < len(raw):
+            compression, data = "zlib", packed
+    return hashlib.sha256(raw).hexdigest(), compression, data, len(raw)
+
+
+def upgrade():
+    op.create_table(
+        'brief_snapshots',
+        sa.Column('hash', sa.String(64), primary_key=True),
+        sa.Column('compression', sa.String(), nullable=False, server_default='none'),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('size_bytes', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.add_column('task_submissions', sa.Column('brief_snapshot_hash', sa.String(64), nullable=True))
+
+    conn = op.get_bind()
+    snapshots = sa.table(
+        'brief_snapshots',
+        sa.column('hash'), sa.column('compression'), sa.column('data'), sa.column('size_bytes'),
+    )
+    submissions = sa.table(
+        'task_submissions',
+        sa.column('id'), sa.column('brief_snapshot'), sa.column('brief_snapshot_hash'),
+    )
+
+    seen = set()
+    rows_total = bytes_before = bytes_after = 0
+    last_id = None
+    while True:
+        query = (
+            sa.select(submissions.c.id, submissions.c.brief_snapshot)
+            .where(submissions.c.brief_snapshot.isnot(None))
+            .order_by(submissions.c.id)
+            .limit(_BATCH)
+        )
+        if last_id is not None:
+            query = query.where(submissions.c.id > last_id)
+        batch = conn.execute(query).fetchall()
+        if not batch:
+            break
+
+        new_snapshots, updates = [], []
+        for sub_id, text in batch:
+            digest, compression, data, size = _encode(text)
+            rows_total += 1
+            bytes_before += size
+            if digest not in seen:
+                seen.add(digest)
+                bytes_after += len(data)
+                new_snapshots.append(
+                    {"hash": digest, "compression": compression, "data": data, "size_bytes": size}
+                )
+            updates.append({"b_id": sub_id, "b_hash": digest})
+
+        if new_snapshots:
+            conn.execute(snapshots.insert(), new_snapshots)
+        conn.execute(
+            submissions.update()
+            .where(submissions.c.id == sa.bindparam("b_id"))
+            .values(brief_snapshot_hash=sa.bindparam("b_hash")),
+            updates,
+        )
+        last_id = batch[-1][0]
+
+    op.create_foreign_key(
+        'fk_task_submissions_brief_snapshot_hash', 'task_submissions', 'brief_snapshots',
+        ['brief_snapshot_hash'], ['hash'],
+    )
+    op.create_index('ix_task_submissions_brief_snapshot_hash', 'task_submissions', ['brief_snapshot_hash'])
+    op.drop_column('task_submissions', 'brief_snapshot')
+
+    reclaimed = bytes_before - bytes_after
+    pct = (reclaimed / bytes_before * 100) if bytes_before else 0.0
+    print(
+        f"[009] brief_snapshots: {rows_total} submission snapshots -> {len(seen)} unique; "
+        f"{bytes_before} bytes -> {bytes_after} bytes ({reclaimed} reclaimed, {pct:.1f}%)"
+    )
+
+
+def downgrade():
+    op.add_column('task_submissions', sa.Column('brief_snapshot', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    for digest, compression, data in conn.execute(sa.text(
+        "SELECT hash, compression, data FROM brief_snapshots"
+    )):
+        raw = zlib.decompress(data) if compression == "zlib" else bytes(data)
+        conn.execute(
+            sa.text("UPDATE task_submissions SET brief_snapshot = :text WHERE brief_snapshot_hash = :hash"),
+            {"text": raw.decode("utf-8"), "hash": digest},
+        )
+
+    op.drop_index('ix_task_submissions_brief_snapshot_hash', table_name='task_submissions')
+    op.drop_constraint('fk_task_submissions_brief_snapshot_hash', 'task_submissions', type_='foreignkey')
+    op.drop_column('task_submissions', 'brief_snapshot_hash')
+    op.drop_table('brief_snapshots')
@@ -0,0 +1,119 @@
+"""Convert JSON-in-TEXT columns on projects and task_submissions to JSONB
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18
+
+Online on PostgreSQL: no long ACCESS EXCLUSIVE lock and no table rewrite
+under lock.
+
+  1. Add a shadow JSONB column next to each TEXT column. A BEFORE INSERT OR
+     UPDATE trigger keeps the shadows in step with writes from the running
+     (pre-upgrade) application.
+  2. Backfill the shadows in committed batches of _BATCH rows.
+  3. In one short transaction, drop the trigger, drop the TEXT columns and
+     rename the shadows into place.
+
+Text that is not valid JSON (e.g. a webhook body that was stored with str())
+becomes a JSON string rather than failing the migration.
+
+Deploy the application version that expects JSON documents right after this
+migration finishes. Other dialects store JSON as text already, so nothing
+runs there.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+_BATCH = 1000
+_COLUMNS = {
+    'projects': ['brief_history', 'next_question', 'saved_answers'],
+    'task_submissions': [
+        'links', 'file_paths', 'watermarked_file_paths', 'webhook_response', 'ai_analysis_result',
+    ],
+}
+
+
+def _shadow(column):
+    return f'{column}__jsonb'
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION pfe_try_jsonb(value text) RETURNS jsonb
+        LANGUAGE plpgsql IMMUTABLE AS $$
+        BEGIN
+            RETURN value::jsonb;
+        EXCEPTION WHEN others THEN
+            RETURN to_jsonb(value);
+        END $$
+    """)
+    for table, columns in _COLUMNS.items():
+        for column in columns:
+            op.add_column(table, sa.Column(_shadow(column), sa.dialects.postgresql.JSONB(), nullable=True))
+        assignments = '; '.join(f'NEW.{_shadow(c)} := pfe_try_jsonb(NEW.{c})' for c in columns)
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION pfe_sync_{table}_jsonb() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                {assignments};
+                RETURN NEW;
+            END $$
+        """)
+        op.execute(f"""
+            CREATE TRIGGER pfe_sync_{table}_jsonb BEFORE INSERT OR UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION pfe_sync_{table}_jsonb()
+        """)
+
+    # Each batch commits on its own so row locks are held only briefly
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        for table, columns in _COLUMNS.items():
+            assignments = ', '.join(f'{_shadow(c)} = pfe_try_jsonb({c})' for c in columns)
+            last_id, total = None, 0
+            while True:
+                rows = conn.execute(sa.text(f"""
+                    UPDATE {table} SET {assignments}
+                    WHERE id IN (
+                        SELECT id FROM {table}
+                        WHERE (CAST(:last_id AS uuid) IS NULL OR id > CAST(:last_id AS uuid))
+                        ORDER BY id LIMIT {_BATCH}
+                    )
+                    RETURNING id
+                """), {"last_id": last_id}).fetchall()
+                if not rows:
+                    break
+                total += len(rows)
+                last_id = str(max(r[0] for r in rows))
+            print(f"[010] {table}: backfilled {total} rows")
+
+    # Swap: metadata-only changes, under a bounded lock wait
+    op.execute("SET LOCAL lock_timeout = '10s'")
+    for table, columns in _COLUMNS.items():
+        op.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+        op.execute(f"DROP TRIGGER pfe_sync_{table}_jsonb ON {table}")
+        op.execute(f"DROP FUNCTION pfe_sync_{table}_jsonb()")
+        for column in columns:
+            op.drop_column(table, column)
+            op.alter_column(table, _shadow(column), new_column_name=column)
+    op.execute("DROP FUNCTION pfe_try_jsonb(text)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # Offline: rewrites both tables
+    for table, columns in _COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table, column,
+                type_=sa.Text(),
+                postgresql_using=f'{column}::text',
+            )
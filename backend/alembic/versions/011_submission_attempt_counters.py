@@ -0,0 +1,96 @@
+"""Atomic per-(task, submitter) attempt counter and unique attempt numbers
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-18
+
+attempt_number used to be COUNT(*) + 1, which concurrent submits could
+duplicate. Existing duplicates are renumbered in created_at order before the
+unique constraint is added. On PostgreSQL the index is built CONCURRENTLY
+and then attached as the constraint, so submissions stay writable. A build
+that failed part-way (e.g. a duplicate committed during it) leaves an
+INVALID index behind; re-running the upgrade drops and rebuilds it. Other
+dialects get a plain unique index.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+_INDEX = 'uq_task_submissions_attempt'
+
+
+def _index_valid(conn):
+    """pg_index.indisvalid for the attempt index, or None if it does not exist."""
+    return conn.execute(
+        sa.text(
+            "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name"
+        ),
+        {"name": _INDEX},
+    ).scalar()
+
+
+def upgrade():
+    # Renumber only the (task, submitter) groups that contain a duplicate
+    op.execute("""
+        UPDATE task_submissions AS s
+        SET attempt_number = r.rn
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY task_id, submitted_by ORDER BY created_at, id
+            ) AS rn
+            FROM task_submissions
+            WHERE (task_id, submitted_by) IN (
+                SELECT task_id, submitted_by FROM task_submissions
+                GROUP BY task_id, submitted_by, attempt_number
+                HAVING COUNT(*) > 1
+            )
+        ) AS r
+        WHERE s.id = r.id AND s.attempt_number <> r.rn
+    """)
+
+    op.create_table(
+        'submission_attempt_counters',
+        sa.Column('task_id', UUID(as_uuid=True), sa.ForeignKey('tasks.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('submitted_by', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('last_attempt', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.execute("""
+        INSERT INTO submission_attempt_counters (task_id, submitted_by, last_attempt)
+        SELECT task_id, submitted_by, MAX(attempt_number)
+        FROM task_submissions
+        GROUP BY task_id, submitted_by
+    """)
+
+    columns = ['task_id', 'submitted_by', 'attempt_number']
+    if op.get_bind().dialect.name != 'postgresql':
+        op.create_index(_INDEX, 'task_submissions', columns, unique=True)
+        return
+
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        if _index_valid(conn) is False:
+            op.drop_index(_INDEX, table_name='task_submissions', postgresql_concurrently=True)
+        op.create_index(
+            _INDEX,
+            'task_submissions',
+            columns,
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    op.execute(f"ALTER TABLE task_submissions ADD CONSTRAINT {_INDEX} UNIQUE USING INDEX {_INDEX}")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_constraint(_INDEX, 'task_submissions', type_='unique')
+    else:
+        op.drop_index(_INDEX, table_name='task_submissions')
+    op.drop_table('submission_attempt_counters')
@@ -0,0 +1,34 @@
+"""Add storage_uploads for resumable (TUS) deliverable uploads
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'storage_uploads',
+        sa.Column('resume_key', sa.String(), primary_key=True),
+        sa.Column('bucket', sa.String(), nullable=False),
+        sa.Column('object_path', sa.String(), nullable=False),
+        sa.Column('upload_url', sa.Text(), nullable=False),
+        sa.Column('content_type', sa.String(), nullable=True),
+        sa.Column('total_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('offset', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index('ix_storage_uploads_updated_at', 'storage_uploads', ['updated_at'])
+
+
+def downgrade():
+    op.drop_index('ix_storage_uploads_updated_at', table_name='storage_uploads')
+    op.drop_table('storage_uploads')
@@ -0,0 +1,36 @@
+"""Add stored_objects, the content-hash index of storage objects
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-18
+
+Objects uploaded before this revision keep their timestamp/uuid paths and
+are not indexed; they are never shared, so deleting them stays unconditional.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'stored_objects',
+        sa.Column('bucket', sa.String(), nullable=False),
+        sa.Column('sha256', sa.String(64), nullable=False),
+        sa.Column('object_path', sa.String(), nullable=False),
+        sa.Column('content_type', sa.String(), nullable=True),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('last_referenced_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('bucket', 'sha256'),
+        sa.UniqueConstraint('bucket', 'object_path', name='uq_stored_objects_path'),
+    )
+
+
+def downgrade():
+    op.drop_table('stored_objects')
@@ -0,0 +1,37 @@
+"""Index workflow_image_callbacks by (status, expires_at) for the storage reconciler
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-18
+
+The reconciler expires stale pending_image tokens with a single
+UPDATE ... WHERE status = 'pending_image' AND expires_at < now(). It also
+filters terminal rows by status when purging them.
+"""
+from alembic import op
+
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_workflow_image_callbacks_status_expires_at',
+            'workflow_image_callbacks',
+            ['status', 'expires_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_workflow_image_callbacks_status_expires_at',
+            table_name='workflow_image_callbacks',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -3,7 +3,6 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from typing import Optional
-from uuid import UUID
 
 logger = logging.getLogger(__name__)
 
@@ -21,14 +20,12 @@ oauth2_scheme_optional = OAuth2PasswordBearer(
 
 
 def _validate_supabase_token(token: str):
-    """Validate a Supabase JWT by calling Supabase's auth service.
+    """Validate a Supabase JWT — locally when possible, see token_service.
     Returns (user_id: str, user_email: str) on success, raises HTTPException on failure."""
-    from app.services.supabase_client import supabase
+    from app.services.token_service import token_service
     try:
-        response = supabase.auth.get_user(token)
-        user_id = str(response.user.id)
-        user_email = response.user.email or ""
-        logger.info("[AUTH] Token valid — Supabase user_id=%s email=%s", user_id, user_email)
+        user_id, user_email = token_service.verify(token)
+        logger.debug("[AUTH] Token valid — Supabase user_id=%s email=%s", user_id, user_email)
         return user_id, user_email
     except Exception as e:
         logger.warning("[AUTH] Token validation failed: %s", e)
@@ -40,26 +37,10 @@ def _validate_supabase_token(token: str):
 
 
 def _lookup_user(db: Session, user_id: str, user_email: str) -> Optional[User]:
-    """Resolve a local User from a Supabase auth identity.
-
-    Primary lookup is by UUID (fast, correct for all users created after the
-    Supabase auth migration).  If that misses, fall back to email lookup so
-    that pre-migration users — whose local `users.id` was generated independently
-    and does not match their Supabase auth UUID — are still resolved correctly
-    after a password reset or token refresh.
-    """
-    user = db.query(User).filter(User.id == UUID(user_id)).first()
-    if user:
-        return user
-
-    if user_email:
-        logger.info("[AUTH] UUID lookup miss for %s, trying email fallback (%s)", user_id, user_email)
-        user = db.query(User).filter(User.email == user_email).first()
-        if user:
-            logger.info("[AUTH] Resolved user by email — local_id=%s, supabase_id=%s", user.id, user_id)
-        else:
-            logger.warning("[AUTH] Email fallback also missed for %s", user_email)
-    return user
+    """Resolve a local User from a Supabase auth identity (cached — see
+    user_service.resolve_auth_user for the UUID → email fallback order)."""
+    from app.services.user_service import user_service
+    return user_service.resolve_auth_user(db, user_id, user_email)
 
 
 def get_current_user(
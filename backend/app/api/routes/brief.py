@@ -1,7 +1,7 @@
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 import requests
 import uuid
 import json
@@ -9,6 +9,7 @@ from datetime import datetime
 from typing import Any, Dict
 
 from app.db.session import get_db
+from app.db.types import merge_json_keys
 from app.api.deps import get_current_user
 from app.models.user import User, UserRole
 from app.models.project import Project, ProjectStatus, BriefStatus
@@ -23,8 +24,8 @@ from app.schemas.brief import (
 )
 from app.core.config import settings
 from app.services.notification_service import notification_service
+from app.services.http_client import http_client
 from app.models.notification import NotificationType
-from app.services.email_service import email_service
 
 router = APIRouter()
 
@@ -95,7 +96,8 @@ def _call_n8n(
             detail="N8N Webhook URL not configured"
         )
     try:
-        resp = requests.post(
+        resp = http_client.post(
+            "n8n-brief",
             settings.N8N_BRIEF_WEBHOOK_URL,
             json=payload,
             headers=headers,
@@ -218,7 +220,7 @@ async def start_brief(
     )
     if existing:
         try:
-            schema = json.loads(existing.next_question)
+            schema = existing.next_question
             if schema.get("fields"):
                 logger.info("[Brief/Start] Reusing valid unfinished brief %s for client %s", existing.id, current_user.id)
                 return {"sessionId": str(existing.id), "n8n_response": schema}
@@ -238,7 +240,7 @@ async def start_brief(
         brief_status=BriefStatus.draft,
         client_id=current_user.id,
         manager_id=manager_id,
-        brief_history=json.dumps({"seed": request.seed.model_dump()})
+        brief_history={"seed": request.seed.model_dump()}
     )
     try:
         db.add(db_project)
@@ -295,7 +297,7 @@ async def start_brief(
         db_project.next_question = None
     else:
         db_project.brief_status = BriefStatus.in_progress
-        db_project.next_question = json.dumps(n8n_data)
+        db_project.next_question = n8n_data
 
     try:
         db.commit()
@@ -322,7 +324,8 @@ async def start_brief(
     if _is_complete(n8n_data) and db_project.client_id:
         client = db.query(User).filter(User.id == db_project.client_id).first()
         if client and client.email:
-            email_service.send_notification_email(
+            notification_service.enqueue_email(
+                db,
                 to_email=client.email,
                 subject="Brief submitted — AgencyFlow",
                 body=f"Your brief for '{db_project.name}' has been submitted successfully."
@@ -338,18 +341,24 @@ async def autosave_brief_answer(
     current_user: User = Depends(get_current_user)
 ):
     """Persist a single answered field so progress survives a lost session."""
-    db_project = db.query(Project).filter(Project.id == request.sessionId).first()
+    # The answers document itself is never loaded: the new field is merged in SQL
+    db_project = (
+        db.query(Project)
+        .options(load_only(Project.id, Project.client_id, Project.brief_status))
+        .filter(Project.id == request.sessionId)
+        .first()
+    )
     if not db_project:
         raise HTTPException(status_code=404, detail="Session not found")
     if db_project.client_id != current_user.id and current_user.role != UserRole.admin:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    saved = json.loads(db_project.saved_answers or "{}")
-    saved[request.fieldKey] = {
-        "question": request.question,
-        "answer": request.answer
-    }
-    db_project.saved_answers = json.dumps(saved)
+    merge_json_keys(db, db_project, "saved_answers", {
+        request.fieldKey: {
+            "question": request.question,
+            "answer": request.answer
+        }
+    })
 
     # Keep brief_status consistent — also unset 'interrupted' when the user resumes
     if db_project.brief_status in (BriefStatus.draft, BriefStatus.interrupted):
@@ -382,7 +391,7 @@ async def interrupt_brief(
         )
         return {"ok": True, "status": "ignored"}
 
-    saved = json.loads(db_project.saved_answers or "{}")
+    saved = dict(db_project.saved_answers or {})
 
     for field in request.allFields:
         key = field.get("key") or field.get("fieldKey")
@@ -393,7 +402,7 @@ async def interrupt_brief(
         elif key not in saved or saved[key].get("answer") == UNANSWERED_PLACEHOLDER:
             saved[key] = {"question": field, "answer": UNANSWERED_PLACEHOLDER}
 
-    db_project.saved_answers = json.dumps(saved)
+    db_project.saved_answers = saved
     db_project.brief_status = BriefStatus.interrupted
     db.commit()
 
@@ -408,7 +417,8 @@ async def interrupt_brief(
         }
         headers = {"X-Webhook-Secret": settings.N8N_WEBHOOK_SECRET or ""}
         try:
-            requests.post(
+            http_client.post(
+                "n8n-brief",
                 settings.N8N_BRIEF_WEBHOOK_URL,
                 json=interrupt_payload,
                 headers=headers,
@@ -432,25 +442,11 @@ async def get_brief_status(
     if db_project.client_id != current_user.id and current_user.role != UserRole.admin:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    n8n_schema = None
-    if db_project.next_question:
-        try:
-            n8n_schema = json.loads(db_project.next_question)
-        except Exception:
-            pass
-
-    saved_answers = {}
-    if db_project.saved_answers:
-        try:
-            saved_answers = json.loads(db_project.saved_answers)
-        except Exception:
-            pass
-
     return {
         "sessionId": str(db_project.id),
         "status": db_project.brief_status,
-        "n8n_response": n8n_schema,
-        "saved_answers": saved_answers,
+        "n8n_response": db_project.next_question,
+        "saved_answers": db_project.saved_answers or {},
         "brief_content": db_project.brief_content,
         "error": db_project.clarification_notes if db_project.brief_status == BriefStatus.failed_start else None,
     }
@@ -482,13 +478,9 @@ async def submit_brief_step(
         if not (isinstance(v, dict) and v.get("answer") == UNANSWERED_PLACEHOLDER)
     }
 
-    history = json.loads(db_project.brief_history or "{}")
-    history.setdefault("steps", []).append(clean_data)
-    db_project.brief_history = json.dumps(history)
-
-    existing_saved = json.loads(db_project.saved_answers or "{}")
-    existing_saved.update(clean_data)
-    db_project.saved_answers = json.dumps(existing_saved)
+    history = db_project.brief_history or {}
+    db_project.brief_history = {**history, "steps": [*history.get("steps", []), clean_data]}
+    db_project.saved_answers = {**(db_project.saved_answers or {}), **clean_data}
 
     db.commit()
 
@@ -502,7 +494,7 @@ async def submit_brief_step(
         "submission_id": idempotency_key,
         "sessionId": idempotency_key,
         "timestamp": datetime.now().isoformat(),
-        "source_json": json.loads(db_project.brief_history or "{}").get("seed", {}),
+        "source_json": (db_project.brief_history or {}).get("seed", {}),
         "data": clean_data,
         "context": {
             "source": "webapp_brief",
@@ -539,7 +531,7 @@ async def submit_brief_step(
     if is_clarification:
         # Workflow needs more information — save new question schema, do NOT mark as submitted
         db_project.brief_status = BriefStatus.clarification_requested
-        db_project.next_question = json.dumps(n8n_data)
+        db_project.next_question = n8n_data
         db.commit()
         return {"status": "clarification", "fields": n8n_data.get("fields", [])}
 
@@ -568,7 +560,8 @@ async def submit_brief_step(
     if db_project.client_id:
         client = db.query(User).filter(User.id == db_project.client_id).first()
         if client and client.email:
-            email_service.send_notification_email(
+            notification_service.enqueue_email(
+                db,
                 to_email=client.email,
                 subject="Brief submitted — AgencyFlow",
                 body=f"Your brief for '{db_project.name}' has been submitted successfully."
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
@@ -11,7 +12,7 @@ from app.schemas.activity import ActivityLogRead
 from app.services.user_service import user_service
 from app.services.rbac_service import rbac_service
 from app.services.task_service import task_service
-from app.services.activity_service import activity_service
+from app.services.activity_service import activity_service, InvalidCursorError
 from app.models.user import User, UserRole
 from app.models.rbac import Role, Permission
 from app.api.deps import get_current_user
@@ -57,7 +58,8 @@ def create_worker(
         db.commit()
     
     activity_service.create_log(
-        db, current_user.id, "create_worker", "user", new_user.id, {"email": new_user.email}
+        db, current_user.id, "create_worker", "user", new_user.id, {"email": new_user.email},
+        durable=True,
     )
     
     return new_user
@@ -86,9 +88,11 @@ def update_worker(
         
     db.commit()
     db.refresh(db_user)
+    user_service.invalidate_identity(db_user.id)
     
     activity_service.create_log(
-        db, current_user.id, "update_worker", "user", db_user.id, {"is_active": db_user.is_active}
+        db, current_user.id, "update_worker", "user", db_user.id, {"is_active": db_user.is_active},
+        durable=True,
     )
     
     return db_user
@@ -115,14 +119,145 @@ def list_permissions(db: Session = Depends(get_db)):
 
 @router.get("/logs", response_model=List[ActivityLogRead])
 def list_logs(
-    skip: int = 0, 
-    limit: int = 50, 
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    user_id: Optional[UUID] = None,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[UUID] = None,
+    action: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    """Newest-first activity logs. Pass the X-Next-Cursor response header back
+    as `cursor` to fetch the following page."""
     if current_user.role not in [UserRole.admin, UserRole.manager]:
         raise HTTPException(status_code=403, detail="Not authorized")
-    return activity_service.get_logs(db, skip, limit)
+    try:
+        logs, next_cursor = activity_service.get_logs_page(
+            db,
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            user_id=user_id,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            action=action,
+            since=since,
+            until=until,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return logs
+
+
+@router.get("/notification-metrics")
+def get_notification_metrics(
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.admin, UserRole.manager]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from app.services.notification_dispatcher import notification_dispatcher
+    return notification_dispatcher.get_metrics()
+
+
+@router.get("/dashboard-metrics")
+def get_dashboard_metrics(
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.admin, UserRole.manager]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from app.services.dashboard_service import dashboard_service
+    return dashboard_service.get_metrics()
+
+
+@router.get("/review-job-metrics")
+def get_review_job_metrics(
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.admin, UserRole.manager]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from app.services.review_job_service import review_job_service
+    return review_job_service.get_metrics()
+
+
+@router.get("/http-metrics")
+def get_http_metrics(
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.admin, UserRole.manager]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from app.services.http_client import http_client
+    return http_client.get_metrics()
+
+
+@router.get("/ai-review-cache-metrics")
+def get_ai_review_cache_metrics(
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.admin, UserRole.manager]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from app.services.ai_review_cache_service import ai_review_cache_service
+    return ai_review_cache_service.get_metrics()
+
+
+@router.get("/review-metrics")
+def get_review_metrics(
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.admin, UserRole.manager]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from app.services.submission_service import submission_service
+    return submission_service.get_review_metrics()
+
+
+@router.get("/storage-metrics")
+def get_storage_metrics(
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.admin, UserRole.manager]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from app.services.storage_service import storage_client
+    return storage_client.get_metrics()
+
+
+@router.get("/watermark-metrics")
+def get_watermark_metrics(
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.admin, UserRole.manager]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from app.services.watermark_service import watermark_service
+    return watermark_service.get_metrics()
+
+
+@router.get("/storage-reconcile")
+def get_storage_reconcile_report(
+    current_user: User = Depends(get_current_user)
+):
+    """Dry run: what a reconciler pass would expire, delete and purge right now."""
+    if current_user.role not in [UserRole.admin, UserRole.manager]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from app.services.storage_reconciler import storage_reconciler
+    return {
+        "dry_run": storage_reconciler.reconcile(dry_run=True),
+        "last_pass": storage_reconciler.last_report,
+    }
+
+
+@router.post("/storage-reconcile")
+def run_storage_reconcile(
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role != UserRole.admin:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from app.services.storage_reconciler import storage_reconciler
+    return storage_reconciler.reconcile(dry_run=False)
 
 
 @router.get("/tasks", response_model=List[TaskRead])
@@ -8,9 +8,7 @@ from app.db.session import get_db
 from app.schemas.project import (
     ProjectCreate, ProjectRead, ProjectUpdate,
     WorkerProjectRead,
-    WorkerStat, RevenueSnapshot, WorkloadTaskItem,
-    TaskWorkloadSnapshot, ProjectSnapshot,
-    DashboardAlertItem, ManagerDashboardData,
+    ManagerDashboardData,
 )
 from app.schemas.task import TaskRead
 from app.schemas.user import UserRead
@@ -24,10 +22,11 @@ from app.services.notification_service import notification_service
 from app.core.config import settings
 from pydantic import BaseModel
 from sqlalchemy import func
-from datetime import timedelta
 import logging
 import requests
 from app.services.delivery_service import delivery_service
+from app.services.dashboard_service import dashboard_service
+from app.services.http_client import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -108,203 +107,7 @@ def get_manager_dashboard(
     _require_manager_or_admin(current_user)
 
     try:
-        now = datetime.now(timezone.utc)
-        three_days = now + timedelta(days=3)
-
-        total_by_emp = dict(
-            db.query(Task.assigned_to, func.count(Task.id))
-            .filter(Task.assigned_to.isnot(None))
-            .group_by(Task.assigned_to).all()
-        )
-        completed_by_emp = dict(
-            db.query(Task.assigned_to, func.count(Task.id))
-            .filter(Task.assigned_to.isnot(None),
-                    Task.status.in_([TaskStatus.completed, TaskStatus.approved]))
-            .group_by(Task.assigned_to).all()
-        )
-        on_time_by_emp = dict(
-            db.query(Task.assigned_to, func.count(Task.id))
-            .filter(Task.assigned_to.isnot(None),
-                    Task.status.in_([TaskStatus.completed, TaskStatus.approved]),
-                    Task.deadline.isnot(None),
-                    Task.updated_at <= Task.deadline)
-            .group_by(Task.assigned_to).all()
-        )
-        ai_by_emp = dict(
-            db.query(TaskSubmission.submitted_by, func.avg(TaskSubmission.ai_score))
-            .filter(TaskSubmission.ai_score.isnot(None))
-            .group_by(TaskSubmission.submitted_by).all()
-        )
-
-        employees = db.query(User).filter(User.role == UserRole.employee).all()
-        workers = []
-        for emp in employees:
-            eid = emp.id
-            total     = int(total_by_emp.get(eid, 0))
-            completed = int(completed_by_emp.get(eid, 0))
-            on_time   = int(on_time_by_emp.get(eid, 0))
-            avg_ai    = float(ai_by_emp[eid]) if eid in ai_by_emp else None
-
-            completion_rate = completed / total if total > 0 else 0.0
-            deadline_rate   = on_time / completed if completed > 0 else 0.0
-            ai_factor       = (avg_ai if avg_ai is not None else 50.0) / 100.0
-            perf = round((completion_rate * 0.4 + deadline_rate * 0.3 + ai_factor * 0.3) * 100, 1)
-
-            workers.append(WorkerStat(
-                user_id=eid,
-                full_name=emp.full_name,
-                email=emp.email,
-                completed_tasks=completed,
-                total_tasks=total,
-                on_time_tasks=on_time,
-                avg_ai_score=round(avg_ai, 1) if avg_ai is not None else None,
-                performance_score=perf,
-            ))
-        workers.sort(key=lambda w: w.performance_score, reverse=True)
-
-        # OPTIMIZATION: Limit paid projects to recent ones only
-        paid_projects = db.query(Project)\
-            .filter(Project.payment_status == PaymentStatus.fully_paid)\
-            .order_by(Project.paid_at.desc())\
-            .limit(10).all()
-            
-        paid_count = db.query(func.count(Project.id)).filter(Project.payment_status == PaymentStatus.fully_paid).scalar() or 0
-        pending_count = db.query(func.count(Project.id)).filter(Project.payment_status == PaymentStatus.unpaid).scalar() or 0
-        overdue_count = db.query(func.count(Project.id)).filter(Project.payment_status == PaymentStatus.overdue).scalar() or 0
-
-        # OPTIMIZATION: Fetch counts and specific lists instead of ALL active tasks
-        total_active_count = db.query(func.count(Task.id)).filter(
-            Task.status.notin_([TaskStatus.completed, TaskStatus.approved])
-        ).scalar() or 0
-        
-        todo_count = db.query(func.count(Task.id)).filter(Task.status == TaskStatus.todo).scalar() or 0
-        in_progress_count = db.query(func.count(Task.id)).filter(Task.status == TaskStatus.in_progress).scalar() or 0
-        
-        urgent_tasks = db.query(Task).filter(
-            Task.status.notin_([TaskStatus.completed, TaskStatus.approved]),
-            Task.deadline.isnot(None),
-            Task.deadline < now
-        ).order_by(Task.deadline.asc()).limit(8).all()
-        
-        near_tasks = db.query(Task).filter(
-            Task.status.notin_([TaskStatus.completed, TaskStatus.approved]),
-            Task.deadline.isnot(None),
-            Task.deadline >= now,
-            Task.deadline <= three_days
-        ).order_by(Task.deadline.asc()).limit(8).all()
-
-        def to_workload(t: Task) -> WorkloadTaskItem:
-            return WorkloadTaskItem(
-                id=t.id, title=t.title,
-                status=t.status.value if hasattr(t.status, 'value') else str(t.status),
-                priority=t.priority or 'medium', deadline=t.deadline,
-                project_name=t.project_name, assigned_to=t.assigned_to,
-            )
-
-        total_projects = db.query(func.count(Project.id)).scalar() or 0
-        status_counts = dict(db.query(Project.status, func.count(Project.id)).group_by(Project.status).all())
-        
-        proj_active_count = status_counts.get(ProjectStatus.active, 0)
-        proj_done_count = status_counts.get(ProjectStatus.completed, 0)
-        proj_delivered_count = status_counts.get(ProjectStatus.delivered, 0)
-        proj_hold_count = status_counts.get(ProjectStatus.on_hold, 0)
-        
-        proj_delayed_count = db.query(func.count(Project.id)).filter(
-            Project.deadline.isnot(None), 
-            Project.deadline < now,
-            Project.status.notin_([ProjectStatus.completed, ProjectStatus.delivered, ProjectStatus.archived])
-        ).scalar() or 0
-
-        active_projects_list = db.query(Project)\
-            .filter(Project.status == ProjectStatus.active)\
-            .order_by(Project.updated_at.desc())\
-            .limit(10).all()
-
-        alerts = []
-        for t in urgent_tasks:
-            alerts.append(DashboardAlertItem(
-                type='late_task', priority='critical',
-                title=f'Overdue: {t.title}',
-                detail=f'Deadline was {t.deadline.strftime("%b %d") if t.deadline else "N/A"}',
-                entity_id=str(t.project_id),
-            ))
-        
-        low_subs = (
-            db.query(TaskSubmission)
-            .filter(TaskSubmission.ai_score < 70, TaskSubmission.ai_score.isnot(None),
-                    TaskSubmission.is_approved == False)
-            .order_by(TaskSubmission.created_at.desc()).limit(5).all()
-        )
-        for sub in low_subs:
-            t_obj = db.query(Task).filter(Task.id == sub.task_id).first()
-            if t_obj:
-                alerts.append(DashboardAlertItem(
-                    type='low_ai_score', priority='warning',
-                    title=f'Low AI Score: {t_obj.title}',
-                    detail=f'Score {sub.ai_score:.0f}/100 — review required',
-                    entity_id=str(t_obj.project_id),
-                ))
-                
-        pending_briefs = db.query(Project).filter(Project.brief_status == BriefStatus.submitted).limit(5).all()
-        for p in pending_briefs:
-            alerts.append(DashboardAlertItem(
-                type='pending_brief', priority='info',
-                title=f'Brief awaiting review: {p.name}',
-                detail=f'Submitted {p.created_at.strftime("%b %d")}',
-                entity_id=str(p.id),
-            ))
-            
-        unassigned = db.query(Task).filter(Task.assigned_to.is_(None), Task.status == TaskStatus.todo).limit(5).all()
-        for t in unassigned:
-            alerts.append(DashboardAlertItem(
-                type='unassigned', priority='warning',
-                title=f'Unassigned: {t.title}',
-                detail='No employee assigned yet',
-                entity_id=str(t.project_id),
-            ))
-            
-        alerts.sort(key=lambda a: {'critical': 0, 'warning': 1, 'info': 2}[a.priority])
-
-        total_tasks_global = db.query(func.count(Task.id)).scalar() or 0
-        completed_total = db.query(func.count(Task.id)).filter(Task.status.in_([TaskStatus.completed, TaskStatus.approved])).scalar() or 0
-        completion_rate = round(completed_total / total_tasks_global * 100, 1) if total_tasks_global > 0 else 0.0
-        avg_ai_global   = db.query(func.avg(TaskSubmission.ai_score)).filter(TaskSubmission.ai_score.isnot(None)).scalar()
-
-        briefs_list = db.query(Project).filter(
-            Project.brief_status.in_([BriefStatus.submitted, BriefStatus.clarification_requested, BriefStatus.validated])
-        ).limit(20).all()
-
-        return ManagerDashboardData(
-            kpi_total_tasks=int(total_tasks_global),
-            kpi_completion_rate=completion_rate,
-            kpi_avg_ai_score=round(float(avg_ai_global), 1) if avg_ai_global is not None else None,
-            kpi_active_workers=sum(1 for w in workers if w.total_tasks > 0),
-            workers=workers,
-            revenue=RevenueSnapshot(
-                paid_count=paid_count,
-                pending_count=int(pending_count),
-                overdue_count=int(overdue_count),
-                recently_paid=paid_projects[:5],
-            ),
-            workload=TaskWorkloadSnapshot(
-                total=total_active_count,
-                todo=todo_count,
-                in_progress=in_progress_count,
-                near_deadline=[to_workload(t) for t in near_tasks],
-                urgent=[to_workload(t) for t in urgent_tasks],
-            ),
-            projects=ProjectSnapshot(
-                total=total_projects,
-                active=proj_active_count,
-                completed=proj_done_count,
-                delivered=proj_delivered_count,
-                on_hold=proj_hold_count,
-                delayed=proj_delayed_count,
-            ),
-            alerts=alerts[:15],
-            briefs=briefs_list,
-            active_projects=active_projects_list,
-        )
+        return dashboard_service.get_manager_dashboard(db)
     except Exception as e:
         logger.exception("Manager dashboard error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -573,7 +376,11 @@ def generate_ai_resume(
     }
 
     try:
-        response = requests.post(settings.N8N_AI_RESUME_WEBHOOK_URL, json=payload, timeout=45)
+        # Summarising a brief has no side effects, so transient failures are retried
+        response = http_client.post(
+            "n8n-ai-resume", settings.N8N_AI_RESUME_WEBHOOK_URL,
+            json=payload, timeout=45, idempotent=True,
+        )
         response.raise_for_status()
         
         # Check if response is empty
@@ -671,8 +478,15 @@ def deliver_partial_project(
         raise HTTPException(status_code=400, detail="Project is not in partially paid project mode.")
 
     tasks = db.query(Task).filter(Task.project_id == project.id, Task.id.in_(req.task_ids)).all()
+    notifications: list = []
     for t in tasks:
-        delivery_service.deliver_task_watermark(db, t, project)
-    
+        delivery_service.deliver_task_watermark(db, t, project, notifications=notifications)
+
+    notification_service.create_many(
+        db,
+        notifications,
+        digest=True,
+        digest_subject=f"Previews available — {project.name}",
+    )
     db.commit()
     return {"status": "success", "delivered_tasks": len(tasks)}
@@ -11,8 +11,9 @@ from app.core.config import settings
 from app.models.user import User, UserRole
 from app.models.task import Task
 from app.models.project import Project
-from app.schemas.submission import SubmissionCreateRequest, SubmissionRead, WebhookCallbackPayload, WatermarkCallbackPayload
+from app.schemas.submission import SubmissionCreateRequest, SubmissionRead, SubmissionShortRead, WebhookCallbackPayload, WatermarkCallbackPayload, ReviewJobRead
 from app.services.submission_service import submission_service
+from app.services.review_job_service import review_job_service
 
 router = APIRouter(prefix="/submissions", tags=["submissions"])
 
@@ -57,7 +58,7 @@ def submit_work(
     return submission_service.create_submission(db, body, current_user.id)
 
 
-@router.get("/{task_id}/", response_model=List[SubmissionRead])
+@router.get("/{task_id}/", response_model=List[SubmissionShortRead])
 def list_submissions(
     task_id: UUID,
     db: Session = Depends(get_db),
@@ -101,7 +102,6 @@ def list_submissions(
             sub.ai_feedback = None
             sub.webhook_response = None
             sub.ai_analysis_result = None
-            sub.brief_snapshot = None
             sub.is_approved = False
             sub.reviewed_by = None
             if not is_final:
@@ -167,6 +167,27 @@ def get_submission(
     return submission
 
 
+@router.get("/single/{submission_id}/review-job", response_model=ReviewJobRead)
+def get_submission_review_job(
+    submission_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Status of the latest asynchronous AI review for a submission."""
+    _require_employee_or_above(current_user)
+
+    submission = submission_service.get_submission(db, submission_id)
+    if not submission:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    if current_user.role == UserRole.employee and submission.submitted_by != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    job = review_job_service.get_latest_for_submission(db, submission_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="No review job for this submission")
+    return job
+
+
 @router.post("/webhook-callback", response_model=SubmissionRead)
 def receive_webhook_callback(
     payload: WebhookCallbackPayload,
@@ -236,7 +257,6 @@ def receive_watermark_callback(
     The original file_paths are NOT exposed to the client until final_delivered.
     """
     import base64
-    import json
     from app.models.task import Task, TaskSubmission
     from app.models.project import Project
     from app.services.storage_service import upload_watermark_preview
@@ -268,7 +288,7 @@ def receive_watermark_callback(
 
         public_url = f"{settings.SUPABASE_URL.rstrip('/')}/storage/v1/object/public/{bucket.strip('/')}/{storage_path.strip('/')}"
         
-        submission.watermarked_file_paths = json.dumps([public_url])
+        submission.watermarked_file_paths = [public_url]
         submission.watermark_file_path = image_path
     elif payload.files:
         public_urls: list[str] = []
@@ -291,7 +311,7 @@ def receive_watermark_callback(
             except Exception as e:
                 raise HTTPException(status_code=502, detail=f"Storage upload failed: {e}")
 
-        submission.watermarked_file_paths = json.dumps(public_urls)
+        submission.watermarked_file_paths = public_urls
     else:
         raise HTTPException(status_code=400, detail="Missing files or image_path in payload")
 
@@ -320,7 +340,6 @@ async def receive_watermark_callback_binary(
     task-submissions/preview/{client_id}/{project_id}/{task_id}/,
     and saves the public URL in submission.watermarked_file_paths.
     """
-    import json
     from app.models.task import Task, TaskSubmission
     from app.models.project import Project
     from app.services.storage_service import upload_watermark_preview
@@ -360,7 +379,7 @@ async def receive_watermark_callback_binary(
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Storage upload failed: {e}")
 
-    submission.watermarked_file_paths = json.dumps([url])
+    submission.watermarked_file_paths = [url]
     db.commit()
     db.refresh(submission)
     return submission
@@ -386,7 +405,6 @@ async def receive_watermark_callback_raw(
     task-submissions/preview/{client_id}/{project_id}/{task_id}/,
     and saves the public URL in submission.watermarked_file_paths.
     """
-    import json
     from app.models.task import Task, TaskSubmission
     from app.models.project import Project
     from app.services.storage_service import upload_watermark_preview
@@ -429,7 +447,7 @@ async def receive_watermark_callback_raw(
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Storage upload failed: {e}")
 
-    submission.watermarked_file_paths = json.dumps([url])
+    submission.watermarked_file_paths = [url]
     db.commit()
     db.refresh(submission)
     return submission
@@ -10,7 +10,7 @@ from app.models.task import Task, TaskStatus, TaskFeedback as TaskFeedbackModel
 from app.models.project import Project
 from app.schemas.task import (
     TaskCreate, TaskUpdate, TaskRead, TaskShortRead,
-    TaskSubmissionCreate, TaskSubmissionRead,
+    TaskSubmissionCreate, TaskSubmissionRead, TaskSubmissionShortRead,
     TaskFeedbackCreate, TaskFeedbackRead,
     AIReviewResult, SubmissionWebhookResult,
 )
@@ -335,7 +335,7 @@ def submit_work(
     return task_service.submit_work(db, submission_in, current_user.id)
 
 
-@router.get("/{task_id}/submissions", response_model=List[TaskSubmissionRead])
+@router.get("/{task_id}/submissions", response_model=List[TaskSubmissionShortRead])
 def get_submissions(
     task_id: UUID,
     db: Session = Depends(get_db),
@@ -377,7 +377,6 @@ def receive_submission_webhook_result(
 
     Requires X-Webhook-Secret header matching N8N_WEBHOOK_SECRET.
     """
-    import json as _json
     from app.models.task import TaskSubmission as TaskSubmissionModel, TaskFeedback as TaskFeedbackModel
     from app.models.notification import NotificationType
     from app.services.notification_service import notification_service
@@ -396,11 +395,11 @@ def receive_submission_webhook_result(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    submission.webhook_response = _json.dumps({
+    submission.webhook_response = {
         "status": result.status,
         "score": result.score,
         "feedback": result.feedback,
-    })
+    }
     if result.score is not None:
         submission.ai_score = result.score
     if result.feedback:
@@ -120,6 +120,7 @@ def admin_update_user(
         user.is_active = user_in.is_active
     db.commit()
     db.refresh(user)
+    user_service.invalidate_identity(user.id)
     return user
 
 
@@ -133,6 +134,5 @@ def deactivate_user(
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    user.is_active = False
-    db.commit()
+    user_service.deactivate_user(db, user)
     return {"message": f"User {user.email} deactivated"}
@@ -16,6 +16,24 @@ class Settings(BaseSettings):
     SUPABASE_ANON_KEY: str
     SUPABASE_SERVICE_KEY: Optional[str] = None  # service_role key — admin ops + storage
 
+    # ── Auth: local Supabase JWT verification ────────────────────────────────
+    # Legacy HS256 projects sign with this secret; projects on asymmetric
+    # signing keys are verified against the JWKS published by Supabase Auth.
+    SUPABASE_JWT_SECRET: Optional[str] = None
+    AUTH_JWT_AUDIENCE: str = "authenticated"
+    AUTH_LOCAL_JWT_VERIFY: bool = True
+    # Fall back to supabase.auth.get_user() when a token cannot be checked locally
+    AUTH_REMOTE_FALLBACK: bool = True
+    AUTH_TOKEN_CACHE_SIZE: int = 4096
+    AUTH_TOKEN_CACHE_TTL_SECONDS: int = 300
+    AUTH_JWKS_TTL_SECONDS: int = 600
+    # Floor between JWKS refetches forced by an unknown kid; such kids are
+    # then rejected locally for the same period
+    AUTH_JWKS_MIN_REFRESH_SECONDS: int = 30
+    # Supabase id → local users.id resolution cache (see user_service)
+    AUTH_IDENTITY_CACHE_TTL_SECONDS: int = 600
+    AUTH_IDENTITY_NEGATIVE_TTL_SECONDS: int = 30
+
     FRONTEND_URL: str = "http://localhost:5173"
     
     N8N_BRIEF_WEBHOOK_URL: Optional[str] = None
@@ -23,10 +41,112 @@ class Settings(BaseSettings):
     N8N_TASK_REVIEW_WEBHOOK_URL: Optional[str] = None
     N8N_WORK_SUBMISSION_WEBHOOK: Optional[str] = None
     WATERMARK_WEBHOOK_URL: Optional[str] = None
+    # "n8n" posts to WATERMARK_WEBHOOK_URL and waits for a callback; "local"
+    # renders the preview in-process (see watermark_service; needs Pillow)
+    # and falls back to n8n only if that fails.
+    WATERMARK_ENGINE: str = "n8n"
+    WATERMARK_TEXT: str = "PREVIEW"
+    WATERMARK_MAX_EDGE: int = 1600
+    WATERMARK_OPACITY: int = 96  # 0-255
+    WATERMARK_QUALITY: int = 80
+    WATERMARK_WORKERS: int = 2
+    # Budget for the whole local delivery (source download + render), which
+    # runs inside the request; past it the record fails and n8n takes over
+    WATERMARK_TIMEOUT_SECONDS: float = 20.0
+    # Larger source images are not downloaded for a local render
+    WATERMARK_SOURCE_MAX_BYTES: int = 50 * 1024 * 1024
     # Preferred alias — takes precedence over N8N_WORK_SUBMISSION_WEBHOOK if both set
     SUBMISSION_REVIEW_WEBHOOK_URL: Optional[str] = None
     N8N_WEBHOOK_SECRET: Optional[str] = None
 
+    # ── Outbound HTTP (see services/http_client.py) ──────────────────────────
+    # Keep-alive connections kept per upstream endpoint
+    HTTP_POOL_MAXSIZE: int = 10
+    # Extra attempts for idempotent calls only; webhooks that trigger work
+    # are never replayed
+    HTTP_RETRY_ATTEMPTS: int = 2
+    HTTP_RETRY_BASE_SECONDS: float = 0.5
+    # Consecutive failures before an endpoint fails fast, and for how long
+    HTTP_BREAKER_FAILURE_THRESHOLD: int = 5
+    HTTP_BREAKER_RESET_SECONDS: float = 30.0
+
+    # Supabase Storage REST calls (see storage_service)
+    STORAGE_POOL_MAXSIZE: int = 16
+    STORAGE_UPLOAD_TIMEOUT_SECONDS: float = 120.0
+    # Deliverables at or above the threshold use resumable (TUS) uploads.
+    # Supabase expects 6 MiB chunks; drops (and offset conflicts) are resumed
+    # up to MAX_RESUMES times per call before the upload gives up.
+    STORAGE_RESUMABLE_UPLOADS: bool = True
+    STORAGE_RESUMABLE_THRESHOLD_BYTES: int = 6 * 1024 * 1024
+    STORAGE_TUS_CHUNK_BYTES: int = 6 * 1024 * 1024
+    STORAGE_TUS_MAX_RESUMES: int = 5
+    # Storage reconciler (see storage_reconciler): expires stale callback
+    # tokens, deletes unreferenced deliverables older than MIN_AGE and purges
+    # terminal callback rows after RETENTION_DAYS, and forgets resumable
+    # uploads idle for UPLOAD_TTL (Supabase drops them after 24h). Interval 0
+    # disables it.
+    STORAGE_RECONCILE_INTERVAL_SECONDS: int = 6 * 3600
+    STORAGE_RECONCILE_MIN_AGE_SECONDS: int = 24 * 3600
+    STORAGE_RECONCILE_DELETE_BATCH: int = 100
+    STORAGE_RECONCILE_RETENTION_DAYS: int = 30
+    STORAGE_RECONCILE_UPLOAD_TTL_SECONDS: int = 24 * 3600
+
+    # Images attached to a review webhook are fetched in parallel, once
+    SUBMISSION_IMAGE_FETCH_CONCURRENCY: int = 4
+    SUBMISSION_IMAGE_MAX_TOTAL_BYTES: int = 50 * 1024 * 1024
+    # Pipe images straight from storage into a chunked upload to n8n instead
+    # of buffering them (the webhook host must accept chunked request bodies)
+    SUBMISSION_WEBHOOK_STREAMING: bool = False
+
+    # ── Review renditions (see review_image_service; needs Pillow) ──────────
+    # Send the AI review a downscaled, re-encoded copy of each image instead
+    # of the full-resolution upload. Stored originals are left untouched.
+    SUBMISSION_REVIEW_RENDITIONS: bool = False
+    REVIEW_IMAGE_MAX_EDGE: int = 1568
+    REVIEW_IMAGE_FORMAT: str = "JPEG"  # JPEG | WEBP | PNG
+    REVIEW_IMAGE_QUALITY: int = 85
+    REVIEW_IMAGE_WORKERS: int = 2
+    REVIEW_IMAGE_TIMEOUT_SECONDS: float = 30.0
+    REVIEW_IMAGE_CACHE_SIZE: int = 256
+    REVIEW_IMAGE_CACHE_TTL_SECONDS: int = 3600
+
+    # ── Submission review jobs (see review_job_service) ──────────────────────
+    # When true, POST /submissions/{task_id}/submit returns as soon as the
+    # submission is saved and the n8n review runs on a background worker.
+    SUBMISSION_REVIEW_ASYNC: bool = False
+    REVIEW_JOB_WORKERS: int = 2
+    REVIEW_JOB_POLL_SECONDS: float = 2.0
+    REVIEW_JOB_MAX_ATTEMPTS: int = 3
+    REVIEW_JOB_RETRY_BASE_SECONDS: float = 30.0
+    # A running job is reclaimed after this long (covers a crashed worker)
+    REVIEW_JOB_LEASE_SECONDS: int = 300
+
+    # ── AI review cache (see ai_review_cache_service) ────────────────────────
+    # Identical images + brief + text reuse a previous verdict for this long;
+    # 0 disables the cache. Bump the version whenever the n8n review workflow
+    # or its prompt changes so old verdicts stop matching.
+    AI_REVIEW_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    AI_REVIEW_WORKFLOW_VERSION: str = "1"
+    # Always call the workflow, but keep refreshing the cache with its verdicts
+    AI_REVIEW_CACHE_BYPASS: bool = False
+
+    # ── Notification e-mail outbox (see notification_dispatcher) ─────────────
+    NOTIFICATION_DISPATCH_WORKERS: int = 4
+    NOTIFICATION_DISPATCH_BATCH_SIZE: int = 50
+    NOTIFICATION_DISPATCH_POLL_SECONDS: float = 2.0
+    NOTIFICATION_MAX_ATTEMPTS: int = 6
+    NOTIFICATION_RETRY_BASE_SECONDS: float = 30.0
+
+    # ── Activity log write buffer (see activity_service) ─────────────────────
+    # Non-durable entries are inserted in bulk once either threshold is hit,
+    # so /management/logs lags by at most ACTIVITY_LOG_FLUSH_SECONDS.
+    ACTIVITY_LOG_BATCH_SIZE: int = 200
+    ACTIVITY_LOG_FLUSH_SECONDS: float = 1.0
+    ACTIVITY_LOG_MAX_BUFFER: int = 10000
+
+    # Manager dashboard snapshot; also dropped on any committed task/project write
+    DASHBOARD_CACHE_TTL_SECONDS: int = 30
+
     # Public base URL of this API (e.g. https://api.example.com).
     # Required for building n8n image-result callback URLs.
     APP_BASE_URL: Optional[str] = None
@@ -0,0 +1,50 @@
+"""
+core/metrics.py
+───────────────
+Minimal in-process metrics for background workers and outbound calls.
+
+Values are per API worker process and reset on restart; they are exposed
+through the management endpoints for operators, not scraped.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class LatencyRecorder:
+    """Counters plus a sliding window of recent durations (seconds)."""
+
+    def __init__(self, window: int = 1000):
+        self._samples: deque[float] = deque(maxlen=window)
+        self._counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + amount
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = sorted(self._samples)
+            counts = dict(self._counts)
+        return {
+            **counts,
+            "latency_samples": len(samples),
+            "latency_p50_ms": round(_percentile(samples, 50) * 1000, 1),
+            "latency_p95_ms": round(_percentile(samples, 95) * 1000, 1),
+            "latency_p99_ms": round(_percentile(samples, 99) * 1000, 1),
+            "latency_max_ms": round(samples[-1] * 1000, 1) if samples else 0.0,
+        }
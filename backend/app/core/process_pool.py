@@ -0,0 +1,46 @@
+"""
+core/process_pool.py
+────────────────────
+Lazily started process pool for CPU-bound work (image decoding, resizing,
+watermarking) that must not hold the API worker's GIL.
+
+Workers are started with the spawn method: forking a multi-threaded API
+worker is unsafe. The pool is created on first submit, sized from a
+callable so the setting is read at that moment. After a worker dies
+(BrokenProcessPool) the caller resets it and the next submit starts a
+fresh one. close() is called from the app lifespan on shutdown.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Optional
+
+
+class SpawnPool:
+    def __init__(self, workers: Callable[[], int]):
+        self._workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=max(1, self._workers()),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            pool = self._pool
+        return pool.submit(fn, *args)
+
+    def reset(self) -> None:
+        """Drop the current pool (cancelling queued work); the next submit starts a new one."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        self.reset()
@@ -0,0 +1,58 @@
+"""
+db/dialect.py
+─────────────
+Helpers for code that runs on PostgreSQL in production and on SQLite in
+local development.
+
+upsert() builds an INSERT … ON CONFLICT statement on both dialects, so the
+race-free path is the same in dev and prod. It returns None on any other
+dialect, and the caller then falls back to its own read-then-write.
+
+as_utc() fixes up timestamps read back from SQLite, which drops the
+timezone that PostgreSQL keeps.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional, Union
+
+from sqlalchemy.orm import Session
+
+
+def upsert(
+    db: Session,
+    model,
+    values: Union[dict, list[dict]],
+    *,
+    index_elements: list,
+    set_: Union[None, dict, Callable[[Any], dict]] = None,
+):
+    """INSERT `values` into `model`, resolving conflicts on `index_elements`.
+
+    set_ is the ON CONFLICT DO UPDATE assignment, or a callable that receives
+    the statement (for references to `stmt.excluded`). Without it conflicting
+    rows are left alone (DO NOTHING). Returns None on dialects without
+    ON CONFLICT support.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+
+    stmt = dialect_insert(model).values(values)
+    if set_ is None:
+        return stmt.on_conflict_do_nothing(index_elements=index_elements)
+    return stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_=set_(stmt) if callable(set_) else set_,
+    )
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)  # SQLite returns naive timestamps
@@ -0,0 +1,23 @@
+"""
+db/queue.py
+───────────
+Helpers for table-backed work queues (outbox rows, background jobs).
+
+Rows are claimed with SELECT … FOR UPDATE SKIP LOCKED on PostgreSQL so any
+number of API workers can drain the same table without double-processing.
+SQLite has no row locks; there the claim degrades to a plain SELECT, which
+is fine for the single-process local-dev setup.
+"""
+
+from sqlalchemy.orm import Session
+
+
+def claim_batch(db: Session, model, *, filters, order_by, limit: int):
+    """Lock and return up to `limit` rows of `model` matching `filters`.
+
+    Locks are held until the caller commits or rolls back `db`.
+    """
+    query = db.query(model).filter(*filters).order_by(*order_by).limit(limit)
+    if db.get_bind().dialect.name == "postgresql":
+        query = query.with_for_update(skip_locked=True)
+    return query.all()
@@ -1,7 +1,8 @@
 import warnings
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
 
 if settings.DATABASE_URL.startswith("sqlite"):
@@ -45,3 +46,71 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+@contextmanager
+def unit_of_work(db: Session):
+    """Run one API operation's writes as a single transaction.
+
+    Helpers that normally commit on their own (activity_service.create_log,
+    notification_service.create/create_many) only stage their rows while a
+    unit of work is open, so the domain writes, activity log and notifications
+    reach the database in one flush + one COMMIT and succeed or fail together.
+    Nested blocks join the outermost one.
+    """
+    depth = db.info.get("uow_depth", 0)
+    db.info["uow_depth"] = depth + 1
+    try:
+        yield db
+        if depth == 0:
+            db.commit()
+    except Exception:
+        if depth == 0:
+            db.rollback()
+            db.info.pop("uow_after_commit", None)
+        raise
+    finally:
+        db.info["uow_depth"] = depth
+
+    if depth == 0:
+        for callback in db.info.pop("uow_after_commit", []):
+            callback()
+
+
+def in_unit_of_work(db: Session) -> bool:
+    return db.info.get("uow_depth", 0) > 0
+
+
+def commit_unless_in_unit_of_work(db: Session) -> bool:
+    """Commit now, or leave it to the enclosing unit of work.
+    Returns True if a COMMIT was issued."""
+    if in_unit_of_work(db):
+        return False
+    db.commit()
+    return True
+
+
+def after_commit(db: Session, callback) -> None:
+    """Run `callback` once the enclosing unit of work commits (or right away)."""
+    if in_unit_of_work(db):
+        db.info.setdefault("uow_after_commit", []).append(callback)
+    else:
+        callback()
+
+
+def end_read_transaction(db: Session, *keep_loaded) -> None:
+    """Commit db's read-only transaction without expiring what it loaded.
+
+    Objects in `keep_loaded` are refreshed first if a previous commit expired
+    them, so reading their columns afterwards does not begin a new
+    transaction. Use before slow external calls; the caller must have no
+    pending writes.
+    """
+    for obj in keep_loaded:
+        if obj is not None and inspect(obj).expired_attributes:
+            db.refresh(obj)
+    expire_on_commit, db.expire_on_commit = db.expire_on_commit, False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
@@ -0,0 +1,61 @@
+"""
+db/types.py
+───────────
+Column types shared by the models.
+
+JSONDocument stores a JSON value as JSONB on PostgreSQL (plain JSON text on
+SQLite and other dialects), so attributes hold Python dicts/lists and queries
+can reach into documents server-side, e.g.
+
+    TaskSubmission.ai_analysis_result["status"].as_string() == "aligns"
+
+Python None is stored as SQL NULL, so `column.is_(None)` keeps working.
+
+Mutations must assign a new value (`obj.doc = {**obj.doc, k: v}`); in-place
+edits of the loaded dict are not tracked. For top-level key patches use
+merge_json_keys(), which sends only the patch on PostgreSQL.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import JSON, cast, func, inspect, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+JSONDocument = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+
+def merge_json_keys(db: Session, obj: Any, attr: str, patch: dict) -> None:
+    """Merge `patch` into the top-level keys of `obj.<attr>` (a JSON object column).
+
+    PostgreSQL: one `UPDATE … SET attr = COALESCE(attr, '{}') || :patch`, so
+    the stored document is neither read nor rewritten by the application and
+    concurrent patches to different keys do not overwrite each other. The
+    in-memory attribute is expired and reloads on next access.
+    Other dialects: the document is read, merged and written back.
+
+    Both run as Core statements on the table, not ORM updates of the mapped
+    class, so the ORM write hooks (flush and do_orm_execute listeners, such as
+    the dashboard cache invalidation) do not see a change to `obj`.
+    """
+    if not patch:
+        return
+    state = inspect(obj)
+    column = state.mapper.columns[attr]
+    where = state.mapper.primary_key[0] == state.identity[0]
+
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(
+            update(column.table)
+            .where(where)
+            .values({column: func.coalesce(column, cast({}, JSONB)).op("||")(cast(patch, JSONB))})
+        )
+        db.expire(obj, [attr])
+        return
+
+    merged = {**(db.execute(select(column).where(where)).scalar() or {}), **patch}
+    db.execute(update(column.table).where(where).values({column: merged}))
+    set_committed_value(obj, attr, merged)
@@ -5,11 +5,17 @@ import asyncio
 from app.api.routes import auth, users, projects, brief, tasks, notifications, management, submissions, image_callbacks
 from app.core.config import settings
 from app.db.session import engine, Base, SessionLocal
-from app.models import user, project, task, notification, rbac, activity, workflow_image_callback  # Ensure models are imported for Base.metadata
+from app.models import user, project, task, notification, rbac, activity, workflow_image_callback, employee_stats, review_job, ai_review_cache, brief_snapshot, storage_upload, stored_object  # Ensure models are imported for Base.metadata
 from app.models.task import Task, TaskStatus
 from app.models.notification import NotificationType
 from app.services.notification_service import notification_service
 from app.services.task_service import task_service
+from app.services.notification_dispatcher import notification_dispatcher
+from app.services.activity_service import activity_service
+from app.services.review_job_service import review_job_service
+from app.services.review_image_service import review_image_service
+from app.services.watermark_service import watermark_service
+from app.services.storage_reconciler import storage_reconciler
 
 def _run_startup_db_tasks():
     from sqlalchemy import text
@@ -22,7 +28,7 @@ def _run_startup_db_tasks():
 
     migrations = [
         ("projects.saved_answers",
-         "ALTER TABLE projects ADD COLUMN IF NOT EXISTS saved_answers TEXT",
+         "ALTER TABLE projects ADD COLUMN IF NOT EXISTS saved_answers JSONB",
          False),
         ("briefstatus enum: interrupted",
          "ALTER TYPE briefstatus ADD VALUE IF NOT EXISTS 'interrupted'",
@@ -36,11 +42,11 @@ def _run_startup_db_tasks():
         ("task_submissions.submission_status",
          "ALTER TABLE task_submissions ADD COLUMN IF NOT EXISTS submission_status submissionstatus DEFAULT 'pending'",
          False),
-        ("task_submissions.brief_snapshot",
-         "ALTER TABLE task_submissions ADD COLUMN IF NOT EXISTS brief_snapshot TEXT",
+        ("task_submissions.brief_snapshot_hash",
+         "ALTER TABLE task_submissions ADD COLUMN IF NOT EXISTS brief_snapshot_hash VARCHAR(64) REFERENCES brief_snapshots(hash)",
          False),
         ("task_submissions.webhook_response",
-         "ALTER TABLE task_submissions ADD COLUMN IF NOT EXISTS webhook_response TEXT",
+         "ALTER TABLE task_submissions ADD COLUMN IF NOT EXISTS webhook_response JSONB",
          False),
         ("task_submissions.attempt_number",
          "ALTER TABLE task_submissions ADD COLUMN IF NOT EXISTS attempt_number INTEGER NOT NULL DEFAULT 1",
@@ -49,7 +55,7 @@ def _run_startup_db_tasks():
          "UPDATE tasks SET status = 'submitted' WHERE status = 'under_review'",
          False),
         ("task_submissions.ai_analysis_result",
-         "ALTER TABLE task_submissions ADD COLUMN IF NOT EXISTS ai_analysis_result TEXT",
+         "ALTER TABLE task_submissions ADD COLUMN IF NOT EXISTS ai_analysis_result JSONB",
          False),
         ("workflow_image_callbacks table",
          """CREATE TABLE IF NOT EXISTS workflow_image_callbacks (
@@ -94,19 +100,23 @@ async def late_task_checker():
         db = SessionLocal()
         try:
             late_tasks = task_service.get_late_tasks(db)
+            notifications = []
             for late_task in late_tasks:
                 if late_task.status != TaskStatus.late:
                     late_task.status = TaskStatus.late
                     if late_task.created_by:
-                        notification_service.create(
-                            db,
+                        notifications.append(dict(
                             user_id=late_task.created_by,
                             title="Task overdue",
                             notification_type=NotificationType.task_late,
                             body=f"Task '{late_task.title}' has passed its deadline.",
                             task_id=late_task.id,
                             project_id=late_task.project_id,
-                        )
+                        ))
+            # create_many commits the status changes together with the notifications
+            notification_service.create_many(
+                db, notifications, digest=True, digest_subject="Tasks overdue on AgencyFlow"
+            )
             db.commit()
         except Exception as e:
             print(f"[LateTaskChecker] Error: {e}")
@@ -120,12 +130,26 @@ async def lifespan(app: FastAPI):
     # loop.run_in_executor(None, _run_startup_db_tasks)
 
     checker_task = asyncio.create_task(late_task_checker())
+    dispatcher_task = asyncio.create_task(notification_dispatcher.run())
+    review_job_task = asyncio.create_task(review_job_service.run())
+    reconciler_task = asyncio.create_task(storage_reconciler.run())
     yield
     checker_task.cancel()
     try:
         await checker_task
     except asyncio.CancelledError:
         pass
+    # Let the in-flight batch finish so claimed outbox rows are committed
+    notification_dispatcher.stop()
+    await dispatcher_task
+    review_job_service.stop()
+    await review_job_task
+    storage_reconciler.stop()
+    await reconciler_task
+    review_image_service.close()
+    watermark_service.close()
+    # Write out buffered activity log entries before the process exits
+    await asyncio.to_thread(activity_service.close)
 
 
 app = FastAPI(
@@ -147,6 +171,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
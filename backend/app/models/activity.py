@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -15,3 +15,11 @@ class ActivityLog(Base):
     details = Column(JSON, nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Keyset pagination of /management/logs, optionally narrowed per user
+        Index("ix_activity_logs_created_at_id", "created_at", "id"),
+        Index("ix_activity_logs_user_created_at", "user_id", "created_at", "id"),
+        # Per-entity timelines (GET /tasks/{id}/activity)
+        Index("ix_activity_logs_entity_created_at", "entity_type", "entity_id", "created_at"),
+    )
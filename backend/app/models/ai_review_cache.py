@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, DateTime, Integer
+from sqlalchemy.sql import func
+from app.db.session import Base
+from app.db.types import JSONDocument
+
+
+class AIReviewCache(Base):
+    """
+    Normalized AI review verdicts keyed by what the reviewer actually saw.
+
+    cache_key is a SHA-256 over the review workflow version, the content hash
+    of every submitted image (in order), the brief snapshot hash and the
+    submission text. A resubmission of identical work against an unchanged
+    brief therefore reuses the verdict instead of calling the n8n/Gemini
+    workflow again. See services/ai_review_cache_service.py.
+    """
+    __tablename__ = "ai_review_cache"
+
+    cache_key = Column(String(64), primary_key=True)
+    workflow_version = Column(String, nullable=False)
+    files_hash = Column(String(64), nullable=False)
+    brief_hash = Column(String(64), nullable=False)
+
+    # Output of ai_response_parser.parse_ai_response, and the raw body it came from
+    result = Column(JSONDocument, nullable=False)
+    raw_response = Column(JSONDocument, nullable=True)
+
+    hits = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
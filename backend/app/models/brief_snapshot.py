@@ -0,0 +1,31 @@
+import zlib
+from sqlalchemy import Column, String, DateTime, Integer, LargeBinary
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class BriefSnapshot(Base):
+    """
+    Content-addressed store for the brief text captured at submission time.
+
+    Every attempt on a project usually carries the same brief + Q&A text, so
+    submissions reference a row here by the SHA-256 of that text instead of
+    each holding a copy. Rows are immutable; see
+    services/brief_snapshot_service.py for how they are written.
+    """
+    __tablename__ = "brief_snapshots"
+
+    hash = Column(String(64), primary_key=True)   # sha256 hex of the UTF-8 text
+    compression = Column(String, nullable=False, default="none")  # "zlib" | "none"
+    data = Column(LargeBinary, nullable=False)
+    size_bytes = Column(Integer, nullable=False)   # uncompressed UTF-8 length
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    @property
+    def text(self) -> str:
+        # Decoded once per loaded row; submissions sharing a brief share this object
+        cached = self.__dict__.get("_text")
+        if cached is None:
+            raw = zlib.decompress(self.data) if self.compression == "zlib" else self.data
+            cached = self.__dict__["_text"] = raw.decode("utf-8")
+        return cached
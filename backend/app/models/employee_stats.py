@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class EmployeeStats(Base):
+    """
+    Per-employee rollup of task and AI-review figures.
+
+    Maintained by services/employee_stats_service: every transaction that
+    changes an employee's tasks or scored submissions recomputes that
+    employee's row before it commits. Readers (manager dashboard, leaderboards)
+    therefore scan one row per employee instead of the tasks table.
+
+    The AI average is kept as sum + count so it stays exact under recompute.
+    """
+    __tablename__ = "employee_stats"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_tasks = Column(Integer, nullable=False, default=0)
+    completed_tasks = Column(Integer, nullable=False, default=0)
+    on_time_tasks = Column(Integer, nullable=False, default=0)
+    ai_score_sum = Column(Float, nullable=False, default=0.0)
+    ai_score_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @property
+    def avg_ai_score(self) -> float | None:
+        return self.ai_score_sum / self.ai_score_count if self.ai_score_count else None
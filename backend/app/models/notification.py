@@ -1,6 +1,6 @@
 import enum
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum, Text, Boolean
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum, Text, Boolean, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -45,3 +45,37 @@ class Notification(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     read_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class NotificationOutbox(Base):
+    """
+    Pending e-mail deliveries, written in the same transaction as the
+    Notification row and drained by notification_dispatcher.
+
+    Status lifecycle:
+      pending → sent
+              → failed   (NOTIFICATION_MAX_ATTEMPTS exhausted)
+    """
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        Index("ix_notification_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    notification_id = Column(UUID(as_uuid=True), ForeignKey("notifications.id"), nullable=True)
+
+    # Recipient: user_id is resolved to an address at dispatch time;
+    # to_email is set directly for mails that are not tied to a user row.
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    to_email = Column(String, nullable=True)
+
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=True)
+
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
@@ -5,6 +5,7 @@ from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
 from app.db.session import Base
+from app.db.types import JSONDocument
 
 
 class ProjectStatus(str, enum.Enum):
@@ -55,9 +56,9 @@ class Project(Base):
     status = Column(SQLEnum(ProjectStatus, name="projectstatus", create_type=False), default=ProjectStatus.planning, nullable=False)
 
     brief_status = Column(SQLEnum(BriefStatus, name="briefstatus", create_type=True), default=BriefStatus.draft, nullable=False)
-    brief_history = Column(Text, nullable=True)
-    next_question = Column(Text, nullable=True)   # stores n8n schema (full field list)
-    saved_answers = Column(Text, nullable=True)   # per-field autosave: {fieldKey: {question, answer}}
+    brief_history = Column(JSONDocument, nullable=True)   # {seed: {...}, steps: [...]}
+    next_question = Column(JSONDocument, nullable=True)   # stores n8n schema (full field list)
+    saved_answers = Column(JSONDocument, nullable=True)   # per-field autosave: {fieldKey: {question, answer}}
     brief_content = Column(Text, nullable=True)
     clarification_notes = Column(Text, nullable=True)
 
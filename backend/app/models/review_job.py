@@ -0,0 +1,39 @@
+import uuid
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Integer, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class ReviewJob(Base):
+    """
+    Durable queue entry for an asynchronous AI review of a submission
+    (SUBMISSION_REVIEW_ASYNC=true). See services/review_job_service.py.
+
+    Status lifecycle:
+      queued → running → completed
+                       → queued   (error, retried with backoff)
+                       → failed   (REVIEW_JOB_MAX_ATTEMPTS reached)
+
+    A running job whose lease_expires_at has passed (worker crashed) is
+    claimable again.
+    """
+    __tablename__ = "review_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    submission_id = Column(UUID(as_uuid=True), ForeignKey("task_submissions.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    status = Column(String, nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    run_after = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_review_jobs_status_run_after", "status", "run_after"),
+    )
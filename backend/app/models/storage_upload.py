@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, DateTime, Text, BigInteger
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class StorageUpload(Base):
+    """
+    In-progress resumable (TUS) upload to Supabase Storage.
+
+    resume_key identifies the logical upload across attempts (for image
+    callbacks: the callback record id). A retry with the same key and size
+    continues at the server's offset on upload_url instead of starting over,
+    into the same object_path. Rows are deleted once the upload completes.
+    See StorageClient.upload_resumable in services/storage_service.py.
+    """
+    __tablename__ = "storage_uploads"
+
+    resume_key = Column(String, primary_key=True)
+    bucket = Column(String, nullable=False)
+    object_path = Column(String, nullable=False)
+    upload_url = Column(Text, nullable=False)
+    content_type = Column(String, nullable=True)
+    total_bytes = Column(BigInteger, nullable=False)
+    # Last offset acknowledged by the server
+    offset = Column(BigInteger, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
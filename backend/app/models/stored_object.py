@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class StoredObject(Base):
+    """
+    Index of content-addressed objects in Supabase Storage.
+
+    Uploads through storage_service are keyed by the SHA-256 of their bytes,
+    so identical content is stored once per bucket. ref_count counts the
+    uploads that resolved to the object; deleting a deliverable releases one
+    reference and the object itself is removed only when none remain.
+    Objects written before content addressing are not listed here.
+    """
+    __tablename__ = "stored_objects"
+    __table_args__ = (
+        UniqueConstraint("bucket", "object_path", name="uq_stored_objects_path"),
+    )
+
+    bucket = Column(String, primary_key=True)
+    sha256 = Column(String(64), primary_key=True)
+    object_path = Column(String, nullable=False)
+    content_type = Column(String, nullable=True)
+    size_bytes = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=1)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_referenced_at = Column(DateTime(timezone=True), server_default=func.now())
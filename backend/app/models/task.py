@@ -1,11 +1,16 @@
 import enum
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum, Text, Integer, Float, Boolean, Table
+from typing import Optional
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum, Text, Integer, Float, Boolean, Table, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm.attributes import set_committed_value
 from app.db.session import Base
+from app.db.types import JSONDocument
 from app.models.project import PaymentStatus, DeliveryState
+from app.models.brief_snapshot import BriefSnapshot  # noqa: F401  (resolves brief_snapshot_ref)
 
 
 class TaskStatus(str, enum.Enum):
@@ -81,12 +86,12 @@ class TaskSubmission(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), nullable=False, index=True)
-    submitted_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    submitted_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
 
     content = Column(Text, nullable=True)
-    links = Column(Text, nullable=True)            # JSON list of URLs
-    file_paths = Column(Text, nullable=True)             # JSON list of file paths/keys
-    watermarked_file_paths = Column(Text, nullable=True) # JSON list of watermarked preview URLs (set by n8n callback)
+    links = Column(JSONDocument, nullable=True)                  # list of URLs
+    file_paths = Column(JSONDocument, nullable=True)             # list of file paths/keys
+    watermarked_file_paths = Column(JSONDocument, nullable=True) # list of watermarked preview URLs (set by n8n callback)
     watermark_file_path = Column(Text, nullable=True)    # Raw storage path received from webhook (e.g. task-submissions/preview/...)
 
     submission_status = Column(
@@ -97,14 +102,16 @@ class TaskSubmission(Base):
 
     # ── Brief snapshot: exact brief content captured at submission time ────────
     # Stored so manager sees the brief the employee was working against,
-    # even if the brief is later edited.
-    brief_snapshot = Column(Text, nullable=True)
+    # even if the brief is later edited. The text lives once per distinct
+    # brief in brief_snapshots (see models/brief_snapshot.py).
+    brief_snapshot_hash = Column(String(64), ForeignKey("brief_snapshots.hash"), nullable=True, index=True)
+    brief_snapshot_ref = relationship("BriefSnapshot", lazy="select")
 
-    webhook_response = Column(Text, nullable=True)
+    webhook_response = Column(JSONDocument, nullable=True)
 
     # ── Parsed + normalized AI analysis result (JSON) ─────────────────────
     # Normalized structure: {status, summary, score, checks{...}, feedback[]}
-    ai_analysis_result = Column(Text, nullable=True)
+    ai_analysis_result = Column(JSONDocument, nullable=True)
 
     ai_score = Column(Float, nullable=True)        # 0-100
     ai_feedback = Column(Text, nullable=True)
@@ -118,6 +125,54 @@ class TaskSubmission(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # attempt_number is handed out by SubmissionAttemptCounter; this backs it up
+        UniqueConstraint("task_id", "submitted_by", "attempt_number", name="uq_task_submissions_attempt"),
+    )
+
+    @hybrid_property
+    def ai_status(self) -> Optional[str]:
+        """Normalized AI verdict ("aligns", "needs_revision", …); filterable in SQL."""
+        return (self.ai_analysis_result or {}).get("status")
+
+    @ai_status.inplace.expression
+    @classmethod
+    def _ai_status_expression(cls):
+        return cls.ai_analysis_result["status"].as_string()
+
+    @property
+    def image_urls(self) -> list[str]:
+        return list(self.file_paths or [])
+
+    @property
+    def brief_snapshot(self) -> Optional[str]:
+        ref = self.brief_snapshot_ref
+        return ref.text if ref is not None else None
+
+    @brief_snapshot.setter
+    def brief_snapshot(self, value: Optional[str]) -> None:
+        if value is not None:
+            raise AttributeError(
+                "brief_snapshot is content-addressed; set brief_snapshot_hash from brief_snapshot_service.intern()"
+            )
+        # Blanks the field for one response (client views); never flushed
+        set_committed_value(self, "brief_snapshot_ref", None)
+
+
+class SubmissionAttemptCounter(Base):
+    """
+    Last attempt_number handed out per (task, submitter).
+
+    create_submission bumps the row with a single INSERT … ON CONFLICT DO
+    UPDATE … RETURNING inside its transaction. The row lock serialises
+    concurrent submits by the same employee on the same task, so two attempts
+    can never get the same number. No COUNT(*) over task_submissions is needed.
+    """
+    __tablename__ = "submission_attempt_counters"
+
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    submitted_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    last_attempt = Column(Integer, nullable=False, default=0)
 
 
 class TaskFeedback(Base):
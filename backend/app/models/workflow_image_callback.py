@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -18,6 +18,7 @@ class WorkflowImageCallback(Base):
                     → failed       (upload or DB error, recoverable)
                     → orphaned     (upload succeeded, DB update AND rollback both failed)
                     → expired      (token TTL elapsed before n8n called back)
+      orphaned → orphan_removed (storage reconciler deleted the leftover object)
     """
     __tablename__ = "workflow_image_callbacks"
 
@@ -50,3 +51,7 @@ class WorkflowImageCallback(Base):
     processed_at = Column(DateTime(timezone=True), nullable=True)
     created_at   = Column(DateTime(timezone=True), server_default=func.now())
     updated_at   = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_workflow_image_callbacks_status_expires_at", "status", "expires_at"),
+    )
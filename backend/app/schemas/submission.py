@@ -7,7 +7,8 @@ Pydantic schemas for the rebuilt work submission system.
 from __future__ import annotations
 
 from pydantic import BaseModel, ConfigDict, field_validator
-from typing import Optional, List
+import json
+from typing import Any, Optional, List
 from uuid import UUID
 from datetime import datetime
 from app.models.task import SubmissionStatus
@@ -35,7 +36,19 @@ class SubmissionCreateRequest(BaseModel):
 
 # ── Response schemas ───────────────────────────────────────────────────────────
 
-class SubmissionRead(BaseModel):
+# JSON document columns are returned as JSON strings, as the frontend parses them itself
+JSON_TEXT_FIELDS = ("links", "file_paths", "watermarked_file_paths", "webhook_response", "ai_analysis_result")
+
+
+def as_json_text(value: Any) -> Optional[str]:
+    # A stored JSON string is encoded too, so every non-null field parses as JSON
+    if value is None:
+        return None
+    return json.dumps(value)
+
+
+class SubmissionShortRead(BaseModel):
+    """List view: everything except the brief, which only the detail read returns."""
     id: UUID
     task_id: UUID
     submitted_by: UUID
@@ -45,7 +58,6 @@ class SubmissionRead(BaseModel):
     watermarked_file_paths: Optional[str] = None  # JSON list of watermarked preview URLs (set by n8n callback)
     watermark_file_path: Optional[str] = None     # Raw storage path string
     submission_status: SubmissionStatus = SubmissionStatus.pending
-    brief_snapshot: Optional[str] = None
     webhook_response: Optional[str] = None
     ai_analysis_result: Optional[str] = None   # Normalized JSON: {status, summary, score, checks, feedback}
     ai_score: Optional[float] = None
@@ -58,6 +70,12 @@ class SubmissionRead(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    _json_text = field_validator(*JSON_TEXT_FIELDS, mode="before")(as_json_text)
+
+
+class SubmissionRead(SubmissionShortRead):
+    brief_snapshot: Optional[str] = None
+
 
 # ── Async webhook callback schema ──────────────────────────────────────────────
 
@@ -121,3 +139,17 @@ class WatermarkCallbackPayload(BaseModel):
     submission_id: UUID
     files: Optional[List[WatermarkedFile]] = None
     image_path: Optional[str] = None
+
+
+class ReviewJobRead(BaseModel):
+    id: UUID
+    submission_id: UUID
+    status: str                     # queued | running | completed | failed
+    attempts: int
+    last_error: Optional[str] = None
+    run_after: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
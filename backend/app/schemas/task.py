@@ -1,9 +1,10 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing import Optional, List, Any
 from uuid import UUID
 from datetime import datetime
 from app.models.task import TaskStatus, SubmissionStatus
 from app.models.project import PaymentStatus, DeliveryState
+from app.schemas.submission import JSON_TEXT_FIELDS, as_json_text
 
 
 class TaskBase(BaseModel):
@@ -67,7 +68,8 @@ class TaskSubmissionCreate(BaseModel):
     file_paths: Optional[List[str]] = None
 
 
-class TaskSubmissionRead(BaseModel):
+class TaskSubmissionShortRead(BaseModel):
+    """List view: the brief is left to the detail reads."""
     id: UUID
     task_id: UUID
     submitted_by: UUID
@@ -76,7 +78,6 @@ class TaskSubmissionRead(BaseModel):
     file_paths: Optional[str] = None
     watermarked_file_paths: Optional[str] = None
     submission_status: SubmissionStatus = SubmissionStatus.pending
-    brief_snapshot: Optional[str] = None
     webhook_response: Optional[str] = None
     ai_analysis_result: Optional[str] = None
     ai_score: Optional[float] = None
@@ -89,6 +90,12 @@ class TaskSubmissionRead(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    _json_text = field_validator(*JSON_TEXT_FIELDS, mode="before")(as_json_text)
+
+
+class TaskSubmissionRead(TaskSubmissionShortRead):
+    brief_snapshot: Optional[str] = None
+
 
 # --- Feedback Schemas ---
 
@@ -1,23 +1,239 @@
+"""
+services/activity_service.py
+────────────────────────────
+Activity log reads and writes.
+
+Most log entries are informational and nobody reads the returned row, so by
+default create_log() only queues the entry; a background thread inserts the
+queue with multi-row INSERTs once ACTIVITY_LOG_BATCH_SIZE entries are waiting
+or every ACTIVITY_LOG_FLUSH_SECONDS. Inside a unit_of_work the entry is queued
+only after the caller's transaction commits, so rolled-back work is never
+logged.
+
+Audit-critical actions pass durable=True and are written in the caller's
+transaction instead. The buffer is drained on lifespan shutdown.
+
+Buffered rows are stamped with created_at when they are inserted, not when
+the event was queued. The (created_at, id) keyset cursor therefore only
+ever sees rows appear ahead of it. A row stamped with its event time but
+flushed after a page was served (by this or any other worker) would fall
+behind the cursor and be skipped for good. The stored time trails the event
+by at most one flush interval, or longer while the database is unreachable.
+"""
+
+import base64
+import logging
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import insert, tuple_
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.session import SessionLocal, after_commit, commit_unless_in_unit_of_work
 from app.models.activity import ActivityLog
 from app.schemas.activity import ActivityLogCreate
 from uuid import UUID
 
+logger = logging.getLogger(__name__)
+
+
+class InvalidCursorError(ValueError):
+    """The pagination cursor could not be decoded."""
+
+
+def encode_cursor(log: ActivityLog) -> str:
+    raw = f"{log.created_at.isoformat()}|{log.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, log_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(log_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise InvalidCursorError(f"Invalid cursor: {exc}")
+
+
+class _ActivityLogBuffer:
+    def __init__(self):
+        self._rows: list[dict] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def append(self, row: dict) -> None:
+        with self._lock:
+            self._rows.append(row)
+            size = len(self._rows)
+            if not self._closed and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name="activity-log-flush", daemon=True)
+                self._thread.start()
+
+        if self._closed or size >= settings.ACTIVITY_LOG_MAX_BUFFER:
+            # Shutting down, or the writer has fallen behind: the caller pays for the flush
+            self.flush()
+        elif size >= settings.ACTIVITY_LOG_BATCH_SIZE:
+            self._wake.set()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(settings.ACTIVITY_LOG_FLUSH_SECONDS)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("[ActivityLog] Background flush failed: %s", e)
+
+    def flush(self) -> int:
+        """Insert everything queued so far. Returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            written = 0
+            batch_size = max(1, settings.ACTIVITY_LOG_BATCH_SIZE)
+            for start in range(0, len(rows), batch_size):
+                # Insert time, not event time: see the module docstring
+                stamped = datetime.now(timezone.utc)
+                chunk = [{**row, "created_at": stamped} for row in rows[start:start + batch_size]]
+                db = SessionLocal()
+                try:
+                    db.execute(insert(ActivityLog), chunk)
+                    db.commit()
+                    written += len(chunk)
+                except OperationalError as e:
+                    # Database unreachable — put the rest back and retry on the next tick
+                    db.rollback()
+                    self._requeue(rows[start:])
+                    logger.warning("[ActivityLog] Flush deferred (%d rows): %s", len(rows) - start, e)
+                    break
+                except Exception as e:
+                    # Bad rows (e.g. unknown user_id) would fail forever; drop this batch only
+                    db.rollback()
+                    logger.error("[ActivityLog] Dropped %d rows: %s", len(chunk), e)
+                finally:
+                    db.close()
+            return written
+
+    def _requeue(self, rows: list[dict]) -> None:
+        with self._lock:
+            room = settings.ACTIVITY_LOG_MAX_BUFFER - len(self._rows)
+            if room < len(rows):
+                logger.error("[ActivityLog] Buffer full — dropped %d rows", len(rows) - max(room, 0))
+                rows = rows[:max(room, 0)]
+            self._rows[:0] = rows
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+        self.flush()
+
+
 class ActivityService:
+    def __init__(self):
+        self._buffer = _ActivityLogBuffer()
+
     def get_logs(self, db: Session, skip: int = 0, limit: int = 20):
-        return db.query(ActivityLog).order_by(ActivityLog.created_at.desc()).offset(skip).limit(limit).all()
+        logs, _ = self.get_logs_page(db, skip=skip, limit=limit)
+        return logs
+
+    def get_logs_page(
+        self,
+        db: Session,
+        *,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        user_id: Optional[UUID] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[UUID] = None,
+        action: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> tuple[list[ActivityLog], Optional[str]]:
+        """Newest-first page of logs plus the cursor for the next page (None on the last one).
 
-    def create_log(self, db: Session, user_id: UUID, action: str, entity_type: str, entity_id: UUID = None, details: dict = None):
-        db_log = ActivityLog(
+        Paging walks the (created_at, id) index from the cursor position, so the
+        cost of a page does not grow with its depth. `skip` is still honoured for
+        older clients but should be left at 0 when a cursor is given.
+        """
+        # Read-your-writes within this worker; other workers lag by one flush interval
+        if self._buffer.pending():
+            self._buffer.flush()
+
+        query = db.query(ActivityLog)
+        if user_id is not None:
+            query = query.filter(ActivityLog.user_id == user_id)
+        if entity_type is not None:
+            query = query.filter(ActivityLog.entity_type == entity_type)
+        if entity_id is not None:
+            query = query.filter(ActivityLog.entity_id == entity_id)
+        if action is not None:
+            query = query.filter(ActivityLog.action == action)
+        if since is not None:
+            query = query.filter(ActivityLog.created_at >= since)
+        if until is not None:
+            query = query.filter(ActivityLog.created_at < until)
+        if cursor:
+            created_at, log_id = decode_cursor(cursor)
+            query = query.filter(tuple_(ActivityLog.created_at, ActivityLog.id) < (created_at, log_id))
+
+        rows = (
+            query.order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc())
+            .offset(skip)
+            .limit(limit + 1)
+            .all()
+        )
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, encode_cursor(rows[-1])
+        return rows, None
+
+    def create_log(
+        self,
+        db: Session,
+        user_id: UUID,
+        action: str,
+        entity_type: str,
+        entity_id: UUID = None,
+        details: dict = None,
+        durable: bool = False,
+    ):
+        row = dict(
+            id=uuid.uuid4(),
             user_id=user_id,
             action=action,
             entity_type=entity_type,
             entity_id=entity_id,
-            details=details
+            details=details,
         )
-        db.add(db_log)
-        db.commit()
-        db.refresh(db_log)
-        return db_log
+        if durable:
+            db_log = ActivityLog(**row, created_at=datetime.now(timezone.utc))
+            db.add(db_log)
+            if commit_unless_in_unit_of_work(db):
+                db.refresh(db_log)
+            return db_log
+
+        # No created_at yet: flush() stamps it at insert time (see module docstring)
+        after_commit(db, lambda: self._buffer.append(row))
+        return ActivityLog(**row)
+
+    def flush(self) -> int:
+        return self._buffer.flush()
+
+    def close(self) -> None:
+        """Stop the background writer and insert whatever is still queued."""
+        self._buffer.close()
 
 activity_service = ActivityService()
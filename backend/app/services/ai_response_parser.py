@@ -0,0 +1,194 @@
+"""
+services/ai_response_parser.py
+──────────────────────────────
+Parsing of the n8n/Gemini AI review webhook response into the normalized
+verdict stored on a submission.
+
+Two response formats are accepted:
+
+FORMAT 1 — Gemini/Vertex AI list:
+    [{"content": {"parts": [{"text": "```json\\n{...}\\n```"}]}, ...}]
+
+FORMAT 2 — Legacy direct dict:
+    {"status": "valid" | "invalid", "score": 0-100, "feedback": "..."}
+
+Normalized result:
+    {
+        "status": "aligns" | "does_not_align" | "needs_revision" | "error",
+        "summary": str,
+        "score": int (0-100),
+        "checks": {
+            "subject_concept": str, "brand_message": str, "target_audience": str,
+            "style_mood": str, "colors": str, "composition": str, "required_elements": str
+        },
+        "feedback": list[str]
+    }
+
+The fence pattern is compiled once at import, and the code fence is removed
+in a single pass over the text. JSON is decoded with orjson when it is
+installed, falling back to the standard library otherwise; both produce the
+same Python values.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+AI_STATUSES = frozenset({"aligns", "does_not_align", "needs_revision", "error"})
+CHECK_KEYS = (
+    "subject_concept",
+    "brand_message",
+    "target_audience",
+    "style_mood",
+    "colors",
+    "composition",
+    "required_elements",
+)
+
+# Opening fence with an optional language tag: ``` / ```json / ```JSON
+_OPENING_FENCE = re.compile(r"```(?:json)?\s*", re.IGNORECASE)
+_CLOSING_FENCE = "```"
+
+if orjson is not None:
+    JSON_BACKEND = "orjson"
+    _loads = orjson.loads
+else:
+    JSON_BACKEND = "json"
+    _loads = json.loads
+
+
+def empty_checks() -> dict:
+    return dict.fromkeys(CHECK_KEYS, "unknown")
+
+
+def _error_result(summary: str) -> dict:
+    return {
+        "status": "error",
+        "summary": summary,
+        "score": 0,
+        "checks": empty_checks(),
+        "feedback": [],
+    }
+
+
+def strip_code_fence(text: str) -> str:
+    """Remove a surrounding markdown code fence (```json … ``` or ``` … ```).
+
+    A missing closing fence (truncated model output) leaves the body as is.
+    """
+    text = text.strip()
+    start, end = 0, len(text)
+    if text.startswith(_CLOSING_FENCE):
+        start = _OPENING_FENCE.match(text).end()
+    if end - start >= len(_CLOSING_FENCE) and text.endswith(_CLOSING_FENCE):
+        end -= len(_CLOSING_FENCE)
+    return text[start:end].strip()
+
+
+def _clamp_score(score: Any) -> int:
+    try:
+        return max(0, min(100, int(float(score))))
+    except (TypeError, ValueError):
+        return 0
+
+
+def parse_ai_response(raw_response: Any) -> Optional[dict]:
+    """Normalized verdict for a webhook response, or None if it cannot be parsed at all."""
+    if not raw_response:
+        return None
+
+    if isinstance(raw_response, list):
+        try:
+            text = raw_response[0]["content"]["parts"][0]["text"]
+        except (IndexError, KeyError, TypeError) as exc:
+            logger.warning("Webhook list response: could not extract text — %s", exc)
+            return _error_result("AI response structure was unrecognized.")
+
+        text = strip_code_fence(text)
+        if not text:
+            logger.warning("Webhook list response: extracted text was empty after stripping")
+            return _error_result("AI analysis returned an empty response.")
+
+        try:
+            parsed = _loads(text)
+        except ValueError as exc:  # json.JSONDecodeError and orjson.JSONDecodeError
+            logger.warning(
+                "Webhook list response: JSON parse failed — %s | text_preview=%s",
+                exc, text[:300],
+            )
+            return _error_result("AI analysis JSON could not be parsed.")
+
+        if not isinstance(parsed, dict):
+            logger.warning("Webhook list response: JSON is %s, not an object", type(parsed).__name__)
+            return _error_result("AI analysis JSON could not be parsed.")
+        return normalize_ai_result(parsed)
+
+    if isinstance(raw_response, dict):
+        if str(raw_response.get("status", "")).lower() in AI_STATUSES:
+            return normalize_ai_result(raw_response)
+        # Legacy format: {"status": "valid"/"invalid", ...}
+        return normalize_legacy_response(raw_response)
+
+    logger.warning("Webhook response is neither list nor dict: %s", type(raw_response))
+    return None
+
+
+def normalize_ai_result(parsed: dict) -> dict:
+    status = str(parsed.get("status", "error")).lower()
+    if status not in AI_STATUSES:
+        status = "error"
+
+    feedback = parsed.get("feedback", [])
+    if isinstance(feedback, str):
+        feedback = [feedback] if feedback.strip() else []
+    elif not isinstance(feedback, list):
+        feedback = []
+
+    checks = parsed.get("checks")
+    if not isinstance(checks, dict):
+        checks = empty_checks()
+    elif not all(key in checks for key in CHECK_KEYS):
+        # Copy rather than fill in place: the input may be a cached raw response
+        checks = {**checks, **{key: "unknown" for key in CHECK_KEYS if key not in checks}}
+
+    return {
+        "status": status,
+        "summary": str(parsed.get("summary", "")).strip(),
+        "score": _clamp_score(parsed.get("score", 0)),
+        "checks": checks,
+        "feedback": [str(f) for f in feedback if f],
+    }
+
+
+def normalize_legacy_response(data: dict) -> dict:
+    """Convert legacy {'status': 'valid'/'invalid', 'score': ..., 'feedback': ...} to normalized."""
+    wh_status = str(data.get("status", "")).lower()
+    feedback_text = str(data.get("feedback", "")).strip()
+
+    if wh_status == "valid":
+        status = "aligns"
+        summary = feedback_text or "Work aligns with the brief requirements."
+    elif wh_status == "invalid":
+        status = "does_not_align"
+        summary = feedback_text or "Work does not meet the brief requirements."
+    else:
+        status = "error"
+        summary = "Validation status could not be determined."
+
+    return {
+        "status": status,
+        "summary": summary,
+        "score": _clamp_score(data.get("score", 0)),
+        "checks": empty_checks(),
+        "feedback": [feedback_text] if feedback_text else [],
+    }
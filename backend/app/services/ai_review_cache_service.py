@@ -0,0 +1,174 @@
+"""
+services/ai_review_cache_service.py
+───────────────────────────────────
+Reuse of AI review verdicts for resubmitted identical work.
+
+run_review computes a key from the submitted image bytes, the brief snapshot,
+the submission text, the task title and project name (both are in the
+webhook payload the reviewer sees) and AI_REVIEW_WORKFLOW_VERSION. On a hit the cached
+normalized verdict is applied directly and the n8n/Gemini workflow is not
+called. On a miss the webhook runs as usual, and a usable verdict is stored
+in the same transaction that applies it. "error" verdicts are never cached.
+Expired entries are deleted in batches by purge_expired(), which the storage
+reconciler's periodic pass calls, never inside a verdict's transaction.
+
+Keys need the image bytes, so only the buffered webhook path uses the cache.
+With SUBMISSION_WEBHOOK_STREAMING the images are never held in memory and
+every submission is reviewed afresh.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, NamedTuple, Optional, Sequence
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import LatencyRecorder
+from app.db.session import SessionLocal
+from app.models.ai_review_cache import AIReviewCache
+from app.services.review_image_service import review_image_service
+
+logger = logging.getLogger(__name__)
+
+_PURGE_BATCH = 1000
+
+
+class ReviewCacheKey(NamedTuple):
+    cache_key: str
+    files_hash: str
+    brief_hash: str
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class AIReviewCacheService:
+    def __init__(self):
+        self.metrics = LatencyRecorder()
+
+    @staticmethod
+    def enabled() -> bool:
+        return settings.AI_REVIEW_CACHE_TTL_SECONDS > 0 and not settings.SUBMISSION_WEBHOOK_STREAMING
+
+    @staticmethod
+    def key_for(
+        image_contents: Sequence[Optional[bytes]],
+        brief_snapshot: Optional[str],
+        content: Optional[str],
+        *,
+        task_title: str,
+        project_name: str,
+    ) -> Optional[ReviewCacheKey]:
+        """Key for this exact review input, or None if an image could not be fetched."""
+        if any(c is None for c in image_contents):
+            # The reviewer would see fewer images than were submitted; don't share that verdict
+            return None
+        files_hash = _sha256("\n".join(_sha256(c) for c in image_contents).encode())
+        brief_hash = _sha256((brief_snapshot or "").encode())
+        content_hash = _sha256((content or "").encode())
+        context_hash = _sha256(f"{project_name}\n{task_title}".encode())
+        version = settings.AI_REVIEW_WORKFLOW_VERSION
+        if review_image_service.signature():
+            # The reviewer saw downscaled copies; verdicts on other renditions don't carry over
+            version = f"{version}+{review_image_service.signature()}"
+        cache_key = _sha256(f"{version}|{files_hash}|{brief_hash}|{content_hash}|{context_hash}".encode())
+        return ReviewCacheKey(cache_key, files_hash, brief_hash)
+
+    def lookup(self, key: ReviewCacheKey) -> Optional[tuple[dict, Any]]:
+        """(normalized result, raw response) for a live entry, else None.
+
+        Uses its own short session so the caller's session stays outside a
+        transaction while the webhook may still have to run.
+        """
+        if settings.AI_REVIEW_CACHE_BYPASS:
+            self.metrics.incr("bypassed")
+            return None
+        db = SessionLocal()
+        try:
+            now = datetime.now(timezone.utc)
+            entry = (
+                db.query(AIReviewCache)
+                .filter(AIReviewCache.cache_key == key.cache_key, AIReviewCache.expires_at > now)
+                .first()
+            )
+            if entry is None:
+                self.metrics.incr("misses")
+                return None
+            result, raw = entry.result, entry.raw_response
+            db.execute(
+                update(AIReviewCache)
+                .where(AIReviewCache.cache_key == key.cache_key)
+                .values(hits=AIReviewCache.hits + 1)
+            )
+            db.commit()
+            self.metrics.incr("hits")
+            return result, raw
+        except Exception as e:
+            db.rollback()
+            logger.warning("[AIReviewCache] Lookup failed, reviewing afresh: %s", e)
+            self.metrics.incr("errors")
+            return None
+        finally:
+            db.close()
+
+    def store(self, db: Session, key: ReviewCacheKey, normalized: dict, raw_response: Any) -> None:
+        """Save a verdict in the caller's transaction (replacing any previous one)."""
+        if normalized.get("status") == "error":
+            return
+        now = datetime.now(timezone.utc)
+        try:
+            # Savepoint: a failed cache write must not undo the verdict it rides along with
+            with db.begin_nested():
+                db.execute(delete(AIReviewCache).where(AIReviewCache.cache_key == key.cache_key))
+                db.execute(insert(AIReviewCache).values(
+                    cache_key=key.cache_key,
+                    workflow_version=settings.AI_REVIEW_WORKFLOW_VERSION,
+                    files_hash=key.files_hash,
+                    brief_hash=key.brief_hash,
+                    result=normalized,
+                    raw_response=raw_response,
+                    hits=0,
+                    expires_at=now + timedelta(seconds=settings.AI_REVIEW_CACHE_TTL_SECONDS),
+                ))
+        except Exception as e:
+            # Typically a concurrent identical review that stored the same key first
+            logger.warning("[AIReviewCache] Could not store verdict: %s", e)
+            self.metrics.incr("errors")
+            return
+        self.metrics.incr("stored")
+
+    def purge_expired(self, *, dry_run: bool = False) -> int:
+        """Delete expired entries in batches of _PURGE_BATCH, one short transaction each."""
+        db = SessionLocal()
+        try:
+            expired = AIReviewCache.expires_at <= datetime.now(timezone.utc)
+            if dry_run:
+                return db.scalar(select(func.count()).select_from(AIReviewCache).where(expired)) or 0
+            purged = 0
+            while True:
+                batch = select(AIReviewCache.cache_key).where(expired).limit(_PURGE_BATCH)
+                deleted = db.execute(
+                    delete(AIReviewCache)
+                    .where(AIReviewCache.cache_key.in_(batch.scalar_subquery()))
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                db.commit()
+                purged += deleted
+                if deleted < _PURGE_BATCH:
+                    break
+        finally:
+            db.close()
+        self.metrics.incr("purged", purged)
+        return purged
+
+    def get_metrics(self) -> dict:
+        return {"enabled": self.enabled(), **self.metrics.snapshot()}
+
+
+ai_review_cache_service = AIReviewCacheService()
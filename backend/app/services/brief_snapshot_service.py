@@ -0,0 +1,63 @@
+"""
+services/brief_snapshot_service.py
+──────────────────────────────────
+Writes to the content-addressed brief_snapshots table.
+
+intern() stores a brief text once, keyed by its SHA-256, and returns the key
+for TaskSubmission.brief_snapshot_hash. Texts above a small threshold are
+zlib-compressed when that actually saves space. Inserting an existing key is
+a no-op, so concurrent submissions on the same brief never conflict.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import zlib
+from typing import Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.db.dialect import upsert
+from app.models.brief_snapshot import BriefSnapshot
+
+_COMPRESS_MIN_BYTES = 256
+
+
+def encode_snapshot(text: str) -> dict:
+    """Row values for `text`. Migration 009 inlines the same encoding."""
+    raw = text.encode("utf-8")
+    compression, data = "none", raw
+    if len(raw) >= _COMPRESS_MIN_BYTES:
+        packed = zlib.compress(raw, 6)
+        if len(packed) < len(raw):
+            compression, data = "zlib", packed
+    return {
+        "hash": hashlib.sha256(raw).hexdigest(),
+        "compression": compression,
+        "data": data,
+        "size_bytes": len(raw),
+    }
+
+
+class BriefSnapshotService:
+    @staticmethod
+    def intern(db: Session, text: Optional[str]) -> Optional[str]:
+        """Store `text` if new (in the caller's transaction) and return its hash."""
+        if not text:
+            return None
+        row = encode_snapshot(text)
+        stmt = upsert(db, BriefSnapshot, row, index_elements=[BriefSnapshot.hash])
+        if stmt is None:
+            exists = db.execute(
+                select(BriefSnapshot.hash).where(BriefSnapshot.hash == row["hash"])
+            ).first()
+            if not exists:
+                db.execute(insert(BriefSnapshot).values(**row))
+            return row["hash"]
+
+        db.execute(stmt)
+        return row["hash"]
+
+
+brief_snapshot_service = BriefSnapshotService()
@@ -0,0 +1,310 @@
+"""
+services/dashboard_service.py
+─────────────────────────────
+Manager dashboard aggregation (GET /projects/manager-dashboard).
+
+Per-worker stats are read from the employee_stats rollup (one row per
+employee); the KPIs, revenue, workload and project snapshots come from a
+handful of GROUP BY / FILTER (WHERE …) aggregates instead of one COUNT query
+per figure, and the alert lists are fetched with their task in the same
+query.
+
+The assembled response is cached for DASHBOARD_CACHE_TTL_SECONDS. A session
+event drops the cache as soon as a transaction that touched tasks,
+submissions, projects or users commits, so managers see their own edits
+immediately; other API workers converge within the TTL.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, event, func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import LatencyRecorder
+from app.models.employee_stats import EmployeeStats
+from app.models.project import Project, ProjectStatus, BriefStatus, PaymentStatus
+from app.models.task import Task, TaskStatus, TaskSubmission
+from app.models.user import User, UserRole
+from app.services import employee_stats_service as _employee_stats  # noqa: F401  (registers rollup maintenance)
+from app.schemas.project import (
+    WorkerStat, RevenueSnapshot, WorkloadTaskItem,
+    TaskWorkloadSnapshot, ProjectSnapshot,
+    DashboardAlertItem, ManagerDashboardData,
+)
+
+logger = logging.getLogger(__name__)
+
+_DONE = (TaskStatus.completed, TaskStatus.approved)
+_CACHE_KEY = "manager"
+
+# Writes to these models can change a dashboard figure
+_TRACKED = (Task, TaskSubmission, Project, User)
+
+
+def _count_where(*conditions):
+    return func.count().filter(and_(*conditions))
+
+
+def _to_workload(t: Task) -> WorkloadTaskItem:
+    return WorkloadTaskItem(
+        id=t.id, title=t.title,
+        status=t.status.value if hasattr(t.status, 'value') else str(t.status),
+        priority=t.priority or 'medium', deadline=t.deadline,
+        project_name=t.project_name, assigned_to=t.assigned_to,
+    )
+
+
+class DashboardService:
+    def __init__(self):
+        self._cache = TTLCache(maxsize=4, ttl=settings.DASHBOARD_CACHE_TTL_SECONDS)
+        self.metrics = LatencyRecorder()
+
+    def get_manager_dashboard(self, db: Session) -> ManagerDashboardData:
+        cached = self._cache.get(_CACHE_KEY)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        data = self._compute(db)
+        self.metrics.observe(time.perf_counter() - started)
+        self.metrics.incr("computed")
+        self._cache.set(_CACHE_KEY, data)
+        return data
+
+    def invalidate(self) -> None:
+        self._cache.clear()
+        self.metrics.incr("invalidated")
+
+    def get_metrics(self) -> dict:
+        return {
+            "cache": self._cache.stats(),
+            "compute": self.metrics.snapshot(),
+        }
+
+    # ── Aggregation ───────────────────────────────────────────────────────────
+
+    def _compute(self, db: Session) -> ManagerDashboardData:
+        now = datetime.now(timezone.utc)
+        three_days = now + timedelta(days=3)
+        is_done = Task.status.in_(_DONE)
+        is_active = Task.status.notin_(_DONE)
+
+        # Per-employee figures come from the employee_stats rollup: one row per employee
+        employees = (
+            db.query(User, EmployeeStats)
+            .outerjoin(EmployeeStats, EmployeeStats.user_id == User.id)
+            .filter(User.role == UserRole.employee)
+            .all()
+        )
+        workers = []
+        for emp, stats in employees:
+            total     = stats.total_tasks if stats else 0
+            completed = stats.completed_tasks if stats else 0
+            on_time   = stats.on_time_tasks if stats else 0
+            avg_ai    = stats.avg_ai_score if stats else None
+
+            completion_rate = completed / total if total > 0 else 0.0
+            deadline_rate   = on_time / completed if completed > 0 else 0.0
+            ai_factor       = (avg_ai if avg_ai is not None else 50.0) / 100.0
+            perf = round((completion_rate * 0.4 + deadline_rate * 0.3 + ai_factor * 0.3) * 100, 1)
+
+            workers.append(WorkerStat(
+                user_id=emp.id,
+                full_name=emp.full_name,
+                email=emp.email,
+                completed_tasks=completed,
+                total_tasks=total,
+                on_time_tasks=on_time,
+                avg_ai_score=round(avg_ai, 1) if avg_ai is not None else None,
+                performance_score=perf,
+            ))
+        workers.sort(key=lambda w: w.performance_score, reverse=True)
+
+        # Global task KPIs + workload counts + global AI average
+        task_totals = db.execute(
+            select(
+                func.count().label("total"),
+                _count_where(is_done).label("completed"),
+                _count_where(is_active).label("active"),
+                _count_where(Task.status == TaskStatus.todo).label("todo"),
+                _count_where(Task.status == TaskStatus.in_progress).label("in_progress"),
+                select(func.avg(TaskSubmission.ai_score))
+                .where(TaskSubmission.ai_score.isnot(None))
+                .scalar_subquery().label("avg_ai"),
+            ).select_from(Task)
+        ).one()
+
+        # Project status and payment counts in one pass over projects
+        project_totals = db.execute(
+            select(
+                func.count().label("total"),
+                _count_where(Project.status == ProjectStatus.active).label("active"),
+                _count_where(Project.status == ProjectStatus.completed).label("completed"),
+                _count_where(Project.status == ProjectStatus.delivered).label("delivered"),
+                _count_where(Project.status == ProjectStatus.on_hold).label("on_hold"),
+                _count_where(
+                    Project.deadline.isnot(None),
+                    Project.deadline < now,
+                    Project.status.notin_([ProjectStatus.completed, ProjectStatus.delivered, ProjectStatus.archived]),
+                ).label("delayed"),
+                _count_where(Project.payment_status == PaymentStatus.fully_paid).label("paid"),
+                _count_where(Project.payment_status == PaymentStatus.unpaid).label("unpaid"),
+                _count_where(Project.payment_status == PaymentStatus.overdue).label("overdue"),
+            ).select_from(Project)
+        ).one()
+
+        paid_projects = (
+            db.query(Project)
+            .filter(Project.payment_status == PaymentStatus.fully_paid)
+            .order_by(Project.paid_at.desc())
+            .limit(5).all()
+        )
+
+        urgent_tasks = db.query(Task).filter(
+            is_active,
+            Task.deadline.isnot(None),
+            Task.deadline < now,
+        ).order_by(Task.deadline.asc()).limit(8).all()
+
+        near_tasks = db.query(Task).filter(
+            is_active,
+            Task.deadline.isnot(None),
+            Task.deadline >= now,
+            Task.deadline <= three_days,
+        ).order_by(Task.deadline.asc()).limit(8).all()
+
+        active_projects_list = (
+            db.query(Project)
+            .filter(Project.status == ProjectStatus.active)
+            .order_by(Project.updated_at.desc())
+            .limit(10).all()
+        )
+
+        alerts = []
+        for t in urgent_tasks:
+            alerts.append(DashboardAlertItem(
+                type='late_task', priority='critical',
+                title=f'Overdue: {t.title}',
+                detail=f'Deadline was {t.deadline.strftime("%b %d") if t.deadline else "N/A"}',
+                entity_id=str(t.project_id),
+            ))
+
+        # Low scores with their task in one query (was one Task lookup per submission)
+        low_subs = (
+            db.query(TaskSubmission.ai_score, Task.title, Task.project_id)
+            .join(Task, Task.id == TaskSubmission.task_id)
+            .filter(TaskSubmission.ai_score < 70, TaskSubmission.ai_score.isnot(None),
+                    TaskSubmission.is_approved == False)
+            .order_by(TaskSubmission.created_at.desc()).limit(5).all()
+        )
+        for ai_score, title, project_id in low_subs:
+            alerts.append(DashboardAlertItem(
+                type='low_ai_score', priority='warning',
+                title=f'Low AI Score: {title}',
+                detail=f'Score {ai_score:.0f}/100 — review required',
+                entity_id=str(project_id),
+            ))
+
+        pending_briefs = db.query(Project).filter(Project.brief_status == BriefStatus.submitted).limit(5).all()
+        for p in pending_briefs:
+            alerts.append(DashboardAlertItem(
+                type='pending_brief', priority='info',
+                title=f'Brief awaiting review: {p.name}',
+                detail=f'Submitted {p.created_at.strftime("%b %d")}',
+                entity_id=str(p.id),
+            ))
+
+        unassigned = db.query(Task).filter(Task.assigned_to.is_(None), Task.status == TaskStatus.todo).limit(5).all()
+        for t in unassigned:
+            alerts.append(DashboardAlertItem(
+                type='unassigned', priority='warning',
+                title=f'Unassigned: {t.title}',
+                detail='No employee assigned yet',
+                entity_id=str(t.project_id),
+            ))
+
+        alerts.sort(key=lambda a: {'critical': 0, 'warning': 1, 'info': 2}[a.priority])
+
+        briefs_list = db.query(Project).filter(
+            Project.brief_status.in_([BriefStatus.submitted, BriefStatus.clarification_requested, BriefStatus.validated])
+        ).limit(20).all()
+
+        total_tasks_global = int(task_totals.total or 0)
+        completed_total = int(task_totals.completed or 0)
+        completion_rate = round(completed_total / total_tasks_global * 100, 1) if total_tasks_global > 0 else 0.0
+        avg_ai_global = task_totals.avg_ai
+
+        return ManagerDashboardData(
+            kpi_total_tasks=total_tasks_global,
+            kpi_completion_rate=completion_rate,
+            kpi_avg_ai_score=round(float(avg_ai_global), 1) if avg_ai_global is not None else None,
+            kpi_active_workers=sum(1 for w in workers if w.total_tasks > 0),
+            workers=workers,
+            revenue=RevenueSnapshot(
+                paid_count=int(project_totals.paid or 0),
+                pending_count=int(project_totals.unpaid or 0),
+                overdue_count=int(project_totals.overdue or 0),
+                recently_paid=paid_projects,
+            ),
+            workload=TaskWorkloadSnapshot(
+                total=int(task_totals.active or 0),
+                todo=int(task_totals.todo or 0),
+                in_progress=int(task_totals.in_progress or 0),
+                near_deadline=[_to_workload(t) for t in near_tasks],
+                urgent=[_to_workload(t) for t in urgent_tasks],
+            ),
+            projects=ProjectSnapshot(
+                total=int(project_totals.total or 0),
+                active=int(project_totals.active or 0),
+                completed=int(project_totals.completed or 0),
+                delivered=int(project_totals.delivered or 0),
+                on_hold=int(project_totals.on_hold or 0),
+                delayed=int(project_totals.delayed or 0),
+            ),
+            alerts=alerts[:15],
+            briefs=briefs_list,
+            active_projects=active_projects_list,
+        )
+
+
+dashboard_service = DashboardService()
+
+
+# ── Cache invalidation ────────────────────────────────────────────────────────
+# Flushes mark the session; the cache is dropped only once that transaction
+# commits, so a rolled-back write never evicts a still-correct snapshot.
+
+@event.listens_for(Session, "after_flush")
+def _mark_dashboard_dirty(session, flush_context):
+    if session.info.get("dashboard_dirty"):
+        return
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _TRACKED):
+            session.info["dashboard_dirty"] = True
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dashboard_dirty_bulk(orm_execute_state):
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _TRACKED):
+        orm_execute_state.session.info["dashboard_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_dashboard(session):
+    if session.info.pop("dashboard_dirty", False):
+        dashboard_service.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_dashboard_dirty(session):
+    session.info.pop("dashboard_dirty", None)
@@ -1,14 +1,18 @@
+import json
 import logging
 
 import requests
 import requests.exceptions
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
+from typing import Optional
 from app.models.project import Project, PaymentType, PaymentStatus, DeliveryState
 from app.models.task import Task, TaskSubmission
 from app.services.notification_service import notification_service
 from app.models.notification import NotificationType
 from app.core.config import settings
+from app.services.http_client import http_client
+from app.services.watermark_service import watermark_service
 
 logger = logging.getLogger(__name__)
 
@@ -21,12 +25,17 @@ class DeliveryService:
         tasks = db.query(Task).filter(Task.project_id == project.id).all()
 
         if project.payment_status == PaymentStatus.fully_paid:
-            for task in tasks:
-                submission = db.query(TaskSubmission).filter(
-                    TaskSubmission.task_id == task.id,
+            task_ids = [t.id for t in tasks]
+            approved_task_ids = {
+                tid for (tid,) in db.query(TaskSubmission.task_id).filter(
+                    TaskSubmission.task_id.in_(task_ids),
                     TaskSubmission.is_approved == True
-                ).order_by(TaskSubmission.created_at.desc()).first()
-                if not submission:
+                ).distinct().all()
+            } if task_ids else set()
+
+            notifications = []
+            for task in tasks:
+                if task.id not in approved_task_ids:
                     continue
 
                 if task.delivery_state != DeliveryState.final_delivered:
@@ -34,23 +43,27 @@ class DeliveryService:
                     task.final_delivered_at = now
                     
                     if project.client_id:
-                        notification_service.create(
-                            db,
+                        notifications.append(dict(
                             user_id=project.client_id,
                             title="Final Work Unlocked!",
                             notification_type=NotificationType.content_ready,
                             body=f"Your final files for '{task.title}' are now available.",
                             project_id=project.id,
                             task_id=task.id
-                        )
+                        ))
 
-            notification_service.create(
-                db,
+            notifications.append(dict(
                 user_id=project.manager_id,
                 title="Project Final Delivery Completed",
                 notification_type=NotificationType.general,
                 body=f"All eligible final deliverables for project '{project.name}' have been unlocked.",
                 project_id=project.id,
+            ))
+            notification_service.create_many(
+                db,
+                notifications,
+                digest=True,
+                digest_subject=f"Final files unlocked — {project.name}",
             )
 
         elif project.payment_status == PaymentStatus.partially_paid:
@@ -58,7 +71,12 @@ class DeliveryService:
             pass
 
 
-    def deliver_task_watermark(self, db: Session, task: Task, project: Project):
+    def deliver_task_watermark(self, db: Session, task: Task, project: Project, notifications: Optional[list] = None):
+        """Trigger the watermark preview for one task.
+
+        When `notifications` is given the client notification is appended to it
+        instead of being sent, so multi-task deliveries can use create_many().
+        """
         if project.payment_type == PaymentType.task:
             if task.payment_status != PaymentStatus.partially_paid:
                 logger.info(
@@ -107,6 +125,7 @@ class DeliveryService:
         # Create a pending callback record so the token is ready whether n8n
         # returns the path inline (sync) or calls back separately (async).
         from app.services.image_callback_service import image_callback_service
+        local_engine = watermark_service.enabled()
         callback_record = None
         callback_url = None
         try:
@@ -116,10 +135,12 @@ class DeliveryService:
                 task_id=task.id,
                 submission_id=submission.id,
                 file_type="watermarked_preview",
+                source="local" if local_engine else "n8n",
             )
-            callback_url = image_callback_service.build_callback_url(
-                callback_record.callback_token
-            )
+            if not local_engine:
+                callback_url = image_callback_service.build_callback_url(
+                    callback_record.callback_token
+                )
         except Exception as e:
             logger.error(
                 "[DeliveryService] Failed to create image callback record  "
@@ -137,6 +158,33 @@ class DeliveryService:
                 or getattr(settings, 'N8N_WORK_SUBMISSION_WEBHOOK', None)
             )
 
+        # ── Local engine: render, upload and complete the callback in-process ──
+        if local_engine and callback_record is not None:
+            if watermark_service.deliver(db, callback_record, submission):
+                webhook_url = None
+            elif webhook_url:
+                logger.warning(
+                    "[DeliveryService] Local watermark failed — falling back to n8n  task_id=%s",
+                    task.id,
+                )
+                try:
+                    callback_record = image_callback_service.create_pending_callback(
+                        db,
+                        project_id=project.id,
+                        task_id=task.id,
+                        submission_id=submission.id,
+                        file_type="watermarked_preview",
+                    )
+                    callback_url = image_callback_service.build_callback_url(
+                        callback_record.callback_token
+                    )
+                except Exception as e:
+                    logger.error(
+                        "[DeliveryService] Failed to create image callback record  "
+                        "task_id=%s  submission_id=%s  error=%s",
+                        task.id, submission.id, e,
+                    )
+
         n8n_response = None
 
         if webhook_url:
@@ -144,7 +192,8 @@ class DeliveryService:
                 "task_id": str(task.id),
                 "project_id": str(project.id),
                 "submission_id": str(submission.id),
-                "file_paths": submission.file_paths,
+                # n8n expects the JSON-encoded list, as stored before the JSONB migration
+                "file_paths": json.dumps(submission.file_paths) if submission.file_paths else None,
                 "payment_type": project.payment_type.value,
                 "payment_status": project.payment_status.value,
                 "client_id": str(project.client_id) if project.client_id else None,
@@ -157,7 +206,8 @@ class DeliveryService:
                 task.id, submission.id, callback_url,
             )
             try:
-                n8n_response = requests.post(
+                n8n_response = http_client.post(
+                    "n8n-watermark",
                     webhook_url,
                     json=payload,
                     timeout=(10, 60),
@@ -188,7 +238,7 @@ class DeliveryService:
                     "url=%s  error=%s",
                     task.id, webhook_url, e,
                 )
-        else:
+        elif not local_engine:
             logger.warning(
                 "[DeliveryService] No watermark webhook URL configured — "
                 "n8n was not triggered  task_id=%s",
@@ -253,8 +303,7 @@ class DeliveryService:
                 )
 
         if project.client_id:
-            notification_service.create(
-                db,
+            preview_notification = dict(
                 user_id=project.client_id,
                 title="Work Preview Available",
                 notification_type=NotificationType.content_ready,
@@ -262,6 +311,10 @@ class DeliveryService:
                 project_id=project.id,
                 task_id=task.id
             )
+            if notifications is not None:
+                notifications.append(preview_notification)
+            else:
+                notification_service.create(db, **preview_notification)
 
         db.commit()
 
@@ -1,11 +1,105 @@
 import smtplib
+import socket
+import ssl
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
+from queue import LifoQueue, Empty, Full
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Errors after which a pooled session is discarded and the send retried once
+# on a fresh connection. Not OSError as a whole: every SMTPException is one,
+# and a rejected recipient or message leaves the session perfectly usable.
+_RECONNECT_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+    ConnectionError,
+    TimeoutError,
+    ssl.SSLError,
+    socket.gaierror,
+)
+
+
+class _SMTPConnectionPool:
+    """Keeps authenticated SMTP sessions alive between sends.
+
+    Sessions idle for longer than idle_timeout are probed with NOOP before
+    reuse, since most servers drop idle clients after a few minutes.
+    """
+
+    def __init__(
+        self,
+        server: str,
+        port: int,
+        user: str,
+        password: str,
+        size: int,
+        idle_timeout: float,
+        starttls: bool = True,
+    ):
+        self.server = server
+        self.port = port
+        self.user = user
+        self.password = password
+        self.idle_timeout = idle_timeout
+        self.starttls = starttls
+        self._idle: LifoQueue = LifoQueue(maxsize=max(1, size))
+        self._lock = threading.Lock()
+        self.connects = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.server, self.port, timeout=30)
+        if self.starttls:
+            conn.starttls()
+        conn.login(self.user, self.password)
+        with self._lock:
+            self.connects += 1
+        return conn
+
+    def acquire(self) -> smtplib.SMTP:
+        while True:
+            try:
+                conn, released_at = self._idle.get_nowait()
+            except Empty:
+                return self._connect()
+            if time.monotonic() - released_at < self.idle_timeout:
+                return conn
+            try:
+                if conn.noop()[0] == 250:
+                    return conn
+            except Exception:
+                pass
+            self.discard(conn)
+
+    def release(self, conn: smtplib.SMTP) -> None:
+        try:
+            self._idle.put_nowait((conn, time.monotonic()))
+        except Full:
+            self.discard(conn)
+
+    @staticmethod
+    def discard(conn: smtplib.SMTP) -> None:
+        try:
+            conn.quit()
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except Empty:
+                return
+            self.discard(conn)
+
+
 class EmailService:
     def __init__(self):
         self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
@@ -13,40 +107,100 @@ class EmailService:
         self.smtp_user = os.getenv("SMTP_USER")
         self.smtp_password = os.getenv("SMTP_PASSWORD")
         self.from_email = os.getenv("FROM_EMAIL", self.smtp_user)
+        self._pool = _SMTPConnectionPool(
+            self.smtp_server,
+            self.smtp_port,
+            self.smtp_user,
+            self.smtp_password,
+            size=int(os.getenv("SMTP_POOL_SIZE", "4")),
+            idle_timeout=float(os.getenv("SMTP_IDLE_TIMEOUT", "60")),
+            # Only for local relays/stand-ins without TLS; never disable in production
+            starttls=os.getenv("SMTP_STARTTLS", "true").lower() != "false",
+        )
 
-    def send_notification_email(self, to_email: str, subject: str, body: str):
-        full_body = f"""
+    @staticmethod
+    def _notification_body(body: str) -> str:
+        return f"""
         Hello,
 
         You have a new notification on AgencyFlow:
-        
+
         {body}
-        
+
         Login to your dashboard to see more details.
         """
-        return self._send(to_email, subject, full_body)
 
-    def _send(self, to_email: str, subject: str, body: str):
-        if not self.smtp_user or not self.smtp_password:
-            print(f"MOCK EMAIL TO {to_email}: [{subject}] {body[:100]}...")
-            return True
+    def send_notification_email(self, to_email: str, subject: str, body: str):
+        return self._send(to_email, subject, self._notification_body(body))
+
+    def send_notification_emails(self, emails: list[tuple[str, str, str]]) -> list[bool]:
+        """Send several (to_email, subject, body) notifications over one SMTP session."""
+        return self.send_many([
+            (to_email, subject, self._notification_body(body))
+            for to_email, subject, body in emails
+        ])
 
+    def _build_message(self, to_email: str, subject: str, body: str) -> MIMEMultipart:
         msg = MIMEMultipart()
         msg['From'] = self.from_email
         msg['To'] = to_email
         msg['Subject'] = subject
         msg.attach(MIMEText(body, 'plain'))
+        return msg
 
+    def _send(self, to_email: str, subject: str, body: str):
+        return self.send_many([(to_email, subject, body)])[0]
+
+    def send_many(self, emails: list[tuple[str, str, str]]) -> list[bool]:
+        """Send a batch of (to_email, subject, body) through one pooled session.
+
+        A dropped session is replaced once per message; a message that fails
+        on a fresh session is reported as False and the batch continues.
+        """
+        if not self.smtp_user or not self.smtp_password:
+            for to_email, subject, body in emails:
+                print(f"MOCK EMAIL TO {to_email}: [{subject}] {body[:100]}...")
+            return [True] * len(emails)
+
+        results: list[bool] = []
+        conn = None
         try:
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.smtp_user, self.smtp_password)
-            server.send_message(msg)
-            server.quit()
-            print(f"REAL EMAIL SENT TO {to_email}")
-            return True
-        except Exception as e:
-            print(f"Error sending email to {to_email}: {e}")
-            return False
+            for to_email, subject, body in emails:
+                msg = self._build_message(to_email, subject, body)
+                sent = False
+                for attempt in range(2):
+                    try:
+                        if conn is None:
+                            conn = self._pool.acquire()
+                        conn.send_message(msg)
+                        sent = True
+                        break
+                    except _RECONNECT_ERRORS as e:
+                        if conn is not None:
+                            self._pool.discard(conn)
+                            conn = None
+                        if attempt == 1:
+                            print(f"Error sending email to {to_email}: {e}")
+                    except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as e:
+                        # Recipient/message-level rejection — session is still usable
+                        print(f"Error sending email to {to_email}: {e}")
+                        break
+                    except smtplib.SMTPException as e:
+                        # Anything else leaves the session in an unknown state; don't reuse it
+                        if conn is not None:
+                            self._pool.discard(conn)
+                            conn = None
+                        print(f"Error sending email to {to_email}: {e}")
+                        break
+                if sent:
+                    print(f"REAL EMAIL SENT TO {to_email}")
+                results.append(sent)
+        finally:
+            if conn is not None:
+                self._pool.release(conn)
+        return results
+
+    def close(self) -> None:
+        self._pool.close_all()
 
 email_service = EmailService()
@@ -0,0 +1,254 @@
+"""
+services/employee_stats_service.py
+──────────────────────────────────
+Maintenance of the employee_stats rollup (see models/employee_stats.py).
+
+Session events record which employees a transaction touched: the assignee of
+any task that was inserted, updated or deleted (old and new assignee on
+reassignment), and the submitter of any submission. Just before the
+transaction commits, those employees' rows are recomputed from tasks and
+task_submissions and upserted in the same transaction. Each employee's
+rollup row is created if missing and locked (FOR UPDATE) before counting:
+two transactions touching the same employee recompute one after the other,
+and under READ COMMITTED the second one counts after the first has
+committed, so neither overwrites the other with a stale count. A recompute reads
+only that employee's rows, so its cost does not grow with the size of the
+tables. Bulk UPDATE/DELETE statements on tasks or submissions cannot say
+which employees they hit, so they trigger a full recompute instead. These
+are rare: project and brief deletion.
+
+Operational commands:
+    python -m app.services.employee_stats_service backfill
+    python -m app.services.employee_stats_service check [--fix]
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import and_, event, func, inspect, insert, select, union
+from sqlalchemy.orm import Session
+
+from app.db.dialect import upsert
+from app.models.employee_stats import EmployeeStats
+from app.models.task import Task, TaskStatus, TaskSubmission
+
+logger = logging.getLogger(__name__)
+
+_DONE = (TaskStatus.completed, TaskStatus.approved)
+_CHUNK = 500
+_FIELDS = ("total_tasks", "completed_tasks", "on_time_tasks", "ai_score_sum", "ai_score_count")
+
+
+def _empty(user_id: UUID) -> dict:
+    return {"user_id": user_id, "total_tasks": 0, "completed_tasks": 0,
+            "on_time_tasks": 0, "ai_score_sum": 0.0, "ai_score_count": 0}
+
+
+def _compute(session: Session, user_ids: list[UUID]) -> dict[UUID, dict]:
+    """Fresh figures for the given employees (zeros for those with no work)."""
+    is_done = Task.status.in_(_DONE)
+    rows = {uid: _empty(uid) for uid in user_ids}
+
+    for uid, total, completed, on_time in session.execute(
+        select(
+            Task.assigned_to,
+            func.count(),
+            func.count().filter(is_done),
+            func.count().filter(and_(is_done, Task.deadline.isnot(None), Task.updated_at <= Task.deadline)),
+        )
+        .where(Task.assigned_to.in_(user_ids))
+        .group_by(Task.assigned_to)
+    ):
+        rows[uid].update(total_tasks=total, completed_tasks=completed, on_time_tasks=on_time)
+
+    for uid, score_sum, score_count in session.execute(
+        select(TaskSubmission.submitted_by, func.sum(TaskSubmission.ai_score), func.count(TaskSubmission.ai_score))
+        .where(TaskSubmission.submitted_by.in_(user_ids), TaskSubmission.ai_score.isnot(None))
+        .group_by(TaskSubmission.submitted_by)
+    ):
+        rows[uid].update(ai_score_sum=float(score_sum or 0.0), ai_score_count=score_count)
+
+    return rows
+
+
+def _upsert(session: Session, rows: list[dict]) -> None:
+    if not rows:
+        return
+    stmt = upsert(
+        session,
+        EmployeeStats,
+        rows,
+        index_elements=[EmployeeStats.user_id],
+        set_=lambda stmt: {**{f: stmt.excluded[f] for f in _FIELDS}, "updated_at": func.now()},
+    )
+    if stmt is None:
+        session.execute(EmployeeStats.__table__.delete().where(
+            EmployeeStats.user_id.in_([r["user_id"] for r in rows])
+        ))
+        session.execute(insert(EmployeeStats), rows)
+        return
+    session.execute(stmt)
+
+
+def _lock_rows(session: Session, user_ids: list[UUID]) -> None:
+    """Create missing rollup rows and lock all of them until the transaction ends.
+
+    Rows are locked in user_id order so transactions touching several
+    employees cannot deadlock each other.
+    """
+    seed = upsert(session, EmployeeStats, [_empty(uid) for uid in user_ids],
+                  index_elements=[EmployeeStats.user_id])
+    if seed is not None:
+        session.execute(seed)
+    session.execute(_lock_statement(user_ids))
+
+
+def _lock_statement(user_ids: list[UUID]):
+    return (
+        select(EmployeeStats.user_id)
+        .where(EmployeeStats.user_id.in_(user_ids))
+        .order_by(EmployeeStats.user_id)
+        .with_for_update()
+    )
+
+
+def _all_employee_ids(session: Session) -> list[UUID]:
+    ids = union(
+        select(Task.assigned_to).where(Task.assigned_to.isnot(None)),
+        select(TaskSubmission.submitted_by),
+        select(EmployeeStats.user_id),
+    )
+    return [uid for (uid,) in session.execute(ids)]
+
+
+class EmployeeStatsService:
+    @staticmethod
+    def recompute(session: Session, user_ids: Iterable[UUID]) -> int:
+        """Recompute and upsert the rows for `user_ids` in the caller's transaction."""
+        ids = sorted(uid for uid in set(user_ids) if uid is not None)
+        for start in range(0, len(ids), _CHUNK):
+            chunk = ids[start:start + _CHUNK]
+            _lock_rows(session, chunk)
+            _upsert(session, list(_compute(session, chunk).values()))
+        return len(ids)
+
+    @staticmethod
+    def recompute_all(session: Session) -> int:
+        return EmployeeStatsService.recompute(session, _all_employee_ids(session))
+
+    @staticmethod
+    def get_all(session: Session) -> dict[UUID, EmployeeStats]:
+        return {s.user_id: s for s in session.query(EmployeeStats).all()}
+
+    @staticmethod
+    def check(session: Session) -> list[dict]:
+        """Compare the table with a fresh computation. Returns the mismatching rows."""
+        stored = EmployeeStatsService.get_all(session)
+        ids = _all_employee_ids(session)
+        mismatches = []
+        for start in range(0, len(ids), _CHUNK):
+            for uid, fresh in _compute(session, ids[start:start + _CHUNK]).items():
+                row = stored.get(uid)
+                current = {f: getattr(row, f) for f in _FIELDS} if row else None
+                expected = {f: fresh[f] for f in _FIELDS}
+                if current is None:
+                    if any(expected.values()):
+                        mismatches.append({"user_id": uid, "stored": None, "expected": expected})
+                elif any(
+                    abs(current[f] - expected[f]) > 1e-6 if f == "ai_score_sum" else current[f] != expected[f]
+                    for f in _FIELDS
+                ):
+                    mismatches.append({"user_id": uid, "stored": current, "expected": expected})
+        return mismatches
+
+
+employee_stats_service = EmployeeStatsService()
+
+
+# ── Change tracking ───────────────────────────────────────────────────────────
+
+def _touched_employees(obj) -> set:
+    if isinstance(obj, Task):
+        hist = inspect(obj).attrs.assigned_to.history
+        return {obj.assigned_to, *hist.deleted}
+    if isinstance(obj, TaskSubmission):
+        return {obj.submitted_by}
+    return set()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_touched_employees(session, flush_context):
+    touched = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        touched |= _touched_employees(obj)
+    touched.discard(None)
+    if touched:
+        session.info.setdefault("employee_stats_dirty", set()).update(touched)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_changes(orm_execute_state):
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in (Task, TaskSubmission):
+        orm_execute_state.session.info["employee_stats_all"] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _refresh_employee_stats(session):
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    full = session.info.pop("employee_stats_all", False)
+    touched = session.info.pop("employee_stats_dirty", None)
+    if full:
+        employee_stats_service.recompute_all(session)
+    elif touched:
+        employee_stats_service.recompute(session, touched)
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_employee_stats_tracking(session):
+    session.info.pop("employee_stats_all", None)
+    session.info.pop("employee_stats_dirty", None)
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def _main(argv: list[str]) -> int:
+    from app.db.session import SessionLocal
+    # Register every mapper so relationships resolve outside the API process
+    from app.models import user, project, task, notification, rbac, activity, workflow_image_callback, employee_stats, review_job, ai_review_cache, brief_snapshot, storage_upload, stored_object  # noqa: F401
+
+    if not argv or argv[0] not in ("backfill", "check"):
+        print("usage: python -m app.services.employee_stats_service backfill | check [--fix]")
+        return 2
+
+    db = SessionLocal()
+    try:
+        if argv[0] == "backfill":
+            count = employee_stats_service.recompute_all(db)
+            db.commit()
+            print(f"employee_stats: recomputed {count} employee(s)")
+            return 0
+
+        mismatches = employee_stats_service.check(db)
+        for m in mismatches:
+            print(f"MISMATCH user_id={m['user_id']} stored={m['stored']} expected={m['expected']}")
+        print(f"employee_stats: {len(mismatches)} mismatching row(s)")
+        if mismatches and "--fix" in argv:
+            employee_stats_service.recompute(db, [m["user_id"] for m in mismatches])
+            db.commit()
+            print("employee_stats: mismatches repaired")
+            return 0
+        return 1 if mismatches else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
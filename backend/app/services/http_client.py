@@ -0,0 +1,214 @@
+"""
+services/http_client.py
+───────────────────────
+Shared outbound HTTP client for n8n webhooks and other upstream services.
+
+Every upstream is addressed by an endpoint name ("n8n-brief",
+"n8n-watermark", …). Each endpoint gets its own:
+
+  • requests.Session with a keep-alive connection pool, so repeated calls
+    reuse TCP/TLS connections instead of reconnecting every time.
+  • Retry policy. Calls marked idempotent are retried on connection errors,
+    timeouts and 502/503/504 with exponential backoff and full jitter. Other
+    calls are never replayed, because n8n workflows have side effects.
+  • Circuit breaker. After HTTP_BREAKER_FAILURE_THRESHOLD consecutive
+    failures (connection error, timeout or 5xx) the endpoint fails fast with
+    CircuitOpenError for HTTP_BREAKER_RESET_SECONDS. After that one trial
+    request is let through, and the circuit closes again if it succeeds.
+  • Latency and error metrics, exposed through GET /management/http-metrics.
+
+CircuitOpenError subclasses requests.exceptions.ConnectionError, so existing
+`except requests.exceptions.ConnectionError / RequestException` handlers
+treat a tripped breaker like an unreachable host.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+from app.core.metrics import LatencyRecorder
+
+logger = logging.getLogger(__name__)
+
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+_RETRY_STATUSES = frozenset({502, 503, 504})
+_MAX_BACKOFF_SECONDS = 10.0
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """The endpoint's circuit breaker is open; no request was sent."""
+
+
+class _CircuitBreaker:
+    def __init__(self, threshold: int, reset_seconds: float):
+        self.threshold = max(1, threshold)
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_seconds or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True  # half-open: exactly one probe
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """End a half-open probe that failed for a reason unrelated to the endpoint."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Returns True if this failure opened (or re-opened) the circuit."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+
+class _Endpoint:
+    def __init__(self, name: str, pool_maxsize: int):
+        self.name = name
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.breaker = _CircuitBreaker(
+            settings.HTTP_BREAKER_FAILURE_THRESHOLD,
+            settings.HTTP_BREAKER_RESET_SECONDS,
+        )
+        self.metrics = LatencyRecorder()
+
+
+class HTTPClient:
+    def __init__(self):
+        self._endpoints: dict[str, _Endpoint] = {}
+        self._lock = threading.Lock()
+
+    def endpoint(self, name: str, *, pool_maxsize: Optional[int] = None) -> _Endpoint:
+        ep = self._endpoints.get(name)
+        if ep is None:
+            with self._lock:
+                ep = self._endpoints.get(name)
+                if ep is None:
+                    ep = _Endpoint(name, pool_maxsize or settings.HTTP_POOL_MAXSIZE)
+                    self._endpoints[name] = ep
+        return ep
+
+    def request(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        *,
+        idempotent: Optional[bool] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """Send one request through `endpoint`'s pool, retry policy and breaker.
+
+        idempotent defaults to True for GET/HEAD/OPTIONS/PUT/DELETE. Pass it
+        explicitly for POSTs that are safe to replay. Raises CircuitOpenError
+        without touching the network while the breaker is open.
+        """
+        ep = self.endpoint(endpoint)
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in _IDEMPOTENT_METHODS
+        attempts = 1 + (max(0, settings.HTTP_RETRY_ATTEMPTS) if idempotent else 0)
+
+        for attempt in range(1, attempts + 1):
+            if not ep.breaker.allow():
+                ep.metrics.incr("short_circuited")
+                raise CircuitOpenError(f"Circuit open for {endpoint}; not calling {url}")
+
+            started = time.perf_counter()
+            ep.metrics.incr("requests")
+            try:
+                resp = ep.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as exc:
+                ep.metrics.observe(time.perf_counter() - started)
+                ep.metrics.incr("errors")
+                self._failed(ep, exc)
+                if attempt == attempts:
+                    raise
+                self._backoff(ep, attempt, exc)
+                continue
+            except Exception:
+                # Caller-side errors (bad URL, body generator error, …) say nothing
+                # about the endpoint's health: don't count them, but end the
+                # half-open probe or the endpoint would short-circuit forever
+                ep.metrics.observe(time.perf_counter() - started)
+                ep.breaker.release_trial()
+                raise
+
+            ep.metrics.observe(time.perf_counter() - started)
+            if resp.status_code >= 500:
+                ep.metrics.incr("errors")
+                self._failed(ep, f"HTTP {resp.status_code}")
+                if attempt < attempts and resp.status_code in _RETRY_STATUSES:
+                    resp.close()
+                    self._backoff(ep, attempt, f"HTTP {resp.status_code}")
+                    continue
+            else:
+                ep.breaker.record_success()
+            return resp
+
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def get(self, endpoint: str, url: str, **kwargs) -> requests.Response:
+        return self.request(endpoint, "GET", url, **kwargs)
+
+    def post(self, endpoint: str, url: str, **kwargs) -> requests.Response:
+        return self.request(endpoint, "POST", url, **kwargs)
+
+    @staticmethod
+    def _failed(ep: _Endpoint, reason) -> None:
+        if ep.breaker.record_failure():
+            ep.metrics.incr("circuit_opened")
+            logger.warning("[HTTPClient] Circuit open for %s after: %s", ep.name, reason)
+
+    @staticmethod
+    def _backoff(ep: _Endpoint, attempt: int, reason) -> None:
+        ep.metrics.incr("retries")
+        delay = random.uniform(0, min(settings.HTTP_RETRY_BASE_SECONDS * (2 ** (attempt - 1)), _MAX_BACKOFF_SECONDS))
+        logger.info("[HTTPClient] Retrying %s in %.2fs (attempt %d): %s", ep.name, delay, attempt + 1, reason)
+        time.sleep(delay)
+
+    def get_metrics(self) -> dict:
+        return {
+            name: {"circuit": ep.breaker.state, **ep.metrics.snapshot()}
+            for name, ep in sorted(self._endpoints.items())
+        }
+
+
+http_client = HTTPClient()
@@ -19,7 +19,6 @@ Two-phase design:
 
 from __future__ import annotations
 
-import json
 import logging
 import secrets
 from datetime import datetime, timedelta, timezone
@@ -35,7 +34,7 @@ from app.models.project import DeliveryState, Project
 from app.models.task import Task, TaskSubmission
 from app.models.workflow_image_callback import WorkflowImageCallback
 from app.services.notification_service import notification_service
-from app.services.storage_service import delete_deliverable, upload_deliverable
+from app.services.storage_service import ResumableUploadInterrupted, delete_deliverable, upload_deliverable
 
 logger = logging.getLogger(__name__)
 
@@ -58,9 +57,11 @@ class ImageCallbackService:
         task_id: Optional[UUID],
         submission_id: Optional[UUID],
         file_type: str,
+        source: str = "n8n",
     ) -> WorkflowImageCallback:
         """
-        Create a workflow_image_callbacks row before triggering n8n.
+        Create a workflow_image_callbacks row before triggering n8n (or the
+        local watermark engine, source="local").
 
         The returned record's callback_token must be embedded in the callback
         URL included in the n8n webhook payload, e.g.:
@@ -84,7 +85,7 @@ class ImageCallbackService:
             file_type=file_type,
             status="pending_image",
             expires_at=expires_at,
-            source="n8n",
+            source=source,
         )
         db.add(record)
         db.commit()
@@ -324,7 +325,7 @@ class ImageCallbackService:
 
         if submission is not None:
             if record.file_type == "watermarked_preview":
-                submission.watermarked_file_paths = json.dumps([public_url])
+                submission.watermarked_file_paths = [public_url]
                 submission.watermark_file_path = image_path  # exact raw path from n8n
                 logger.info(
                     "[ImageCallback] Staging watermark write  hint=%s  "
@@ -332,7 +333,7 @@ class ImageCallbackService:
                     hint, submission.id, image_path, submission.watermarked_file_paths,
                 )
             elif record.file_type == "final_version":
-                submission.file_paths = json.dumps([public_url])
+                submission.file_paths = [public_url]
                 logger.info(
                     "[ImageCallback] Staging final_version write  hint=%s  submission_id=%s",
                     hint, submission.id,
@@ -499,10 +500,20 @@ class ImageCallbackService:
                 task_id=task_id_str,
                 submission_id=submission_id_str,
                 file_type=record.file_type,
+                resume_key=str(record.id),
             )
             logger.info(
                 "[ImageCallback] Upload OK  hint=%s  path=%s", hint, storage_path
             )
+        except ResumableUploadInterrupted as exc:
+            # Token stays usable: the sender's retry resumes at the stored offset
+            record.error_message = f"Upload interrupted: {exc}"
+            db.commit()
+            logger.warning("[ImageCallback] Upload INTERRUPTED  hint=%s  error=%s", hint, exc)
+            raise HTTPException(
+                status_code=503,
+                detail="Storage upload interrupted; retry the callback to resume",
+            )
         except Exception as exc:
             record.status = "failed"
             record.error_message = f"Upload failed: {exc}"
@@ -518,14 +529,14 @@ class ImageCallbackService:
         try:
             if submission is not None:
                 if record.file_type == "watermarked_preview":
-                    submission.watermarked_file_paths = json.dumps([public_url])
+                    submission.watermarked_file_paths = [public_url]
                     submission.watermark_file_path = f"deliverables/{storage_path}"
                     logger.info(
                         "[ImageCallback] watermark_file_path set  hint=%s  path=deliverables/%s",
                         hint, storage_path,
                     )
                 elif record.file_type == "final_version":
-                    submission.file_paths = json.dumps([public_url])
+                    submission.file_paths = [public_url]
 
             db.commit()
             db.refresh(record)
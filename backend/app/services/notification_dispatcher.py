@@ -0,0 +1,206 @@
+"""
+services/notification_dispatcher.py
+───────────────────────────────────
+Background delivery of notification e-mails from the notification_outbox.
+
+NotificationService.create only inserts the notification and an outbox row
+in the caller's transaction; this dispatcher, started from the FastAPI
+lifespan, claims due outbox rows in batches (SKIP LOCKED), resolves the
+recipients' addresses in one query, sends through a small thread pool (one
+pooled SMTP session per worker chunk, see email_service) and
+reschedules failures with exponential backoff + jitter.
+
+A slow or unreachable SMTP server therefore never holds an API request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func
+
+from app.core.config import settings
+from app.core.metrics import LatencyRecorder
+from app.db.dialect import as_utc
+from app.db.queue import claim_batch
+from app.db.session import SessionLocal
+from app.models.notification import NotificationOutbox
+from app.models.user import User
+from app.services.email_service import email_service
+
+logger = logging.getLogger(__name__)
+
+_MAX_BACKOFF_SECONDS = 6 * 3600
+
+
+class NotificationDispatcher:
+    def __init__(self):
+        self.metrics = LatencyRecorder()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def notify(self) -> None:
+        """Wake the dispatcher early — called after new outbox rows commit."""
+        self._wake.set()
+
+    # ── Lifespan entry point ──────────────────────────────────────────────────
+
+    async def run(self) -> None:
+        self._stopping = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.NOTIFICATION_DISPATCH_WORKERS),
+            thread_name_prefix="notif-dispatch",
+        )
+        try:
+            while not self._stopping:
+                try:
+                    processed = await asyncio.to_thread(self.dispatch_due)
+                except Exception as e:
+                    logger.error("[NotificationDispatcher] Batch failed: %s", e)
+                    processed = 0
+                if processed < settings.NOTIFICATION_DISPATCH_BATCH_SIZE:
+                    await asyncio.to_thread(self._wake.wait, settings.NOTIFICATION_DISPATCH_POLL_SECONDS)
+                    self._wake.clear()
+        finally:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            email_service.close()
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._wake.set()
+
+    # ── One drain pass ────────────────────────────────────────────────────────
+
+    def dispatch_due(self) -> int:
+        """Deliver one batch of due outbox rows. Returns the number processed."""
+        db = SessionLocal()
+        try:
+            now = datetime.now(timezone.utc)
+            rows = claim_batch(
+                db,
+                NotificationOutbox,
+                filters=[
+                    NotificationOutbox.status == "pending",
+                    NotificationOutbox.next_attempt_at <= now,
+                ],
+                order_by=[NotificationOutbox.next_attempt_at],
+                limit=settings.NOTIFICATION_DISPATCH_BATCH_SIZE,
+            )
+            if not rows:
+                db.rollback()
+                return 0
+
+            user_ids = {r.user_id for r in rows if r.user_id and not r.to_email}
+            emails = dict(
+                db.query(User.id, User.email).filter(User.id.in_(user_ids)).all()
+            ) if user_ids else {}
+
+            deliverable = []
+            for row in rows:
+                address = row.to_email or emails.get(row.user_id)
+                if not address:
+                    row.status = "failed"
+                    row.last_error = "Recipient has no e-mail address"
+                    self.metrics.incr("failed")
+                    continue
+                deliverable.append((row, (address, row.subject, row.body or row.subject)))
+
+            # One chunk per worker: each chunk goes through a single pooled SMTP session
+            workers = max(1, settings.NOTIFICATION_DISPATCH_WORKERS)
+            chunks = [deliverable[i::workers] for i in range(workers) if deliverable[i::workers]]
+            futures = [(chunk, self._submit([mail for _, mail in chunk])) for chunk in chunks]
+
+            for chunk, future in futures:
+                try:
+                    results, error = future.result(), "SMTP send returned failure"
+                except Exception as e:
+                    results, error = [False] * len(chunk), str(e)
+                for (row, _), ok in zip(chunk, results):
+                    self._record_result(row, ok, None if ok else error)
+
+            db.commit()
+            return len(rows)
+        finally:
+            db.close()
+
+    def _submit(self, mails: list[tuple[str, str, str]]):
+        if self._executor is None:
+            # Called outside the lifespan loop (e.g. from a script): send inline
+            future: Future = Future()
+            try:
+                future.set_result(email_service.send_notification_emails(mails))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return self._executor.submit(email_service.send_notification_emails, mails)
+
+    def _record_result(self, row: NotificationOutbox, ok: bool, error: Optional[str]) -> None:
+        now = datetime.now(timezone.utc)
+        row.attempts = (row.attempts or 0) + 1
+        if ok:
+            row.status = "sent"
+            row.sent_at = now
+            row.last_error = None
+            self.metrics.incr("sent")
+            created = as_utc(row.created_at)
+            if created:
+                self.metrics.observe((now - created).total_seconds())
+            return
+
+        row.last_error = (error or "unknown error")[:1000]
+        if row.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+            row.status = "failed"
+            self.metrics.incr("failed")
+            logger.error(
+                "[NotificationDispatcher] Giving up  outbox_id=%s  attempts=%d  error=%s",
+                row.id, row.attempts, row.last_error,
+            )
+            return
+
+        backoff = min(
+            settings.NOTIFICATION_RETRY_BASE_SECONDS * (2 ** (row.attempts - 1)),
+            _MAX_BACKOFF_SECONDS,
+        )
+        row.next_attempt_at = now + timedelta(seconds=backoff * random.uniform(0.8, 1.2))
+        self.metrics.incr("retried")
+        logger.warning(
+            "[NotificationDispatcher] Send failed, retrying in ~%.0fs  outbox_id=%s  attempt=%d  error=%s",
+            backoff, row.id, row.attempts, row.last_error,
+        )
+
+    # ── Metrics ───────────────────────────────────────────────────────────────
+
+    def get_metrics(self) -> dict:
+        db = SessionLocal()
+        try:
+            depth = dict(
+                db.query(NotificationOutbox.status, func.count(NotificationOutbox.id))
+                .group_by(NotificationOutbox.status).all()
+            )
+            oldest = (
+                db.query(func.min(NotificationOutbox.created_at))
+                .filter(NotificationOutbox.status == "pending")
+                .scalar()
+            )
+        finally:
+            db.close()
+        oldest = as_utc(oldest)
+        return {
+            "queue_depth": int(depth.get("pending", 0)),
+            "failed_total": int(depth.get("failed", 0)),
+            "oldest_pending_age_s": (
+                round((datetime.now(timezone.utc) - oldest).total_seconds(), 1) if oldest else 0.0
+            ),
+            "delivery": self.metrics.snapshot(),
+        }
+
+
+notification_dispatcher = NotificationDispatcher()
@@ -1,12 +1,18 @@
+import uuid
+from collections import defaultdict
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 from uuid import UUID
 from typing import Optional
-from app.models.notification import Notification, NotificationType, NotificationStatus
+from app.db.session import after_commit, commit_unless_in_unit_of_work
+from app.models.notification import Notification, NotificationType, NotificationStatus, NotificationOutbox
 
 
-from app.models.user import User
-from app.services.email_service import email_service
+def _wake_dispatcher() -> None:
+    from app.services.notification_dispatcher import notification_dispatcher
+    notification_dispatcher.notify()
+
 
 class NotificationService:
     @staticmethod
@@ -21,6 +27,7 @@ class NotificationService:
         brief_id: Optional[UUID] = None,
     ) -> Notification:
         notif = Notification(
+            id=uuid.uuid4(),
             user_id=user_id,
             type=notification_type,
             title=title,
@@ -30,22 +37,90 @@ class NotificationService:
             brief_id=brief_id,
         )
         db.add(notif)
-        db.commit()
-        db.refresh(notif)
-        
-        try:
-            user = db.query(User).filter(User.id == user_id).first()
-            if user and user.email:
-                email_service.send_notification_email(
-                    to_email=user.email,
-                    subject=title,
-                    body=body or title
-                )
-        except Exception as e:
-            print(f"Failed to send email notification: {e}")
-            
+        # E-mail is delivered by notification_dispatcher, never inline
+        db.add(NotificationOutbox(
+            notification_id=notif.id,
+            user_id=user_id,
+            subject=title,
+            body=body or title,
+        ))
+        if commit_unless_in_unit_of_work(db):
+            db.refresh(notif)
+        after_commit(db, _wake_dispatcher)
         return notif
 
+    @staticmethod
+    def create_many(
+        db: Session,
+        notifications: list[dict],
+        digest: bool = False,
+        digest_subject: str = "You have new updates on AgencyFlow",
+    ) -> int:
+        """Bulk variant of create() for multi-task / multi-recipient events.
+
+        Each item takes the same keyword arguments as create().  All notification
+        rows are inserted in one statement and all outbox rows in another;
+        recipient addresses are resolved in one query by the dispatcher.
+        With digest=True, several notifications for the same recipient are
+        coalesced into a single e-mail (each still gets its in-app row).
+        Returns the number of notifications created.
+        """
+        if not notifications:
+            return 0
+
+        rows = []
+        for item in notifications:
+            rows.append({
+                "id": uuid.uuid4(),
+                "user_id": item["user_id"],
+                "type": item.get("notification_type", NotificationType.general),
+                "status": NotificationStatus.unread,
+                "title": item["title"],
+                "body": item.get("body"),
+                "project_id": item.get("project_id"),
+                "task_id": item.get("task_id"),
+                "brief_id": item.get("brief_id"),
+            })
+
+        by_user: dict = defaultdict(list)
+        for row in rows:
+            by_user[row["user_id"]].append(row)
+
+        outbox = []
+        for user_id, user_rows in by_user.items():
+            if digest and len(user_rows) > 1:
+                outbox.append({
+                    "id": uuid.uuid4(),
+                    "notification_id": None,
+                    "user_id": user_id,
+                    "subject": digest_subject,
+                    "body": "\n\n".join(
+                        f"• {r['title']}" + (f"\n  {r['body']}" if r["body"] else "")
+                        for r in user_rows
+                    ),
+                })
+            else:
+                outbox.extend({
+                    "id": uuid.uuid4(),
+                    "notification_id": r["id"],
+                    "user_id": user_id,
+                    "subject": r["title"],
+                    "body": r["body"] or r["title"],
+                } for r in user_rows)
+
+        db.execute(insert(Notification), rows)
+        db.execute(insert(NotificationOutbox), outbox)
+        commit_unless_in_unit_of_work(db)
+        after_commit(db, _wake_dispatcher)
+        return len(rows)
+
+    @staticmethod
+    def enqueue_email(db: Session, to_email: str, subject: str, body: str) -> None:
+        """Queue a plain e-mail that has no in-app notification row."""
+        db.add(NotificationOutbox(to_email=to_email, subject=subject, body=body))
+        commit_unless_in_unit_of_work(db)
+        after_commit(db, _wake_dispatcher)
+
     @staticmethod
     def get_for_user(db: Session, user_id: UUID, limit: int = 50):
         return (
@@ -0,0 +1,177 @@
+"""
+services/review_image_service.py
+────────────────────────────────
+Review-sized renditions of submitted images for the AI review webhook.
+
+Employees upload full-resolution assets. With SUBMISSION_REVIEW_RENDITIONS on,
+each fetched image is downscaled to REVIEW_IMAGE_MAX_EDGE pixels on its
+longest side and re-encoded as REVIEW_IMAGE_FORMAT/REVIEW_IMAGE_QUALITY before
+it is attached to the n8n/Gemini webhook. This means smaller uploads, less
+n8n memory and fewer model tokens. The originals in storage are never
+touched, so delivery and watermarking still use full resolution.
+
+  • Decoding and resizing are CPU-bound and run in a process pool, so they
+    never hold the GIL of the API worker.
+  • Renditions are cached by content hash and rendition settings, so a
+    resubmitted or retried image is only resized once per process.
+  • If an image cannot be decoded, the rendition would not be smaller, or
+    the pool fails or times out, the original bytes are sent unchanged.
+
+Pillow is optional. Without it the stage stays off and originals are sent.
+The streaming webhook path (SUBMISSION_WEBHOOK_STREAMING) never buffers
+images, so it always sends originals.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import NamedTuple, Optional, Sequence
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional dependency
+    Image = ImageOps = None
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import LatencyRecorder
+from app.core.process_pool import SpawnPool
+
+logger = logging.getLogger(__name__)
+
+_FORMATS = {
+    "JPEG": ("image/jpeg", ".jpg"),
+    "WEBP": ("image/webp", ".webp"),
+    "PNG": ("image/png", ".png"),
+}
+# Cached "the original is already the better upload" verdict
+_KEEP_ORIGINAL = False
+
+
+class Rendition(NamedTuple):
+    content: bytes
+    mime_type: str
+    extension: str
+
+
+def _render(content: bytes, max_edge: int, fmt: str, quality: int) -> bytes:
+    """Runs in a pool process: decode, orient, downscale and re-encode one image."""
+    with Image.open(io.BytesIO(content)) as source:
+        image = ImageOps.exif_transpose(source)
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        if fmt == "JPEG" and image.mode not in ("RGB", "L"):
+            # JPEG has no alpha channel: flatten onto white, not black
+            image = image.convert("RGBA")
+            flattened = Image.new("RGB", image.size, "white")
+            flattened.paste(image, mask=image.getchannel("A"))
+            image = flattened
+        out = io.BytesIO()
+        image.save(out, format=fmt, quality=quality, optimize=True)
+        return out.getvalue()
+
+
+class ReviewImageService:
+    def __init__(self):
+        self.metrics = LatencyRecorder()
+        self._cache = TTLCache(
+            maxsize=settings.REVIEW_IMAGE_CACHE_SIZE,
+            ttl=settings.REVIEW_IMAGE_CACHE_TTL_SECONDS,
+        )
+        self._pool = SpawnPool(lambda: settings.REVIEW_IMAGE_WORKERS)
+
+    @staticmethod
+    def enabled() -> bool:
+        return settings.SUBMISSION_REVIEW_RENDITIONS and Image is not None
+
+    @staticmethod
+    def signature() -> str:
+        """Rendition settings in effect, or "" when originals are sent."""
+        if not ReviewImageService.enabled():
+            return ""
+        return f"{settings.REVIEW_IMAGE_MAX_EDGE}/{settings.REVIEW_IMAGE_FORMAT.upper()}/{settings.REVIEW_IMAGE_QUALITY}"
+
+    def render_many(self, contents: Sequence[Optional[bytes]]) -> list[Optional[Rendition]]:
+        """A rendition per image, or None where the original should be sent as is."""
+        fmt = settings.REVIEW_IMAGE_FORMAT.upper()
+        if fmt not in _FORMATS:
+            logger.warning("[ReviewImages] Unsupported REVIEW_IMAGE_FORMAT %r; sending originals", fmt)
+            return [None] * len(contents)
+        mime_type, extension = _FORMATS[fmt]
+        params = (settings.REVIEW_IMAGE_MAX_EDGE, fmt, settings.REVIEW_IMAGE_QUALITY)
+
+        results: list[Optional[Rendition]] = [None] * len(contents)
+        pending = {}
+        for i, content in enumerate(contents):
+            if content is None:
+                continue
+            key = (hashlib.sha256(content).hexdigest(), *params)
+            cached = self._cache.get(key)
+            if cached is not None:
+                self.metrics.incr("cache_hits")
+                results[i] = cached or None
+                continue
+            try:
+                pending[i] = (key, self._pool.submit(_render, content, *params))
+            except Exception as e:
+                logger.warning("[ReviewImages] Could not queue image for resizing: %s", e)
+                self.metrics.incr("errors")
+                self._pool.reset()
+
+        started = time.perf_counter()
+        deadline = started + settings.REVIEW_IMAGE_TIMEOUT_SECONDS
+        for i, (key, future) in pending.items():
+            try:
+                data = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+            except FutureTimeoutError:
+                logger.warning("[ReviewImages] Resizing timed out; sending the original")
+                self.metrics.incr("timeouts")
+                future.cancel()
+                continue
+            except BrokenProcessPool as e:
+                logger.warning("[ReviewImages] Resize worker died; sending the original: %s", e)
+                self.metrics.incr("errors")
+                self._pool.reset()
+                continue
+            except Exception as e:
+                # Typically an undecodable or unsupported image; don't try it again
+                logger.warning("[ReviewImages] Could not resize image; sending the original: %s", e)
+                self.metrics.incr("errors")
+                self._cache.set(key, _KEEP_ORIGINAL)
+                continue
+            if len(data) < len(contents[i]):
+                results[i] = Rendition(data, mime_type, extension)
+                self.metrics.incr("rendered")
+            else:
+                self.metrics.incr("kept_original")
+            self._cache.set(key, results[i] or _KEEP_ORIGINAL)
+        if pending:
+            self.metrics.observe(time.perf_counter() - started)
+
+        for content, rendition in zip(contents, results):
+            if content is not None:
+                self.metrics.incr("bytes_original", len(content))
+                self.metrics.incr("bytes_sent", len(rendition.content if rendition else content))
+        return results
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def get_metrics(self) -> dict:
+        snapshot = self.metrics.snapshot()
+        original = snapshot.get("bytes_original", 0)
+        sent = snapshot.get("bytes_sent", 0)
+        return {
+            "enabled": self.enabled(),
+            "pillow_available": Image is not None,
+            "rendition": self.signature() or None,
+            "bytes_saved_pct": round(100 * (original - sent) / original, 1) if original else 0.0,
+            **snapshot,
+        }
+
+
+review_image_service = ReviewImageService()
@@ -0,0 +1,292 @@
+"""
+services/review_job_service.py
+──────────────────────────────
+Asynchronous AI review of submissions (SUBMISSION_REVIEW_ASYNC=true).
+
+create_submission queues a review_jobs row in the same transaction as the
+submission and returns immediately with submission_status=pending. The worker
+started from the FastAPI lifespan claims due jobs (FOR UPDATE SKIP LOCKED,
+see db/queue.py), marks them running under a lease, and runs
+SubmissionService.run_review — the same webhook dispatch + verdict
+application the synchronous path uses — on a small thread pool.
+
+A job that raises — including ReviewNotObtained, when the webhook was down,
+answered 5xx or returned nothing parseable — is retried with exponential
+backoff + jitter up to REVIEW_JOB_MAX_ATTEMPTS. While a job runs, its lease
+is renewed every third of REVIEW_JOB_LEASE_SECONDS, so a slow review is not
+claimed a second time; a job whose worker died mid-run is picked up again
+once its lease expires.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from contextlib import contextmanager
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import LatencyRecorder
+from app.db.dialect import as_utc
+from app.db.queue import claim_batch
+from app.db.session import SessionLocal, after_commit
+from app.models.review_job import ReviewJob
+
+logger = logging.getLogger(__name__)
+
+_MAX_BACKOFF_SECONDS = 3600
+
+
+class ReviewJobService:
+    def __init__(self):
+        self.wait_metrics = LatencyRecorder()   # queued → first started
+        self.run_metrics = LatencyRecorder()    # one attempt, webhook + apply
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    @staticmethod
+    def enabled() -> bool:
+        webhook_url = settings.SUBMISSION_REVIEW_WEBHOOK_URL or settings.N8N_WORK_SUBMISSION_WEBHOOK
+        return bool(settings.SUBMISSION_REVIEW_ASYNC and webhook_url)
+
+    # ── Producer side ─────────────────────────────────────────────────────────
+
+    def enqueue(self, db: Session, submission_id: UUID) -> ReviewJob:
+        """Queue a review in the caller's transaction; the worker wakes once it commits."""
+        job = ReviewJob(id=uuid.uuid4(), submission_id=submission_id, status="queued")
+        db.add(job)
+        after_commit(db, self.notify)
+        return job
+
+    def get_latest_for_submission(self, db: Session, submission_id: UUID) -> Optional[ReviewJob]:
+        return (
+            db.query(ReviewJob)
+            .filter(ReviewJob.submission_id == submission_id)
+            .order_by(ReviewJob.created_at.desc())
+            .first()
+        )
+
+    def notify(self) -> None:
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    # ── Lifespan entry point ──────────────────────────────────────────────────
+
+    async def run(self) -> None:
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        workers = max(1, settings.REVIEW_JOB_WORKERS)
+        in_flight: set = set()
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="review-job") as executor:
+            while not self._stopping:
+                free = workers - len(in_flight)
+                if free > 0:
+                    try:
+                        claimed = await asyncio.to_thread(self.claim_due, free)
+                    except Exception as e:
+                        logger.error("[ReviewJobs] Claim failed: %s", e)
+                        claimed = []
+                    for job_id in claimed:
+                        in_flight.add(self._loop.run_in_executor(executor, self.process, job_id))
+
+                waiter = asyncio.ensure_future(self._wake.wait())
+                await asyncio.wait(
+                    {*in_flight, waiter},
+                    timeout=settings.REVIEW_JOB_POLL_SECONDS,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                waiter.cancel()
+                self._wake.clear()
+                in_flight = {f for f in in_flight if not f.done()}
+
+            # Let running reviews finish so their verdicts are committed
+            if in_flight:
+                await asyncio.wait(in_flight)
+        self._loop = None
+        self._wake = None
+
+    def stop(self) -> None:
+        self._stopping = True
+        self.notify()
+
+    # ── Worker side ───────────────────────────────────────────────────────────
+
+    def claim_due(self, limit: int) -> list[UUID]:
+        """Mark up to `limit` due jobs as running under a lease. Returns their ids."""
+        db = SessionLocal()
+        try:
+            now = datetime.now(timezone.utc)
+            jobs = claim_batch(
+                db,
+                ReviewJob,
+                filters=[or_(
+                    and_(ReviewJob.status == "queued", ReviewJob.run_after <= now),
+                    and_(ReviewJob.status == "running", ReviewJob.lease_expires_at < now),
+                )],
+                order_by=[ReviewJob.run_after],
+                limit=limit,
+            )
+            for job in jobs:
+                job.status = "running"
+                job.attempts = (job.attempts or 0) + 1
+                job.lease_expires_at = now + timedelta(seconds=settings.REVIEW_JOB_LEASE_SECONDS)
+                if job.started_at is None:
+                    job.started_at = now
+                    created = as_utc(job.created_at)
+                    if created:
+                        self.wait_metrics.observe((now - created).total_seconds())
+            ids = [job.id for job in jobs]
+            db.commit()
+            return ids
+        finally:
+            db.close()
+
+    def process(self, job_id: UUID) -> None:
+        from app.models.project import Project
+        from app.models.task import Task, TaskSubmission
+        from app.models.user import User
+        from app.services.submission_service import submission_service
+
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            job = db.get(ReviewJob, job_id)
+            submission = db.get(TaskSubmission, job.submission_id) if job else None
+            if submission is None:
+                self._finish(db, job_id, "failed", "Submission no longer exists")
+                return
+
+            task = db.get(Task, submission.task_id)
+            project = db.get(Project, task.project_id) if task else None
+            employee = db.get(User, submission.submitted_by)
+
+            with self._lease_renewed(job_id):
+                submission_service.run_review(
+                    db,
+                    submission,
+                    task,
+                    employee_name=employee.full_name if employee else str(submission.submitted_by),
+                    project_name=project.name if project else "Unknown Project",
+                    task_title=task.title if task else "Unknown Task",
+                    brief_snapshot=submission.brief_snapshot,
+                    file_urls=submission.image_urls,
+                    job_attempt=job.attempts,
+                )
+            self._finish(db, job_id, "completed", None)
+            self.run_metrics.observe(time.perf_counter() - started)
+        except Exception as e:
+            db.rollback()
+            logger.error("[ReviewJobs] Job %s failed: %s", job_id, e)
+            self._record_failure(db, job_id, str(e))
+        finally:
+            db.close()
+
+    @contextmanager
+    def _lease_renewed(self, job_id: UUID):
+        """Keep extending the job's lease from a side thread until the block exits."""
+        stop = threading.Event()
+        interval = max(1.0, settings.REVIEW_JOB_LEASE_SECONDS / 3)
+
+        def renew() -> None:
+            while not stop.wait(interval):
+                self._renew_lease(job_id)
+
+        renewer = threading.Thread(target=renew, name=f"review-lease-{job_id}", daemon=True)
+        renewer.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            renewer.join()
+
+    def _renew_lease(self, job_id: UUID) -> None:
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(ReviewJob)
+                .where(ReviewJob.id == job_id, ReviewJob.status == "running")
+                .values(lease_expires_at=datetime.now(timezone.utc)
+                        + timedelta(seconds=settings.REVIEW_JOB_LEASE_SECONDS))
+            )
+            db.commit()
+            self.run_metrics.incr("lease_renewals")
+        except Exception as e:
+            db.rollback()
+            logger.warning("[ReviewJobs] Could not renew lease of job %s: %s", job_id, e)
+        finally:
+            db.close()
+
+    def _finish(self, db: Session, job_id: UUID, status: str, error: Optional[str]) -> None:
+        job = db.get(ReviewJob, job_id)
+        if job is None:
+            return
+        job.status = status
+        job.last_error = error
+        job.lease_expires_at = None
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        self.run_metrics.incr(status)
+
+    def _record_failure(self, db: Session, job_id: UUID, error: str) -> None:
+        job = db.get(ReviewJob, job_id)
+        if job is None:
+            return
+        if job.attempts >= settings.REVIEW_JOB_MAX_ATTEMPTS:
+            self._finish(db, job_id, "failed", error[:1000])
+            return
+        backoff = min(
+            settings.REVIEW_JOB_RETRY_BASE_SECONDS * (2 ** (job.attempts - 1)),
+            _MAX_BACKOFF_SECONDS,
+        )
+        job.status = "queued"
+        job.last_error = error[:1000]
+        job.lease_expires_at = None
+        job.run_after = datetime.now(timezone.utc) + timedelta(seconds=backoff * random.uniform(0.8, 1.2))
+        db.commit()
+        self.run_metrics.incr("retried")
+
+    # ── Metrics ───────────────────────────────────────────────────────────────
+
+    def get_metrics(self) -> dict:
+        db = SessionLocal()
+        try:
+            depth = dict(
+                db.query(ReviewJob.status, func.count(ReviewJob.id))
+                .group_by(ReviewJob.status).all()
+            )
+            oldest = (
+                db.query(func.min(ReviewJob.created_at))
+                .filter(ReviewJob.status == "queued")
+                .scalar()
+            )
+        finally:
+            db.close()
+        oldest = as_utc(oldest)
+        return {
+            "enabled": self.enabled(),
+            "queued": int(depth.get("queued", 0)),
+            "running": int(depth.get("running", 0)),
+            "completed_total": int(depth.get("completed", 0)),
+            "failed_total": int(depth.get("failed", 0)),
+            "oldest_queued_age_s": (
+                round((datetime.now(timezone.utc) - oldest).total_seconds(), 1) if oldest else 0.0
+            ),
+            "queue_wait": self.wait_metrics.snapshot(),
+            "processing": self.run_metrics.snapshot(),
+        }
+
+
+review_job_service = ReviewJobService()
@@ -0,0 +1,305 @@
+"""
+services/storage_reconciler.py
+──────────────────────────────
+Periodic clean-up of image-callback state and the deliverables bucket.
+
+One pass (reconcile()) does the following:
+
+  1. Expires every pending_image callback whose token TTL has passed, in one
+     set-based UPDATE. Previously a token was only marked expired when n8n
+     happened to call back late. Forgets resumable uploads (storage_uploads)
+     not touched for STORAGE_RECONCILE_UPLOAD_TTL_SECONDS; Supabase has
+     discarded them by then, and their paths would otherwise stay
+     "referenced" for good.
+  2. Lists the deliverables bucket and diffs it against everything that
+     refers to a deliverable:
+       • completed workflow_image_callbacks.storage_path
+       • task_submissions.watermark_file_path, file_paths and
+         watermarked_file_paths
+       • resumable uploads still in progress (storage_uploads)
+       • content-addressed objects referenced within the grace period
+     Objects that nothing refers to and that are older than
+     STORAGE_RECONCILE_MIN_AGE_SECONDS are orphans, e.g. the leftovers of a
+     failed rollback in process_image_callback. They are deleted in batches
+     of STORAGE_RECONCILE_DELETE_BATCH. Content-addressed orphans are first
+     claimed with a conditional DELETE … RETURNING on stored_objects, and
+     only the claimed ones are removed: a dedup hit that landed after the
+     listing keeps its object. The claimed rows stay locked until the batch
+     is removed, so an upload of the same bytes waits and then stores them
+     again. Orphaned callback rows whose object is gone become
+     orphan_removed.
+  3. Deletes failed/expired/orphan_removed callback rows older than
+     STORAGE_RECONCILE_RETENTION_DAYS.
+  4. Deletes expired AI review cache entries (ai_review_cache_service), in
+     batches, so verdict transactions never have to.
+
+With dry_run=True nothing is changed, and the same counts and bytes are
+reported (GET /management/storage-reconcile). The scheduled pass runs every
+STORAGE_RECONCILE_INTERVAL_SECONDS from the app lifespan.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, func, select, update
+
+from app.core.config import settings
+from app.db.dialect import as_utc
+from app.db.session import SessionLocal
+from app.models.storage_upload import StorageUpload
+from app.models.stored_object import StoredObject
+from app.models.task import TaskSubmission
+from app.models.workflow_image_callback import WorkflowImageCallback
+from app.services.ai_review_cache_service import ai_review_cache_service
+from app.services.storage_service import CONTENT_PREFIX, DELIVERABLES_BUCKET, storage_client
+
+logger = logging.getLogger(__name__)
+
+_TERMINAL_STATUSES = ("failed", "expired", "orphan_removed")
+_SAMPLE_SIZE = 20
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return as_utc(parsed)
+
+
+def _deliverable_path(reference: Optional[str]) -> Optional[str]:
+    """Object path inside the deliverables bucket for a stored reference, if it is one."""
+    if not reference:
+        return None
+    marker = f"/object/public/{DELIVERABLES_BUCKET}/"
+    if marker in reference:
+        return reference.split(marker, 1)[1].split("?", 1)[0]
+    if reference.startswith(f"{DELIVERABLES_BUCKET}/"):
+        return reference[len(DELIVERABLES_BUCKET) + 1:]
+    return None
+
+
+def _is_content_path(path: str) -> bool:
+    return path.startswith(f"{CONTENT_PREFIX}/")
+
+
+class StorageReconciler:
+    def __init__(self):
+        self.last_report: Optional[dict] = None
+        self._stopping = False
+        self._wake: Optional[asyncio.Event] = None
+
+    # ── Lifespan entry point ──────────────────────────────────────────────────
+
+    async def run(self) -> None:
+        interval = settings.STORAGE_RECONCILE_INTERVAL_SECONDS
+        if interval <= 0:
+            return
+        self._stopping = False
+        self._wake = asyncio.Event()
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._stopping:
+                break
+            try:
+                await asyncio.to_thread(self.reconcile, dry_run=False)
+            except Exception as e:
+                logger.error("[StorageReconciler] Pass failed: %s", e)
+        self._wake = None
+
+    def stop(self) -> None:
+        self._stopping = True
+        if self._wake is not None:
+            self._wake.set()
+
+    # ── One pass ──────────────────────────────────────────────────────────────
+
+    def reconcile(self, *, dry_run: bool = True) -> dict:
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(seconds=settings.STORAGE_RECONCILE_MIN_AGE_SECONDS)
+        db = SessionLocal()
+        try:
+            report = {"dry_run": dry_run, "started_at": now.isoformat()}
+            report["expired_callbacks"] = self._expire_stale(db, now, dry_run)
+            report["pruned_uploads"] = self._prune_uploads(db, now, dry_run)
+            report.update(self._reconcile_objects(db, cutoff, dry_run))
+            report["purged_callbacks"] = self._purge_terminal(db, now, dry_run)
+            report["purged_review_cache"] = ai_review_cache_service.purge_expired(dry_run=dry_run)
+        finally:
+            db.close()
+        report["duration_s"] = round((datetime.now(timezone.utc) - now).total_seconds(), 2)
+        if not dry_run:
+            self.last_report = report
+        logger.info(
+            "[StorageReconciler] %s: expired=%d uploads=%d orphans=%d (%d bytes) deleted=%d purged=%d "
+            "review_cache=%d",
+            "Dry run" if dry_run else "Pass", report["expired_callbacks"], report["pruned_uploads"],
+            report["orphaned_objects"],
+            report["orphaned_bytes"], report["deleted_objects"], report["purged_callbacks"],
+            report["purged_review_cache"],
+        )
+        return report
+
+    @staticmethod
+    def _expire_stale(db, now: datetime, dry_run: bool) -> int:
+        stale = (
+            (WorkflowImageCallback.status == "pending_image")
+            & (WorkflowImageCallback.expires_at < now)
+        )
+        if dry_run:
+            return db.scalar(select(func.count()).select_from(WorkflowImageCallback).where(stale)) or 0
+        expired = db.execute(
+            update(WorkflowImageCallback)
+            .where(stale)
+            .values(status="expired", error_message="Token expired before the image arrived")
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return expired
+
+    @staticmethod
+    def _prune_uploads(db, now: datetime, dry_run: bool) -> int:
+        idle = StorageUpload.updated_at < now - timedelta(seconds=settings.STORAGE_RECONCILE_UPLOAD_TTL_SECONDS)
+        if dry_run:
+            return db.scalar(select(func.count()).select_from(StorageUpload).where(idle)) or 0
+        pruned = db.execute(
+            delete(StorageUpload).where(idle).execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return pruned
+
+    @staticmethod
+    def _referenced_paths(db, cutoff: datetime) -> set[str]:
+        referenced: set[str] = set()
+        referenced.update(db.scalars(
+            select(WorkflowImageCallback.storage_path).where(
+                WorkflowImageCallback.status == "completed",
+                WorkflowImageCallback.storage_bucket == DELIVERABLES_BUCKET,
+                WorkflowImageCallback.storage_path.is_not(None),
+            )
+        ))
+        rows = db.execute(
+            select(
+                TaskSubmission.watermark_file_path,
+                TaskSubmission.file_paths,
+                TaskSubmission.watermarked_file_paths,
+            ).execution_options(yield_per=1000)
+        )
+        for watermark_path, file_paths, watermarked_paths in rows:
+            for reference in [watermark_path, *(file_paths or []), *(watermarked_paths or [])]:
+                path = _deliverable_path(reference if isinstance(reference, str) else None)
+                if path:
+                    referenced.add(path)
+        referenced.update(db.scalars(
+            select(StorageUpload.object_path).where(StorageUpload.bucket == DELIVERABLES_BUCKET)
+        ))
+        # A dedup hit may be about to commit its reference; give it the same grace as new uploads
+        referenced.update(db.scalars(
+            select(StoredObject.object_path).where(
+                StoredObject.bucket == DELIVERABLES_BUCKET,
+                StoredObject.last_referenced_at >= cutoff,
+            )
+        ))
+        return referenced
+
+    def _reconcile_objects(self, db, cutoff: datetime, dry_run: bool) -> dict:
+        referenced = self._referenced_paths(db, cutoff)
+        listed = 0
+        listed_bytes = 0
+        present: set[str] = set()
+        orphans: list[tuple[str, int]] = []
+        for path, size, updated_at in storage_client.list_objects(DELIVERABLES_BUCKET):
+            listed += 1
+            listed_bytes += size
+            present.add(path)
+            if path in referenced:
+                continue
+            modified = _parse_timestamp(updated_at)
+            if modified is None or modified >= cutoff:
+                continue  # may belong to an upload whose DB write has not landed yet
+            orphans.append((path, size))
+
+        deleted: list[str] = []
+        if not dry_run:
+            batch_size = max(1, settings.STORAGE_RECONCILE_DELETE_BATCH)
+            for i in range(0, len(orphans), batch_size):
+                batch = [path for path, _ in orphans[i:i + batch_size]]
+                claimed = set(db.scalars(
+                    delete(StoredObject)
+                    .where(
+                        StoredObject.bucket == DELIVERABLES_BUCKET,
+                        StoredObject.object_path.in_(batch),
+                        StoredObject.last_referenced_at < cutoff,
+                    )
+                    .returning(StoredObject.object_path)
+                ))
+                # Content paths nobody indexes may be an upload about to index them
+                batch = [path for path in batch if path in claimed or not _is_content_path(path)]
+                if not batch:
+                    db.rollback()
+                    continue
+                try:
+                    storage_client.remove(DELIVERABLES_BUCKET, batch)
+                except Exception as e:
+                    db.rollback()
+                    logger.error("[StorageReconciler] Batch delete failed (%d objects): %s", len(batch), e)
+                    continue
+                db.commit()
+                deleted.extend(batch)
+            present.difference_update(deleted)
+
+        orphaned_rows = db.execute(
+            select(WorkflowImageCallback.id, WorkflowImageCallback.storage_path).where(
+                WorkflowImageCallback.status == "orphaned",
+                WorkflowImageCallback.storage_bucket == DELIVERABLES_BUCKET,
+            )
+        ).all()
+        resolved = [row_id for row_id, path in orphaned_rows if path not in present]
+        if resolved and not dry_run:
+            db.execute(
+                update(WorkflowImageCallback)
+                .where(WorkflowImageCallback.id.in_(resolved))
+                .values(status="orphan_removed")
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+
+        return {
+            "listed_objects": listed,
+            "listed_bytes": listed_bytes,
+            "referenced_paths": len(referenced),
+            "orphaned_objects": len(orphans),
+            "orphaned_bytes": sum(size for _, size in orphans),
+            "orphan_sample": [path for path, _ in orphans[:_SAMPLE_SIZE]],
+            "deleted_objects": len(deleted),
+            "orphaned_callbacks_resolved": len(resolved),
+        }
+
+    @staticmethod
+    def _purge_terminal(db, now: datetime, dry_run: bool) -> int:
+        days = settings.STORAGE_RECONCILE_RETENTION_DAYS
+        if days <= 0:
+            return 0
+        old = (
+            WorkflowImageCallback.status.in_(_TERMINAL_STATUSES)
+            & (WorkflowImageCallback.created_at < now - timedelta(days=days))
+        )
+        if dry_run:
+            return db.scalar(select(func.count()).select_from(WorkflowImageCallback).where(old)) or 0
+        purged = db.execute(
+            delete(WorkflowImageCallback).where(old).execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return purged
+
+
+storage_reconciler = StorageReconciler()
@@ -6,25 +6,551 @@ Thin wrapper around Supabase Storage for server-side file uploads.
 Uses the service_role key (bypasses RLS) so the backend can upload on behalf
 of any user without requiring a user JWT.  Falls back to anon key if
 SUPABASE_SERVICE_KEY is not configured (dev convenience only).
+
+All operations go through one long-lived StorageClient that talks to the
+Storage REST API on the shared http_client pool ("supabase-storage"
+endpoint). Connections are kept alive across files and requests, the client
+holds no per-call state, and it is safe to share between threads.
+
+Deliverables of STORAGE_RESUMABLE_THRESHOLD_BYTES or more are uploaded with
+the TUS resumable protocol in STORAGE_TUS_CHUNK_BYTES chunks. The upload URL
+and the acknowledged offset are kept in storage_uploads, so a dropped
+connection resumes at the server's offset, both within the call and on a
+later retry with the same resume_key.
+
+Deliverables and watermark previews are content-addressed: the source is
+hashed (SHA-256, in one chunked pass over the local file) before upload and
+stored at sha256/<aa>/<hash><ext>. stored_objects maps (bucket, hash) to
+the object and counts references, so uploading bytes that are already
+stored only bumps the count and sends nothing. delete_deliverable releases
+one reference and removes the object only when the last one goes; watermark
+previews are never released.
 """
 
 from __future__ import annotations
 
 import base64
+import hashlib
+import logging
 import mimetypes
-import uuid
-from typing import Optional
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from urllib.parse import urljoin
 
-from supabase import create_client, Client
+import requests
 
-from app.core.config import settings
+from sqlalchemy import delete, insert, update
 
-TASK_SUBMISSIONS_BUCKET = "task-submissions"
+from app.core.config import settings
+from app.core.metrics import LatencyRecorder
+from app.db.dialect import upsert
+from app.db.session import SessionLocal
+from app.models.storage_upload import StorageUpload
+from app.models.stored_object import StoredObject
+from app.services.http_client import http_client
 
+logger = logging.getLogger(__name__)
 
-def _get_client() -> Client:
-    key = settings.SUPABASE_SERVICE_KEY or settings.SUPABASE_ANON_KEY
-    return create_client(settings.SUPABASE_URL, key)
+TASK_SUBMISSIONS_BUCKET = "task-submissions"
+CONTENT_PREFIX = "sha256"  # content-addressed objects live under sha256/<aa>/
+
+_STORAGE_ENDPOINT = "supabase-storage"
+_TUS_VERSION = "1.0.0"
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+class ResumableUploadInterrupted(RuntimeError):
+    """A resumable upload lost its connection; retrying with the same resume_key continues it."""
+
+
+def _source_size(source) -> Optional[int]:
+    """Byte length of bytes or a seekable file-like object, else None."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return len(source)
+    try:
+        position = source.tell()
+        size = source.seek(0, 2)
+        source.seek(position)
+        return size - position
+    except (AttributeError, OSError):
+        return None
+
+
+def _read_chunk(source, start: int, offset: int, size: int) -> bytes:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source[offset:offset + size])
+    source.seek(start + offset)
+    return source.read(size)
+
+
+def _content_hash(source) -> Optional[str]:
+    """SHA-256 of bytes or a seekable file-like object (position restored), else None."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(source).hexdigest()
+    try:
+        position = source.tell()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: source.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+        source.seek(position)
+        return digest.hexdigest()
+    except (AttributeError, OSError):
+        return None
+
+
+def _content_path(sha256: str, ext: str) -> str:
+    return f"{CONTENT_PREFIX}/{sha256[:2]}/{sha256}{ext}"
+
+
+def _tus_metadata(**fields: str) -> str:
+    return ",".join(f"{k} {base64.b64encode(v.encode()).decode()}" for k, v in fields.items())
+
+
+def _load_upload(resume_key: str) -> Optional[StorageUpload]:
+    db = SessionLocal()
+    try:
+        row = db.get(StorageUpload, resume_key)
+        if row is not None:
+            db.expunge(row)
+        return row
+    finally:
+        db.close()
+
+
+def _save_upload(resume_key: str, **values) -> None:
+    db = SessionLocal()
+    try:
+        row = db.get(StorageUpload, resume_key)
+        if row is None:
+            db.add(StorageUpload(resume_key=resume_key, **values))
+        else:
+            for name, value in values.items():
+                setattr(row, name, value)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        # Progress is still tracked by the server; only a later retry loses its head start
+        logger.warning("[Storage] Could not persist upload progress for %s: %s", resume_key, e)
+    finally:
+        db.close()
+
+
+def _forget_upload(resume_key: str) -> None:
+    db = SessionLocal()
+    try:
+        db.query(StorageUpload).filter(StorageUpload.resume_key == resume_key).delete()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning("[Storage] Could not clear finished upload %s: %s", resume_key, e)
+    finally:
+        db.close()
+
+
+def _reference_existing(bucket: str, sha256: str) -> Optional[str]:
+    """Add a reference to an indexed object and return its path, or None if not indexed."""
+    db = SessionLocal()
+    try:
+        path = db.execute(
+            update(StoredObject)
+            .where(StoredObject.bucket == bucket, StoredObject.sha256 == sha256)
+            .values(
+                ref_count=StoredObject.ref_count + 1,
+                last_referenced_at=datetime.now(timezone.utc),
+            )
+            .returning(StoredObject.object_path)
+        ).scalar_one_or_none()
+        db.commit()
+        return path
+    except Exception as e:
+        db.rollback()
+        logger.warning("[Storage] Object index lookup failed, uploading: %s", e)
+        return None
+    finally:
+        db.close()
+
+
+def _index_object(bucket: str, sha256: str, path: str, size: int, content_type: str) -> None:
+    """Record a freshly uploaded object (or one more reference, if a concurrent upload won).
+
+    Raises RuntimeError when the index cannot be written. The upload must then
+    fail too: an unindexed object at a content path could be re-uploaded and
+    indexed by a later caller, whose release would delete it from under this one.
+    """
+    row = {
+        "bucket": bucket, "sha256": sha256, "object_path": path,
+        "content_type": content_type, "size_bytes": size, "ref_count": 1,
+    }
+    db = SessionLocal()
+    try:
+        stmt = upsert(
+            db,
+            StoredObject,
+            row,
+            index_elements=[StoredObject.bucket, StoredObject.sha256],
+            set_={
+                "ref_count": StoredObject.ref_count + 1,
+                "last_referenced_at": datetime.now(timezone.utc),
+            },
+        )
+        if stmt is None:
+            if db.get(StoredObject, (bucket, sha256)) is None:
+                db.execute(insert(StoredObject).values(**row))
+            else:
+                db.execute(
+                    update(StoredObject)
+                    .where(StoredObject.bucket == bucket, StoredObject.sha256 == sha256)
+                    .values(ref_count=StoredObject.ref_count + 1)
+                )
+        else:
+            db.execute(stmt)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise RuntimeError(f"Could not index stored object {bucket}/{path}: {e}") from e
+    finally:
+        db.close()
+
+
+def _release_reference(bucket: str, path: str, remove: Callable[[], None]) -> bool:
+    """Drop one reference to `path` and call remove() if it was the last; True if it did.
+
+    The row stays locked (and present) until the object is gone, so an upload
+    of the same bytes waits for the release, then finds no row and stores the
+    object again instead of reusing a path that is being deleted. If remove()
+    fails the reference is kept and the error propagates.
+    """
+    db = SessionLocal()
+    try:
+        remaining = db.execute(
+            update(StoredObject)
+            .where(StoredObject.bucket == bucket, StoredObject.object_path == path)
+            .values(ref_count=StoredObject.ref_count - 1)
+            .returning(StoredObject.ref_count)
+        ).scalar_one_or_none()
+        if remaining is not None and remaining > 0:
+            db.commit()
+            return False
+        remove()  # not indexed (never shared), or the last reference
+        if remaining is not None:
+            db.execute(
+                delete(StoredObject)
+                .where(StoredObject.bucket == bucket, StoredObject.object_path == path)
+            )
+        db.commit()
+        return True
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+class StorageClient:
+    """Supabase Storage REST calls over a pooled keep-alive session."""
+
+    def __init__(self):
+        self.metrics = LatencyRecorder()
+
+    @staticmethod
+    def _base_url() -> str:
+        return f"{settings.SUPABASE_URL.rstrip('/')}/storage/v1"
+
+    @staticmethod
+    def _auth_headers() -> dict[str, str]:
+        key = settings.SUPABASE_SERVICE_KEY or settings.SUPABASE_ANON_KEY
+        return {"Authorization": f"Bearer {key}", "apikey": key}
+
+    def public_url(self, bucket: str, path: str) -> str:
+        return f"{self._base_url()}/object/public/{bucket}/{path}"
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        http_client.endpoint(_STORAGE_ENDPOINT, pool_maxsize=settings.STORAGE_POOL_MAXSIZE)
+        headers = {**self._auth_headers(), **kwargs.pop("headers", {})}
+        return http_client.request(_STORAGE_ENDPOINT, method, url, headers=headers, **kwargs)
+
+    def upload(
+        self,
+        bucket: str,
+        path: str,
+        body,
+        content_type: str,
+        *,
+        upsert: bool = False,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Upload bytes or a file-like object (streamed from the file, not copied).
+
+        Raises RuntimeError on failure.
+        """
+        size = _source_size(body)
+        started = time.perf_counter()
+        resp = self._request(
+            "POST",
+            f"{self._base_url()}/object/{bucket}/{path}",
+            data=body,
+            headers={"Content-Type": content_type, "x-upsert": "true" if upsert else "false"},
+            timeout=timeout or settings.STORAGE_UPLOAD_TIMEOUT_SECONDS,
+        )
+        if resp.status_code not in (200, 201):
+            raise RuntimeError(
+                f"Supabase Storage upload failed: HTTP {resp.status_code} — {resp.text[:300]}"
+            )
+        self._record_upload(size, time.perf_counter() - started)
+
+    def upload_resumable(
+        self,
+        bucket: str,
+        path: str,
+        source,
+        size: int,
+        content_type: str,
+        *,
+        resume_key: str,
+        upsert: bool = False,
+    ) -> str:
+        """TUS upload of `size` bytes from bytes or a seekable file-like object.
+
+        Continues an unfinished upload stored under resume_key when there is
+        one for the same bucket, path and size. Callers pass content-addressed
+        paths, so a matching path means the same bytes; a stale upload for other
+        bytes is abandoned and a new one started. Returns the object path.
+        Raises ResumableUploadInterrupted when the connection keeps dropping
+        (progress is kept), RuntimeError on any other failure, including more
+        than STORAGE_TUS_MAX_RESUMES offset conflicts.
+        """
+        started = time.perf_counter()
+        start = 0 if isinstance(source, (bytes, bytearray, memoryview)) else source.tell()
+        tus_headers = {"Tus-Resumable": _TUS_VERSION}
+
+        offset = None
+        session = _load_upload(resume_key)
+        if session is not None and (session.bucket, session.object_path, session.total_bytes) != (bucket, path, size):
+            logger.info("[Storage] Discarding stale upload %s for %s/%s", resume_key, session.bucket, session.object_path)
+            session = None
+        if session is not None:
+            offset = self._tus_offset(session.upload_url)
+            if offset is not None:
+                upload_url = session.upload_url
+                logger.info(
+                    "[Storage] Resuming upload %s at %d/%d bytes (last saved %d)",
+                    resume_key, offset, size, session.offset,
+                )
+        if offset is None:
+            resp = self._request(
+                "POST",
+                f"{self._base_url()}/upload/resumable",
+                headers={
+                    **tus_headers,
+                    "Upload-Length": str(size),
+                    "Upload-Metadata": _tus_metadata(
+                        bucketName=bucket, objectName=path, contentType=content_type,
+                    ),
+                    "x-upsert": "true" if upsert else "false",
+                },
+                timeout=30,
+            )
+            if resp.status_code != 201 or "Location" not in resp.headers:
+                raise RuntimeError(
+                    f"Supabase Storage resumable upload could not start: HTTP {resp.status_code} — {resp.text[:300]}"
+                )
+            upload_url = urljoin(resp.url, resp.headers["Location"])
+            offset = 0
+            _save_upload(
+                resume_key, bucket=bucket, object_path=path, upload_url=upload_url,
+                content_type=content_type, total_bytes=size, offset=0,
+            )
+
+        chunk_size = max(1, settings.STORAGE_TUS_CHUNK_BYTES)
+        drops = 0
+        conflicts = 0
+        while offset < size:
+            chunk = _read_chunk(source, start, offset, chunk_size)
+            try:
+                resp = self._request(
+                    "PATCH",
+                    upload_url,
+                    data=chunk,
+                    headers={
+                        **tus_headers,
+                        "Upload-Offset": str(offset),
+                        "Content-Type": "application/offset+octet-stream",
+                    },
+                    timeout=settings.STORAGE_UPLOAD_TIMEOUT_SECONDS,
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as exc:
+                drops += 1
+                server_offset = None
+                if drops <= settings.STORAGE_TUS_MAX_RESUMES:
+                    try:
+                        server_offset = self._tus_offset(upload_url)
+                    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                        pass
+                if server_offset is None:
+                    raise ResumableUploadInterrupted(
+                        f"Supabase Storage upload interrupted at {offset}/{size} bytes: {exc}"
+                    ) from exc
+                logger.warning(
+                    "[Storage] Upload %s dropped (%s); resuming at %d/%d bytes",
+                    resume_key, exc, server_offset, size,
+                )
+                offset = server_offset
+                _save_upload(resume_key, offset=offset)
+                continue
+
+            if resp.status_code == 409:
+                # Offset mismatch (e.g. a chunk landed but its response was lost)
+                conflicts += 1
+                if conflicts > settings.STORAGE_TUS_MAX_RESUMES:
+                    raise RuntimeError(
+                        f"Supabase Storage upload kept conflicting at {offset}/{size} bytes; giving up"
+                    )
+                server_offset = self._tus_offset(upload_url)
+                if server_offset is None:
+                    raise RuntimeError("Supabase Storage resumable upload disappeared mid-transfer")
+                offset = server_offset
+                continue
+            if resp.status_code != 204:
+                raise RuntimeError(
+                    f"Supabase Storage upload failed: HTTP {resp.status_code} — {resp.text[:300]}"
+                )
+            offset = int(resp.headers.get("Upload-Offset", offset + len(chunk)))
+            _save_upload(resume_key, offset=offset)
+
+        _forget_upload(resume_key)
+        self._record_upload(size, time.perf_counter() - started)
+        return path
+
+    def _tus_offset(self, upload_url: str) -> Optional[int]:
+        """Server offset of an unfinished upload, or None if it no longer exists."""
+        resp = self._request("HEAD", upload_url, headers={"Tus-Resumable": _TUS_VERSION}, timeout=30)
+        if resp.status_code in (404, 410):
+            return None
+        if resp.status_code not in (200, 204) or "Upload-Offset" not in resp.headers:
+            raise RuntimeError(f"Supabase Storage upload status check failed: HTTP {resp.status_code}")
+        return int(resp.headers["Upload-Offset"])
+
+    def upload_content_addressed(
+        self,
+        bucket: str,
+        source,
+        content_type: str,
+        ext: str,
+        *,
+        resume_key: Optional[str] = None,
+    ) -> Optional[str]:
+        """Store `source` once per bucket under its content hash; returns the object path.
+
+        Bytes already in the index cost one UPDATE and no transfer. Returns
+        None when the source cannot be hashed (non-seekable stream), in which
+        case nothing was uploaded.
+        """
+        sha256 = _content_hash(source)
+        size = _source_size(source)
+        if sha256 is None or size is None:
+            return None
+
+        existing = _reference_existing(bucket, sha256)
+        if existing is not None:
+            self.metrics.incr("dedup_hits")
+            self.metrics.incr("bytes_deduplicated", size)
+            logger.info("[Storage] %s/%s already stored (%d bytes); upload skipped", bucket, existing, size)
+            return existing
+
+        path = _content_path(sha256, ext)
+        # Same path means same bytes, so overwriting a concurrent upload is harmless
+        if (
+            settings.STORAGE_RESUMABLE_UPLOADS
+            and size >= settings.STORAGE_RESUMABLE_THRESHOLD_BYTES
+        ):
+            path = self.upload_resumable(
+                bucket, path, source, size, content_type,
+                resume_key=resume_key or f"{bucket}/{path}", upsert=True,
+            )
+        else:
+            self.upload(bucket, path, source, content_type, upsert=True)
+        _index_object(bucket, sha256, path, size, content_type)
+        return path
+
+    def release(self, bucket: str, path: str) -> None:
+        """Drop one reference to an object; delete it once nothing refers to it."""
+        if not _release_reference(bucket, path, lambda: self.remove(bucket, [path])):
+            self.metrics.incr("deletes_skipped_shared")
+
+    def list_objects(self, bucket: str, prefix: str = "", *, page_size: int = 1000):
+        """Yield (path, size_bytes, updated_at) for every object under `prefix`, recursively.
+
+        The Storage list API returns one folder level per call; folders come
+        back without an id and are walked depth-first.
+        """
+        folders = [prefix.strip("/")]
+        while folders:
+            folder = folders.pop()
+            offset = 0
+            while True:
+                resp = self._request(
+                    "POST",
+                    f"{self._base_url()}/object/list/{bucket}",
+                    json={
+                        "prefix": folder,
+                        "limit": page_size,
+                        "offset": offset,
+                        "sortBy": {"column": "name", "order": "asc"},
+                    },
+                    idempotent=True,
+                    timeout=60,
+                )
+                if resp.status_code != 200:
+                    raise RuntimeError(
+                        f"Supabase Storage list failed: HTTP {resp.status_code} — {resp.text[:300]}"
+                    )
+                entries = resp.json()
+                for entry in entries:
+                    path = f"{folder}/{entry['name']}" if folder else entry["name"]
+                    if entry.get("id") is None:
+                        folders.append(path)
+                        continue
+                    metadata = entry.get("metadata") or {}
+                    yield path, int(metadata.get("size") or 0), entry.get("updated_at")
+                if len(entries) < page_size:
+                    break
+                offset += page_size
+
+    def remove(self, bucket: str, paths: list[str]) -> None:
+        """Delete objects; paths that do not exist are ignored. Raises RuntimeError on failure."""
+        resp = self._request(
+            "DELETE",
+            f"{self._base_url()}/object/{bucket}",
+            json={"prefixes": paths},
+            timeout=30,
+        )
+        if resp.status_code != 200:
+            raise RuntimeError(
+                f"Supabase Storage delete failed: HTTP {resp.status_code} — {resp.text[:300]}"
+            )
+
+    def _record_upload(self, size: Optional[int], seconds: float) -> None:
+        self.metrics.observe(seconds)
+        self.metrics.incr("uploads")
+        if size:
+            self.metrics.incr("bytes_uploaded", size)
+        self.metrics.incr("upload_ms", int(seconds * 1000))
+
+    def get_metrics(self) -> dict:
+        snapshot = self.metrics.snapshot()
+        uploaded = snapshot.get("bytes_uploaded", 0)
+        upload_seconds = snapshot.get("upload_ms", 0) / 1000
+        saved = snapshot.get("bytes_deduplicated", 0)
+        return {
+            **snapshot,
+            "storage_saved_bytes": saved,
+            # At the throughput observed for real uploads in this process
+            "upload_seconds_avoided_est": round(saved * upload_seconds / uploaded, 2) if uploaded else None,
+        }
+
+
+storage_client = StorageClient()
 
 
 def upload_watermark_preview(
@@ -39,30 +565,32 @@ def upload_watermark_preview(
     """
     Upload a watermarked preview file to Supabase Storage.
 
-    Storage path:
-        task-submissions/preview/{client_id}/{project_id}/{task_id}/{unique_filename}
+    Storage path (content-addressed, so re-uploads of the same preview are
+    stored once):
+        task-submissions/preview/sha256/{hash[:2]}/{hash}{ext}
+
+    client_id, project_id and task_id are no longer part of the path; they
+    are kept for callers and log context.
+
+    Previews are never released: nothing deletes them, so their stored_objects
+    row only ever gains references and the object is kept for good.
 
     Returns the public URL of the uploaded file.
     Raises RuntimeError on upload failure.
     """
     ext = _extension_from_content_type(content_type, filename)
-    unique_name = f"{uuid.uuid4().hex}{ext}"
-    storage_path = f"preview/{client_id}/{project_id}/{task_id}/{unique_name}"
-
-    supabase: Client = _get_client()
-
-    response = supabase.storage.from_(TASK_SUBMISSIONS_BUCKET).upload(
-        path=storage_path,
-        file=file_bytes,
-        file_options={
-            "content-type": content_type,
-            "upsert": "false",
-        },
-    )
+    sha256 = _content_hash(file_bytes)
+    storage_path = f"preview/{_content_path(sha256, ext)}"
 
-    # supabase-py v2 raises an exception on failure; check for StorageException
-    public_url = supabase.storage.from_(TASK_SUBMISSIONS_BUCKET).get_public_url(storage_path)
-    return public_url
+    existing = _reference_existing(TASK_SUBMISSIONS_BUCKET, sha256)
+    if existing is not None:
+        storage_client.metrics.incr("dedup_hits")
+        storage_client.metrics.incr("bytes_deduplicated", len(file_bytes))
+        return storage_client.public_url(TASK_SUBMISSIONS_BUCKET, existing)
+
+    storage_client.upload(TASK_SUBMISSIONS_BUCKET, storage_path, file_bytes, content_type, upsert=True)
+    _index_object(TASK_SUBMISSIONS_BUCKET, sha256, storage_path, len(file_bytes), content_type)
+    return storage_client.public_url(TASK_SUBMISSIONS_BUCKET, storage_path)
 
 
 def _extension_from_content_type(content_type: str, filename: str) -> str:
@@ -99,6 +627,7 @@ def upload_deliverable(
     task_id: str,
     submission_id: str,
     file_type: str,
+    resume_key: Optional[str] = None,
 ) -> tuple[str, str]:
     """
     Stream an image directly to Supabase Storage via its REST API.
@@ -108,48 +637,34 @@ def upload_deliverable(
     object is passed, requests reads from it in chunks and sends them
     straight to Supabase — no full in-memory copy is made.
 
-    Storage path:
-        deliverables/{project_id}/{task_id}/{submission_id}/{file_type}-{timestamp}.{ext}
+    Storage path (content-addressed; identical bytes are stored once and a
+    repeat upload is a metadata-only write):
+        deliverables/sha256/{hash[:2]}/{hash}{ext}
+    Non-seekable streams, which cannot be hashed up front, fall back to
+        deliverables/{project_id}/{task_id}/{submission_id}/{file_type}-{timestamp}{ext}
+
+    Sources of STORAGE_RESUMABLE_THRESHOLD_BYTES or more (bytes or seekable
+    files) go through the resumable TUS upload; pass a stable resume_key so a
+    retry after ResumableUploadInterrupted continues that upload.
 
     Returns (storage_path, public_url).
     Raises RuntimeError on upload failure.
     """
-    import requests as _http
-    from datetime import datetime, timezone
-
     ext = _ext_from_mime(content_type)
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
-    storage_path = f"{project_id}/{task_id}/{submission_id}/{file_type}-{timestamp}{ext}"
-
-    key = settings.SUPABASE_SERVICE_KEY or settings.SUPABASE_ANON_KEY
-    url = f"{settings.SUPABASE_URL}/storage/v1/object/{DELIVERABLES_BUCKET}/{storage_path}"
-
-    resp = _http.post(
-        url,
-        data=file_source,
-        headers={
-            "Authorization": f"Bearer {key}",
-            "Content-Type": content_type,
-        },
-        timeout=120,
-    )
-
-    if resp.status_code not in (200, 201):
-        raise RuntimeError(
-            f"Supabase Storage upload failed: HTTP {resp.status_code} — {resp.text[:300]}"
-        )
-
-    public_url = (
-        f"{settings.SUPABASE_URL}/storage/v1/object/public"
-        f"/{DELIVERABLES_BUCKET}/{storage_path}"
+    storage_path = storage_client.upload_content_addressed(
+        DELIVERABLES_BUCKET, file_source, content_type, ext, resume_key=resume_key,
     )
-    return storage_path, public_url
+    if storage_path is None:
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        storage_path = f"{project_id}/{task_id}/{submission_id}/{file_type}-{timestamp}{ext}"
+        storage_client.upload(DELIVERABLES_BUCKET, storage_path, file_source, content_type)
+    return storage_path, storage_client.public_url(DELIVERABLES_BUCKET, storage_path)
 
 
 def delete_deliverable(storage_path: str) -> None:
     """
     Delete a deliverable from Supabase Storage.
     Used for rollback when a DB write fails after a successful upload.
+    Content-addressed objects still referenced by other uploads are kept.
     """
-    supabase: Client = _get_client()
-    supabase.storage.from_(DELIVERABLES_BUCKET).remove([storage_path])
+    storage_client.release(DELIVERABLES_BUCKET, storage_path)
@@ -7,7 +7,8 @@ Responsibilities:
   1. Save submission record (status=pending) with brief_snapshot
   2. Send multipart/form-data webhook to n8n (image binary + JSON metadata)
      Fallback → JSON + base64 if multipart fails
-  3. Process inline n8n response (sync validation)
+  3. Process inline n8n response (sync validation), or hand steps 2–5 to a
+     review job when SUBMISSION_REVIEW_ASYNC is on (see review_job_service)
   4. Write webhook_response + update submission_status
   5. Trigger manager notification
 
@@ -22,25 +23,50 @@ from __future__ import annotations
 
 import io
 import json
+import uuid
 import base64
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Optional
+from typing import NamedTuple, Optional
 from uuid import UUID
 
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.models.task import Task, TaskStatus, TaskSubmission, SubmissionStatus, TaskFeedback
+from app.core.metrics import LatencyRecorder
+from app.db.dialect import upsert
+from app.db.session import end_read_transaction, unit_of_work
+from app.models.task import Task, TaskStatus, TaskSubmission, SubmissionStatus, TaskFeedback, SubmissionAttemptCounter
 from app.models.project import Project
 from app.models.user import User
 from app.models.notification import NotificationType
 from app.schemas.submission import SubmissionCreateRequest
 from app.services.notification_service import notification_service
 from app.services.activity_service import activity_service
+from app.services.review_job_service import review_job_service
+from app.services.http_client import http_client
+from app.services.ai_review_cache_service import ai_review_cache_service
+from app.services.brief_snapshot_service import brief_snapshot_service
+from app.services.ai_response_parser import parse_ai_response
+from app.services.review_image_service import review_image_service
 
 logger = logging.getLogger(__name__)
 
+# Outbound endpoints (each has its own connection pool and circuit breaker)
+_IMAGE_ENDPOINT = "submission-images"
+_REVIEW_ENDPOINT = "n8n-submission-review"
+
+# run_review end to end: image fetch, renditions, webhook and applying the verdict
+_review_metrics = LatencyRecorder()
+
+
+class ReviewNotObtained(RuntimeError):
+    """A review job got no AI verdict (webhook down, 5xx, unparseable reply); retry it."""
+
 
 def _build_brief_snapshot(project: Optional[Project]) -> Optional[str]:
     """
@@ -58,7 +84,7 @@ def _build_brief_snapshot(project: Optional[Project]) -> Optional[str]:
 
     if project.saved_answers:
         try:
-            answers = json.loads(project.saved_answers)
+            answers = project.saved_answers
             qa_lines = [
                 f"Q: {v.get('question', k)}\nA: {v.get('answer', '')}"
                 for k, v in answers.items()
@@ -71,6 +97,249 @@ def _build_brief_snapshot(project: Optional[Project]) -> Optional[str]:
     return "\n".join(parts) if parts else None
 
 
+class _FetchedImage(NamedTuple):
+    url: str
+    filename: str
+    mime_type: str
+    content: Optional[bytes]   # None when the download failed or exceeded the byte budget
+
+
+class _ByteBudget:
+    """Total download allowance shared by the fetch threads of one submission."""
+
+    def __init__(self, limit: int):
+        self._remaining = limit
+        self._lock = threading.Lock()
+
+    def take(self, n: int) -> bool:
+        with self._lock:
+            if n > self._remaining:
+                return False
+            self._remaining -= n
+            return True
+
+    def can_fit(self, n: int) -> bool:
+        with self._lock:
+            return n <= self._remaining
+
+    def refund(self, n: int) -> None:
+        with self._lock:
+            self._remaining += n
+
+
+def _get_image(url: str):
+    """Streaming GET on the shared keep-alive pool for submission images."""
+    http_client.endpoint(
+        _IMAGE_ENDPOINT,
+        pool_maxsize=max(1, settings.SUBMISSION_IMAGE_FETCH_CONCURRENCY) * 2,
+    )
+    return http_client.get(_IMAGE_ENDPOINT, url, timeout=15, stream=True)
+
+
+def _fetch_one_image(url: str, budget: _ByteBudget) -> _FetchedImage:
+    filename = url.split("/")[-1].split("?")[0] or "image.png"
+    try:
+        with _get_image(url) as resp:
+            resp.raise_for_status()
+            mime = resp.headers.get("Content-Type", "image/png").split(";")[0].strip()
+            chunks = []
+            for chunk in resp.iter_content(chunk_size=64 * 1024):
+                if not budget.take(len(chunk)):
+                    # Give back what this image already used so smaller ones still fit
+                    budget.refund(sum(len(c) for c in chunks))
+                    logger.warning(
+                        "Skipping image for webhook (%s): submission byte budget of %d exceeded",
+                        url, settings.SUBMISSION_IMAGE_MAX_TOTAL_BYTES,
+                    )
+                    return _FetchedImage(url, filename, mime, None)
+                chunks.append(chunk)
+            content = b"".join(chunks)
+            logger.debug("Fetched image for webhook: %s (%s, %d bytes)", filename, mime, len(content))
+            return _FetchedImage(url, filename, mime, content)
+    except Exception as img_err:
+        logger.warning("Could not fetch image for webhook (%s): %s", url, img_err)
+        return _FetchedImage(url, filename, "image/png", None)
+
+
+def _fetch_images(file_urls: list[str]) -> list[_FetchedImage]:
+    """Download all submission images concurrently, preserving order.
+
+    At most SUBMISSION_IMAGE_FETCH_CONCURRENCY requests run at once and the
+    submission as a whole may not pull more than SUBMISSION_IMAGE_MAX_TOTAL_BYTES.
+    """
+    if not file_urls:
+        return []
+    budget = _ByteBudget(settings.SUBMISSION_IMAGE_MAX_TOTAL_BYTES)
+    workers = max(1, min(settings.SUBMISSION_IMAGE_FETCH_CONCURRENCY, len(file_urls)))
+    if workers == 1:
+        return [_fetch_one_image(url, budget) for url in file_urls]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="submission-img") as pool:
+        return list(pool.map(lambda url: _fetch_one_image(url, budget), file_urls))
+
+
+class _ByteBudgetExceeded(Exception):
+    pass
+
+
+_STREAM_CHUNK = 64 * 1024
+
+
+def _open_image_stream(url: str):
+    """Open a streaming GET for one image. Returns (filename, mime, response) or None."""
+    filename = url.split("/")[-1].split("?")[0] or "image.png"
+    resp = None
+    try:
+        resp = _get_image(url)
+        resp.raise_for_status()
+    except Exception as img_err:
+        if resp is not None:
+            resp.close()  # return the pooled connection now, not at GC
+        logger.warning("Could not fetch image for webhook (%s): %s", url, img_err)
+        return None
+    mime = resp.headers.get("Content-Type", "image/png").split(";")[0].strip()
+    return filename, mime, resp
+
+
+def _relay_body(resp, budget: _ByteBudget, url: str):
+    with resp:
+        for chunk in resp.iter_content(chunk_size=_STREAM_CHUNK):
+            if not budget.take(len(chunk)):
+                # Part of this image is already on the wire; abort the whole request
+                raise _ByteBudgetExceeded(
+                    f"{url}: submission byte budget of {settings.SUBMISSION_IMAGE_MAX_TOTAL_BYTES} exceeded"
+                )
+            yield chunk
+
+
+def _fits_budget(resp, budget: _ByteBudget, url: str) -> bool:
+    """Skip an image up front when its declared size cannot fit the remaining budget."""
+    length = resp.headers.get("Content-Length")
+    if length and length.isdigit() and not budget.can_fit(int(length)):
+        logger.warning("Skipping image for webhook (%s): exceeds submission byte budget", url)
+        resp.close()
+        return False
+    return True
+
+
+def _iter_multipart(boundary: str, text_fields: dict, file_urls: list[str]):
+    """multipart/form-data body that pipes each image from its source to n8n."""
+    budget = _ByteBudget(settings.SUBMISSION_IMAGE_MAX_TOTAL_BYTES)
+    for name, value in text_fields.items():
+        yield (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n'
+            f"Content-Type: text/plain; charset=utf-8\r\n\r\n"
+        ).encode() + value.encode("utf-8") + b"\r\n"
+    for url in file_urls:
+        opened = _open_image_stream(url)
+        if opened is None:
+            continue
+        filename, mime, resp = opened
+        if not _fits_budget(resp, budget, url):
+            continue
+        safe_name = filename.replace('"', "%22").replace("\r", "").replace("\n", "")
+        yield (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="images"; filename="{safe_name}"\r\n'
+            f"Content-Type: {mime}\r\n\r\n"
+        ).encode()
+        yield from _relay_body(resp, budget, url)
+        yield b"\r\n"
+    yield f"--{boundary}--\r\n".encode()
+
+
+def _iter_json_b64(meta: dict, file_urls: list[str]):
+    """JSON+base64 fallback body, encoded on the fly (3-byte aligned chunks)."""
+    budget = _ByteBudget(settings.SUBMISSION_IMAGE_MAX_TOTAL_BYTES)
+    yield json.dumps(meta)[:-1].encode() + b', "images": ['
+    for index, url in enumerate(file_urls):
+        if index:
+            yield b", "
+        filename = url.split("/")[-1].split("?")[0] or "image.png"
+        opened = _open_image_stream(url)
+        if opened is None or not _fits_budget(opened[2], budget, url):
+            yield json.dumps({"url": url, "filename": filename, "base64": None, "mime_type": None}).encode()
+            continue
+        _, mime, resp = opened
+        head = json.dumps({"url": url, "filename": filename, "mime_type": mime, "base64": ""})
+        yield head[:-2].encode()  # everything up to the opening quote of "base64"
+        carry = b""
+        for chunk in _relay_body(resp, budget, url):
+            data = carry + chunk
+            cut = len(data) - len(data) % 3
+            carry = data[cut:]
+            if cut:
+                yield base64.b64encode(data[:cut])
+        yield base64.b64encode(carry) + b'"}'
+    yield b"]}"
+
+
+def _post_webhook_streaming(
+    webhook_url: str,
+    headers: dict,
+    meta: dict,
+    brief_snapshot: Optional[str],
+    file_urls: list[str],
+) -> Optional[dict]:
+    """Streaming variant of the multipart → JSON+base64 sequence.
+
+    Image bodies are piped from storage to n8n in 64 KiB chunks (chunked
+    transfer encoding), so memory stays flat regardless of image size. The
+    fallback re-streams the images rather than keeping a copy.
+    """
+    meta_without_brief = {k: v for k, v in meta.items() if k != "brief"}
+    text_fields = {"data": json.dumps(meta_without_brief), "brief": brief_snapshot or ""}
+    boundary = uuid.uuid4().hex
+
+    try:
+        resp = http_client.post(
+            _REVIEW_ENDPOINT,
+            webhook_url,
+            data=_iter_multipart(boundary, text_fields, file_urls),
+            headers={**headers, "Content-Type": f"multipart/form-data; boundary={boundary}"},
+            timeout=30,
+        )
+        logger.info("Webhook (multipart, streamed) → %s | status=%d", webhook_url, resp.status_code)
+        if resp.status_code < 500:
+            try:
+                return resp.json()
+            except Exception:
+                return None
+        return None
+    except Exception as mp_err:
+        logger.warning("Streamed multipart webhook failed (%s). Falling back to JSON+base64.", mp_err)
+
+    try:
+        resp = http_client.post(
+            _REVIEW_ENDPOINT,
+            webhook_url,
+            data=_iter_json_b64(meta, file_urls),
+            headers={**headers, "Content-Type": "application/json"},
+            timeout=30,
+        )
+        logger.info("Webhook (json+b64, streamed) → %s | status=%d", webhook_url, resp.status_code)
+        if resp.status_code < 500:
+            try:
+                return resp.json()
+            except Exception:
+                return None
+    except Exception as fb_err:
+        logger.error("JSON+base64 fallback also failed: %s. Submission saved locally only.", fb_err)
+
+    return None
+
+
+def _review_renditions(images: list[_FetchedImage]) -> list[_FetchedImage]:
+    """Swap in review-sized copies of the images (originals where none is better)."""
+    renditions = review_image_service.render_many([img.content for img in images])
+    return [
+        img if r is None else img._replace(
+            filename=img.filename.rsplit(".", 1)[0] + r.extension,
+            mime_type=r.mime_type,
+            content=r.content,
+        )
+        for img, r in zip(images, renditions)
+    ]
+
+
 def _send_submission_webhook(
     *,
     webhook_url: str,
@@ -83,6 +352,7 @@ def _send_submission_webhook(
     task_title: str,
     brief_snapshot: Optional[str],
     file_urls: list[str],
+    images: Optional[list[_FetchedImage]] = None,
 ) -> Optional[dict]:
     """
     PRIMARY  → multipart/form-data
@@ -91,11 +361,13 @@ def _send_submission_webhook(
 
     FALLBACK → JSON + base64 images
         • Used automatically if multipart raises any exception
+        • Reuses the bytes fetched for the multipart attempt
+
+    With SUBMISSION_WEBHOOK_STREAMING both requests are streamed instead
+    (see _post_webhook_streaming).
 
     Returns parsed n8n JSON response dict, or None if no parseable response.
     """
-    import requests
-
     headers = {"X-Webhook-Secret": webhook_secret} if webhook_secret else {}
     meta = {
         "submission_id":  str(submission.id),
@@ -115,6 +387,15 @@ def _send_submission_webhook(
         "all_image_urls": file_urls,
     }
 
+    if settings.SUBMISSION_WEBHOOK_STREAMING:
+        return _post_webhook_streaming(webhook_url, headers, meta, brief_snapshot, file_urls)
+
+    # Images are downloaded once, in parallel, and reused by both encodings below
+    if images is None:
+        images = _fetch_images(file_urls)
+    if review_image_service.enabled():
+        images = _review_renditions(images)
+
     try:
         meta_without_brief = {k: v for k, v in meta.items() if k != "brief"}
 
@@ -123,19 +404,12 @@ def _send_submission_webhook(
             "brief": brief_snapshot or "",
         }
 
-        binary_files: list = []
-        for url in file_urls:
-            try:
-                img_resp = requests.get(url, timeout=15)
-                img_resp.raise_for_status()
-                mime = img_resp.headers.get("Content-Type", "image/png").split(";")[0].strip()
-                fname = url.split("/")[-1].split("?")[0] or "image.png"
-                binary_files.append(("images", (fname, io.BytesIO(img_resp.content), mime)))
-                logger.debug("Fetched image for webhook: %s (%s, %d bytes)", fname, mime, len(img_resp.content))
-            except Exception as img_err:
-                logger.warning("Could not fetch image for webhook (%s): %s", url, img_err)
-
-        resp = requests.post(webhook_url, data=text_fields, files=binary_files, headers=headers, timeout=30)
+        binary_files: list = [
+            ("images", (img.filename, io.BytesIO(img.content), img.mime_type))
+            for img in images if img.content is not None
+        ]
+
+        resp = http_client.post(_REVIEW_ENDPOINT, webhook_url, data=text_fields, files=binary_files, headers=headers, timeout=30)
         logger.info("Webhook (multipart) → %s | status=%d", webhook_url, resp.status_code)
 
         if resp.status_code < 500:
@@ -148,26 +422,19 @@ def _send_submission_webhook(
     except Exception as mp_err:
         logger.warning("Multipart webhook failed (%s). Falling back to JSON+base64.", mp_err)
 
-    images_b64: list[dict] = []
-    for url in file_urls:
-        entry: dict = {
-            "url": url,
-            "filename": url.split("/")[-1].split("?")[0] or "image.png",
-            "base64": None,
-            "mime_type": None,
+    images_b64: list[dict] = [
+        {
+            "url": img.url,
+            "filename": img.filename,
+            "base64": base64.b64encode(img.content).decode("utf-8") if img.content is not None else None,
+            "mime_type": img.mime_type if img.content is not None else None,
         }
-        try:
-            img_r = requests.get(url, timeout=15)
-            img_r.raise_for_status()
-            entry["mime_type"] = img_r.headers.get("Content-Type", "image/png").split(";")[0].strip()
-            entry["base64"] = base64.b64encode(img_r.content).decode("utf-8")
-        except Exception as b64_err:
-            logger.warning("Could not fetch image for fallback (%s): %s", url, b64_err)
-        images_b64.append(entry)
+        for img in images
+    ]
 
     fallback_payload = {**meta, "images": images_b64}
     try:
-        resp = requests.post(webhook_url, json=fallback_payload, headers=headers, timeout=30)
+        resp = http_client.post(_REVIEW_ENDPOINT, webhook_url, json=fallback_payload, headers=headers, timeout=30)
         logger.info("Webhook (json+b64) → %s | status=%d", webhook_url, resp.status_code)
         if resp.status_code < 500:
             try:
@@ -180,171 +447,6 @@ def _send_submission_webhook(
     return None
 
 
-def _parse_ai_webhook_response(raw_response) -> Optional[dict]:
-    """
-    Parses the n8n/Gemini AI webhook response into a normalized internal structure.
-
-    Handles two formats:
-
-    FORMAT 1 — Gemini/Vertex AI list (new):
-        [{"content": {"parts": [{"text": "```json\\n{...}\\n```"}]}, ...}]
-
-    FORMAT 2 — Legacy direct dict:
-        {"status": "valid" | "invalid", "score": 0-100, "feedback": "..."}
-
-    Returns normalized dict:
-        {
-            "status": "aligns" | "does_not_align" | "needs_revision" | "error",
-            "summary": str,
-            "score": int (0-100),
-            "checks": {
-                "subject_concept": str, "brand_message": str, "target_audience": str,
-                "style_mood": str, "colors": str, "composition": str, "required_elements": str
-            },
-            "feedback": list[str]
-        }
-    Or None if the response cannot be parsed at all.
-    """
-    import re
-
-    if not raw_response:
-        return None
-
-    if isinstance(raw_response, list):
-        try:
-            text = raw_response[0]["content"]["parts"][0]["text"]
-        except (IndexError, KeyError, TypeError) as exc:
-            logger.warning("Webhook list response: could not extract text — %s", exc)
-            return {
-                "status": "error",
-                "summary": "AI response structure was unrecognized.",
-                "score": 0,
-                "checks": _empty_checks(),
-                "feedback": [],
-            }
-
-        # Strip markdown code fences (```json ... ``` or ``` ... ```)
-        text = text.strip()
-        text = re.sub(r"^```json\s*", "", text)
-        text = re.sub(r"^```\s*", "", text)
-        text = re.sub(r"\s*```$", "", text)
-        text = text.strip()
-
-        if not text:
-            logger.warning("Webhook list response: extracted text was empty after stripping")
-            return {
-                "status": "error",
-                "summary": "AI analysis returned an empty response.",
-                "score": 0,
-                "checks": _empty_checks(),
-                "feedback": [],
-            }
-
-        try:
-            parsed = json.loads(text)
-        except json.JSONDecodeError as exc:
-            logger.warning(
-                "Webhook list response: JSON parse failed — %s | text_preview=%s",
-                exc, text[:300],
-            )
-            return {
-                "status": "error",
-                "summary": "AI analysis JSON could not be parsed.",
-                "score": 0,
-                "checks": _empty_checks(),
-                "feedback": [],
-            }
-
-        return _normalize_ai_result(parsed)
-
-    if isinstance(raw_response, dict):
-        raw_status = str(raw_response.get("status", "")).lower()
-        if raw_status in ("aligns", "does_not_align", "needs_revision", "error"):
-            return _normalize_ai_result(raw_response)
-        # Legacy format: {"status": "valid"/"invalid", ...}
-        return _normalize_legacy_response(raw_response)
-
-    logger.warning("Webhook response is neither list nor dict: %s", type(raw_response))
-    return None
-
-
-def _empty_checks() -> dict:
-    return {
-        "subject_concept": "unknown",
-        "brand_message": "unknown",
-        "target_audience": "unknown",
-        "style_mood": "unknown",
-        "colors": "unknown",
-        "composition": "unknown",
-        "required_elements": "unknown",
-    }
-
-
-def _normalize_ai_result(parsed: dict) -> dict:
-    status = str(parsed.get("status", "error")).lower()
-    if status not in ("aligns", "does_not_align", "needs_revision", "error"):
-        status = "error"
-
-    score = parsed.get("score", 0)
-    try:
-        score = max(0, min(100, int(float(score))))
-    except (TypeError, ValueError):
-        score = 0
-
-    feedback = parsed.get("feedback", [])
-    if isinstance(feedback, str):
-        feedback = [feedback] if feedback.strip() else []
-    elif not isinstance(feedback, list):
-        feedback = []
-    feedback = [str(f) for f in feedback if f]
-
-    checks = parsed.get("checks", {})
-    if not isinstance(checks, dict):
-        checks = {}
-    for key in _empty_checks():
-        if key not in checks:
-            checks[key] = "unknown"
-
-    return {
-        "status": status,
-        "summary": str(parsed.get("summary", "")).strip(),
-        "score": score,
-        "checks": checks,
-        "feedback": feedback,
-    }
-
-
-def _normalize_legacy_response(data: dict) -> dict:
-    """Convert legacy {'status': 'valid'/'invalid', 'score': ..., 'feedback': ...} to normalized."""
-    wh_status = str(data.get("status", "")).lower()
-    score = data.get("score", 0)
-    try:
-        score = max(0, min(100, int(float(score))))
-    except (TypeError, ValueError):
-        score = 0
-
-    feedback_text = str(data.get("feedback", "")).strip()
-    feedback = [feedback_text] if feedback_text else []
-
-    if wh_status == "valid":
-        status = "aligns"
-        summary = feedback_text or "Work aligns with the brief requirements."
-    elif wh_status == "invalid":
-        status = "does_not_align"
-        summary = feedback_text or "Work does not meet the brief requirements."
-    else:
-        status = "error"
-        summary = "Validation status could not be determined."
-
-    return {
-        "status": status,
-        "summary": summary,
-        "score": score,
-        "checks": _empty_checks(),
-        "feedback": feedback,
-    }
-
-
 def _apply_webhook_response(
     db: Session,
     submission: TaskSubmission,
@@ -352,31 +454,47 @@ def _apply_webhook_response(
     raw_webhook_data,
     employee_name: str,
     project_name: str,
-) -> None:
+) -> Optional[dict]:
     """
     Parses the raw n8n webhook response (list or dict format), normalizes it,
     stores both raw and parsed data, then updates submission + task state.
+    Returns the normalized result, or None if the response was unparseable.
 
     Supported response formats:
       1. Gemini/Vertex AI list: [{content: {parts: [{text: "```json...```"}]}}]
       2. Legacy dict: {status: "valid"/"invalid", score: 0-100, feedback: "..."}
     """
     try:
-        submission.webhook_response = json.dumps(raw_webhook_data)
+        json.dumps(raw_webhook_data)
+        submission.webhook_response = raw_webhook_data
     except (TypeError, ValueError):
         submission.webhook_response = str(raw_webhook_data)
 
-    normalized = _parse_ai_webhook_response(raw_webhook_data)
+    normalized = parse_ai_response(raw_webhook_data)
 
     if normalized is None:
         logger.warning(
             "Could not parse webhook response for submission=%s — leaving as pending.",
             submission.id,
         )
-        return
+        return None
+
+    _apply_ai_result(db, submission, task, normalized, employee_name, project_name)
+    return normalized
 
+
+def _apply_ai_result(
+    db: Session,
+    submission: TaskSubmission,
+    task: Task,
+    normalized: dict,
+    employee_name: str,
+    project_name: str,
+) -> None:
+    """Store a normalized AI verdict and move submission + task to the matching state."""
     try:
-        submission.ai_analysis_result = json.dumps(normalized)
+        json.dumps(normalized)
+        submission.ai_analysis_result = normalized
     except (TypeError, ValueError) as exc:
         logger.warning("Could not serialize normalized AI result: %s", exc)
 
@@ -445,11 +563,76 @@ def _apply_webhook_response(
         )
 
     logger.info(
-        "Webhook response applied: submission=%s analysis_status=%s score=%s",
+        "AI verdict applied: submission=%s analysis_status=%s score=%s",
         submission.id, analysis_status, score,
     )
 
 
+def _next_attempt_number(db: Session, task_id: UUID, submitted_by: UUID) -> int:
+    """Atomically reserve the next attempt number in the caller's transaction.
+
+    The counter row stays locked until that transaction ends, so parallel
+    submits by the same employee on the same task queue up instead of reading
+    the same count. A first attempt seeds the counter from any existing
+    submissions, which covers rows written before the counter existed.
+    """
+    seed = (
+        select(func.coalesce(func.max(TaskSubmission.attempt_number), 0) + 1)
+        .where(TaskSubmission.task_id == task_id, TaskSubmission.submitted_by == submitted_by)
+        .scalar_subquery()
+    )
+    stmt = upsert(
+        db,
+        SubmissionAttemptCounter,
+        {"task_id": task_id, "submitted_by": submitted_by, "last_attempt": seed},
+        index_elements=[SubmissionAttemptCounter.task_id, SubmissionAttemptCounter.submitted_by],
+        set_={"last_attempt": SubmissionAttemptCounter.last_attempt + 1},
+    )
+    if stmt is None:
+        counter = (
+            db.query(SubmissionAttemptCounter)
+            .filter_by(task_id=task_id, submitted_by=submitted_by)
+            .with_for_update()
+            .first()
+        )
+        if counter is None:
+            counter = SubmissionAttemptCounter(
+                task_id=task_id,
+                submitted_by=submitted_by,
+                last_attempt=db.execute(select(seed)).scalar_one() - 1,
+            )
+            db.add(counter)
+        counter.last_attempt += 1
+        db.flush()
+        return counter.last_attempt
+
+    return db.execute(stmt.returning(SubmissionAttemptCounter.last_attempt)).scalar_one()
+
+
+def _notify_if_pending(
+    db: Session,
+    submission: TaskSubmission,
+    task: Optional[Task],
+    employee_name: str,
+    project_name: str,
+    task_title: str,
+) -> None:
+    """Tell the task owner about a submission still awaiting validation."""
+    if task and task.created_by and submission.submission_status == SubmissionStatus.pending:
+        notification_service.create(
+            db,
+            user_id=task.created_by,
+            title=f"Work submitted — {task_title}",
+            notification_type=NotificationType.work_submitted,
+            body=(
+                f"{employee_name} submitted work on task '{task_title}' "
+                f"in project '{project_name}'. Awaiting validation."
+            ),
+            task_id=task.id,
+            project_id=task.project_id,
+        )
+
+
 class SubmissionService:
 
     @staticmethod
@@ -473,71 +656,118 @@ class SubmissionService:
 
         file_urls: list[str] = submission_in.file_paths or []
 
-        prior_count = (
-            db.query(TaskSubmission)
-            .filter(
-                TaskSubmission.task_id == submission_in.task_id,
-                TaskSubmission.submitted_by == submitted_by,
+        # Submission row, task status and activity log commit together
+        with unit_of_work(db):
+            db_submission = TaskSubmission(
+                id=uuid.uuid4(),
+                task_id=submission_in.task_id,
+                submitted_by=submitted_by,
+                content=submission_in.content,
+                links=submission_in.links or None,
+                file_paths=file_urls or None,
+                submission_status=SubmissionStatus.pending,
+                brief_snapshot_hash=brief_snapshot_service.intern(db, brief_snapshot),
+                attempt_number=_next_attempt_number(db, submission_in.task_id, submitted_by),
             )
-            .count()
-        )
-        attempt_number = prior_count + 1
-
-        db_submission = TaskSubmission(
-            task_id=submission_in.task_id,
-            submitted_by=submitted_by,
-            content=submission_in.content,
-            links=json.dumps(submission_in.links) if submission_in.links else None,
-            file_paths=json.dumps(file_urls) if file_urls else None,
-            submission_status=SubmissionStatus.pending,
-            brief_snapshot=brief_snapshot,
-            attempt_number=attempt_number,
-        )
-        db.add(db_submission)
+            db.add(db_submission)
+
+            if task:
+                task.status = TaskStatus.submitted
+
+            activity_service.create_log(
+                db,
+                user_id=submitted_by,
+                action="submit_work",
+                entity_type="task",
+                entity_id=submission_in.task_id,
+            )
+
+            if review_job_service.enabled():
+                review_job_service.enqueue(db, db_submission.id)
 
-        if task:
-            task.status = TaskStatus.submitted
+        db.refresh(db_submission)
+
+        if review_job_service.enabled():
+            # Async mode: the review job is already queued; return while still pending
+            return db_submission
 
-        activity_service.create_log(
+        SubmissionService.run_review(
             db,
-            user_id=submitted_by,
-            action="submit_work",
-            entity_type="task",
-            entity_id=submission_in.task_id,
+            db_submission,
+            task,
+            employee_name=employee_name,
+            project_name=project_name,
+            task_title=task_title,
+            brief_snapshot=brief_snapshot,
+            file_urls=file_urls,
         )
-
-        db.commit()
         db.refresh(db_submission)
+        return db_submission
 
+    @staticmethod
+    def run_review(
+        db: Session,
+        submission: TaskSubmission,
+        task: Optional[Task],
+        *,
+        employee_name: str,
+        project_name: str,
+        task_title: str,
+        brief_snapshot: Optional[str],
+        file_urls: list[str],
+        job_attempt: Optional[int] = None,
+    ) -> None:
+        """Send the submission to the review webhook and apply the verdict.
+
+        Runs inline from create_submission, or from a review job when
+        SUBMISSION_REVIEW_ASYNC is on. The caller's read transaction is ended
+        (submission and task stay loaded) before the webhook, so a slow n8n
+        round-trip never holds a pooled connection; db must have no pending
+        writes.
+        Identical resubmissions take their verdict from the AI review cache
+        instead (see ai_review_cache_service).
+
+        Inline, a missing verdict never blocks the submission: it stays pending
+        and the task owner is notified. From a review job (job_attempt set) it
+        raises ReviewNotObtained so the job is retried; the owner is notified
+        of the pending submission on the first attempt only.
+        """
+        started = time.perf_counter()
+        webhook_resp = None
+        cache_key = None
+        cached = None
+        applied = False
         # SUBMISSION_REVIEW_WEBHOOK_URL takes precedence; falls back to legacy N8N_WORK_SUBMISSION_WEBHOOK
         _webhook_url = settings.SUBMISSION_REVIEW_WEBHOOK_URL or settings.N8N_WORK_SUBMISSION_WEBHOOK
+        end_read_transaction(db, submission, task)
         if _webhook_url:
             try:
-                webhook_resp = _send_submission_webhook(
-                    webhook_url=_webhook_url,
-                    webhook_secret=settings.N8N_WEBHOOK_SECRET or "",
-                    task=task,
-                    submission=db_submission,
-                    submitted_by=submitted_by,
-                    employee_name=employee_name,
-                    project_name=project_name,
-                    task_title=task_title,
-                    brief_snapshot=brief_snapshot,
-                    file_urls=file_urls,
-                )
-
-                if webhook_resp is not None:
-                    _apply_webhook_response(
-                        db=db,
-                        submission=db_submission,
+                images = None
+                if ai_review_cache_service.enabled():
+                    # Fetched here so the same bytes key the cache and feed the webhook
+                    images = _fetch_images(file_urls)
+                    cache_key = ai_review_cache_service.key_for(
+                        [img.content for img in images], brief_snapshot, submission.content,
+                        task_title=task_title, project_name=project_name,
+                    )
+                    cached = ai_review_cache_service.lookup(cache_key) if cache_key else None
+
+                if cached is not None:
+                    logger.info("AI review cache hit: submission=%s — webhook skipped", submission.id)
+                else:
+                    webhook_resp = _send_submission_webhook(
+                        webhook_url=_webhook_url,
+                        webhook_secret=settings.N8N_WEBHOOK_SECRET or "",
                         task=task,
-                        raw_webhook_data=webhook_resp,
+                        submission=submission,
+                        submitted_by=submission.submitted_by,
                         employee_name=employee_name,
                         project_name=project_name,
+                        task_title=task_title,
+                        brief_snapshot=brief_snapshot,
+                        file_urls=file_urls,
+                        images=images,
                     )
-                    db.commit()
-                    db.refresh(db_submission)
-
             except Exception as wh_err:
                 # Webhook failure must never block the submission
                 logger.error("Webhook dispatch error (submission saved): %s", wh_err)
@@ -545,24 +775,46 @@ class SubmissionService:
             logger.warning(
                 "SUBMISSION_REVIEW_WEBHOOK_URL / N8N_WORK_SUBMISSION_WEBHOOK not configured — "
                 "submission %s saved locally (status=pending).",
-                db_submission.id,
+                submission.id,
             )
 
-        if task and task.created_by and db_submission.submission_status == SubmissionStatus.pending:
-            notification_service.create(
-                db,
-                user_id=task.created_by,
-                title=f"Work submitted — {task_title}",
-                notification_type=NotificationType.work_submitted,
-                body=(
-                    f"{employee_name} submitted work on task '{task_title}' "
-                    f"in project '{project_name}'. Awaiting validation."
-                ),
-                task_id=task.id,
-                project_id=task.project_id,
-            )
+        # AI verdict and the resulting notifications commit together
+        try:
+            with unit_of_work(db):
+                if cached is not None:
+                    normalized, raw_response = cached
+                    submission.webhook_response = raw_response
+                    _apply_ai_result(db, submission, task, normalized, employee_name, project_name)
+                    applied = True
+                elif webhook_resp is not None:
+                    normalized = _apply_webhook_response(
+                        db=db,
+                        submission=submission,
+                        task=task,
+                        raw_webhook_data=webhook_resp,
+                        employee_name=employee_name,
+                        project_name=project_name,
+                    )
+                    applied = normalized is not None
+                    if applied and cache_key is not None:
+                        ai_review_cache_service.store(db, cache_key, normalized, submission.webhook_response)
+                if job_attempt in (None, 1):
+                    _notify_if_pending(db, submission, task, employee_name, project_name, task_title)
+        except Exception as apply_err:
+            logger.error("Could not apply webhook response (submission saved): %s", apply_err)
+            applied = False
+            if job_attempt in (None, 1):
+                _notify_if_pending(db, submission, task, employee_name, project_name, task_title)
+        _review_metrics.observe(time.perf_counter() - started)
+        if job_attempt is not None and not applied:
+            raise ReviewNotObtained(f"No AI verdict for submission {submission.id}")
 
-        return db_submission
+    @staticmethod
+    def get_review_metrics() -> dict:
+        return {
+            "review": _review_metrics.snapshot(),
+            "renditions": review_image_service.get_metrics(),
+        }
 
     @staticmethod
     def get_submissions_for_task(db: Session, task_id: UUID) -> list[TaskSubmission]:
@@ -600,15 +852,15 @@ class SubmissionService:
         if feedback:
             webhook_data["feedback"] = feedback
 
-        _apply_webhook_response(
-            db=db,
-            submission=submission,
-            task=task,
-            raw_webhook_data=webhook_data,
-            employee_name=employee_name,
-            project_name=project_name,
-        )
-        db.commit()
+        with unit_of_work(db):
+            _apply_webhook_response(
+                db=db,
+                submission=submission,
+                task=task,
+                raw_webhook_data=webhook_data,
+                employee_name=employee_name,
+                project_name=project_name,
+            )
         db.refresh(submission)
         return submission
 
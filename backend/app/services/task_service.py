@@ -1,8 +1,10 @@
+import uuid
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 from uuid import UUID
 from typing import List, Optional
 
+from app.db.session import unit_of_work
 from app.models.task import Task, TaskStatus, TaskSubmission, TaskFeedback
 from app.models.project import Project
 from app.models.notification import NotificationType
@@ -15,31 +17,31 @@ from app.services.activity_service import activity_service
 class TaskService:
     @staticmethod
     def create_task(db: Session, task_in: TaskCreate, created_by: UUID) -> Task:
-        db_task = Task(
-            **task_in.model_dump(exclude={"assigned_to", "assignee_ids"}),
-            created_by=created_by,
-            assigned_to=task_in.assigned_to,
-        )
-        db.add(db_task)
-        db.flush()
-        
-        # Log activity
-        activity_service.create_log(db, user_id=created_by, action="create_task", entity_type="task", entity_id=db_task.id, details={"title": db_task.title})
-        db.commit()
-        db.refresh(db_task)
-
-        # Notify assigned employee
-        if db_task.assigned_to:
-            notification_service.create(
-                db,
-                user_id=db_task.assigned_to,
-                title="New task assigned",
-                notification_type=NotificationType.task_assigned,
-                body=f"You have been assigned to: {db_task.title}",
-                task_id=db_task.id,
-                project_id=db_task.project_id,
+        with unit_of_work(db):
+            db_task = Task(
+                **task_in.model_dump(exclude={"assigned_to", "assignee_ids"}),
+                id=uuid.uuid4(),
+                created_by=created_by,
+                assigned_to=task_in.assigned_to,
             )
+            db.add(db_task)
+
+            # Log activity
+            activity_service.create_log(db, user_id=created_by, action="create_task", entity_type="task", entity_id=db_task.id, details={"title": db_task.title})
 
+            # Notify assigned employee
+            if db_task.assigned_to:
+                notification_service.create(
+                    db,
+                    user_id=db_task.assigned_to,
+                    title="New task assigned",
+                    notification_type=NotificationType.task_assigned,
+                    body=f"You have been assigned to: {db_task.title}",
+                    task_id=db_task.id,
+                    project_id=db_task.project_id,
+                )
+
+        db.refresh(db_task)
         return db_task
 
     @staticmethod
@@ -79,32 +81,31 @@ class TaskService:
     @staticmethod
     def update_task(db: Session, db_task: Task, task_in: TaskUpdate) -> Task:
         old_assigned = db_task.assigned_to
-        update_data = task_in.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_task, field, value)
-        
-        # Log activity
-        log_data = task_in.model_dump(exclude_unset=True, mode='json')
-        activity_service.create_log(db, user_id=db_task.created_by, action="update_task", entity_type="task", entity_id=db_task.id, details=log_data)
-        
-        db.commit()
-        db.refresh(db_task)
-
-        # Notify if newly assigned
-        if (
-            task_in.assigned_to is not None
-            and task_in.assigned_to != old_assigned
-        ):
-            notification_service.create(
-                db,
-                user_id=task_in.assigned_to,
-                title="Task assigned to you",
-                notification_type=NotificationType.task_assigned,
-                body=f"You have been assigned to task: {db_task.title}",
-                task_id=db_task.id,
-                project_id=db_task.project_id,
-            )
+        with unit_of_work(db):
+            update_data = task_in.model_dump(exclude_unset=True)
+            for field, value in update_data.items():
+                setattr(db_task, field, value)
+
+            # Log activity
+            log_data = task_in.model_dump(exclude_unset=True, mode='json')
+            activity_service.create_log(db, user_id=db_task.created_by, action="update_task", entity_type="task", entity_id=db_task.id, details=log_data)
+
+            # Notify if newly assigned
+            if (
+                task_in.assigned_to is not None
+                and task_in.assigned_to != old_assigned
+            ):
+                notification_service.create(
+                    db,
+                    user_id=task_in.assigned_to,
+                    title="Task assigned to you",
+                    notification_type=NotificationType.task_assigned,
+                    body=f"You have been assigned to task: {db_task.title}",
+                    task_id=db_task.id,
+                    project_id=db_task.project_id,
+                )
 
+        db.refresh(db_task)
         return db_task
 
     @staticmethod
@@ -144,6 +145,20 @@ class TaskService:
         if not submission:
             return None
 
+        with unit_of_work(db):
+            TaskService._apply_ai_review(db, submission, score, feedback, manager_id)
+
+        db.refresh(submission)
+        return submission
+
+    @staticmethod
+    def _apply_ai_review(
+        db: Session,
+        submission: TaskSubmission,
+        score: float,
+        feedback: str,
+        manager_id: UUID,
+    ) -> None:
         submission.ai_score = score
         submission.ai_feedback = feedback
 
@@ -177,40 +192,35 @@ class TaskService:
                     project_id=task.project_id,
                 )
 
-        db.commit()
-        db.refresh(submission)
-        return submission
-
     @staticmethod
     def send_feedback(db: Session, feedback_in: TaskFeedbackCreate, sent_by: UUID) -> TaskFeedback:
-        db_feedback = TaskFeedback(
-            task_id=feedback_in.task_id,
-            submission_id=feedback_in.submission_id,
-            sent_by=sent_by,
-            sent_to=feedback_in.sent_to,
-            message=feedback_in.message,
-            is_revision_request=feedback_in.is_revision_request,
-        )
-        db.add(db_feedback)
-
-        task = db.query(Task).filter(Task.id == feedback_in.task_id).first()
-        if feedback_in.is_revision_request and task:
-            task.status = TaskStatus.revision_requested
+        with unit_of_work(db):
+            db_feedback = TaskFeedback(
+                task_id=feedback_in.task_id,
+                submission_id=feedback_in.submission_id,
+                sent_by=sent_by,
+                sent_to=feedback_in.sent_to,
+                message=feedback_in.message,
+                is_revision_request=feedback_in.is_revision_request,
+            )
+            db.add(db_feedback)
 
-        db.commit()
-        db.refresh(db_feedback)
+            task = db.query(Task).filter(Task.id == feedback_in.task_id).first()
+            if feedback_in.is_revision_request and task:
+                task.status = TaskStatus.revision_requested
 
-        # Notify the employee
-        notification_service.create(
-            db,
-            user_id=feedback_in.sent_to,
-            title="Modification request from manager",
-            notification_type=NotificationType.revision_requested,
-            body=feedback_in.message[:200],
-            task_id=feedback_in.task_id,
-            project_id=task.project_id if task else None,
-        )
+            # Notify the employee
+            notification_service.create(
+                db,
+                user_id=feedback_in.sent_to,
+                title="Modification request from manager",
+                notification_type=NotificationType.revision_requested,
+                body=feedback_in.message[:200],
+                task_id=feedback_in.task_id,
+                project_id=task.project_id if task else None,
+            )
 
+        db.refresh(db_feedback)
         return db_feedback
 
     @staticmethod
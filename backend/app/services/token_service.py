@@ -0,0 +1,205 @@
+"""
+services/token_service.py
+─────────────────────────
+Verification of Supabase access tokens for get_current_user.
+
+Resolution order for a bearer token:
+  1. Validated-token cache (keyed by SHA-256 of the token, bounded by the
+     token's own `exp`) — no crypto, no network.
+  2. Local verification — HS256 against SUPABASE_JWT_SECRET, or RS256/ES256
+     against the project's JWKS (fetched once and cached). An unknown kid
+     triggers at most one refetch per AUTH_JWKS_MIN_REFRESH_SECONDS, and a
+     kid still missing afterwards is remembered as unknown for that long, so
+     forged tokens cannot turn requests into JWKS fetches. One thread
+     refreshes the key set while the others keep verifying against the
+     current one; only the first fetch, and lookups of an unknown kid, wait
+     for it.
+  3. Remote verification via supabase.auth.get_user() — only when the token
+     cannot be checked locally and AUTH_REMOTE_FALLBACK is enabled.
+
+Expired tokens are rejected locally and never reach Supabase.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Optional
+
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError, JWTError
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.services.http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+_ASYMMETRIC_ALGS = {"RS256", "ES256"}
+
+
+class TokenVerificationError(Exception):
+    """Token is definitively invalid (bad signature, expired, malformed)."""
+
+
+class _LocalKeyUnavailable(Exception):
+    """No key is available to verify this token locally."""
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _seconds_until_exp(claims: dict) -> Optional[float]:
+    exp = claims.get("exp")
+    if exp is None:
+        return None
+    try:
+        return float(exp) - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenService:
+    def __init__(self):
+        self._cache = TTLCache(
+            maxsize=settings.AUTH_TOKEN_CACHE_SIZE,
+            ttl=settings.AUTH_TOKEN_CACHE_TTL_SECONDS,
+        )
+        self._jwks: dict[str, dict] = {}
+        self._jwks_fetched_at = 0.0
+        self._jwks_refresh = threading.Lock()  # held by the one thread fetching
+        self._unknown_kids = TTLCache(maxsize=1024, ttl=settings.AUTH_JWKS_MIN_REFRESH_SECONDS)
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def verify(self, token: str) -> tuple[str, str]:
+        """Return (supabase_user_id, email) or raise TokenVerificationError."""
+        key = _token_key(token)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        claims: Optional[dict] = None
+        if settings.AUTH_LOCAL_JWT_VERIFY:
+            try:
+                claims = self._verify_locally(token)
+            except _LocalKeyUnavailable as exc:
+                logger.debug("[AUTH] Local verification unavailable: %s", exc)
+            except ExpiredSignatureError:
+                raise TokenVerificationError("Token has expired")
+            except JWTError as exc:
+                if not settings.AUTH_REMOTE_FALLBACK:
+                    raise TokenVerificationError(str(exc))
+                logger.warning("[AUTH] Local verification failed (%s) — trying Supabase", exc)
+
+        if claims is not None:
+            identity = (str(claims["sub"]), claims.get("email") or "")
+            ttl = _seconds_until_exp(claims)
+        else:
+            if not settings.AUTH_REMOTE_FALLBACK:
+                raise TokenVerificationError("Token cannot be verified locally")
+            identity = self._verify_remotely(token)
+            try:
+                ttl = _seconds_until_exp(jwt.get_unverified_claims(token))
+            except JWTError:
+                ttl = None
+
+        self._cache.set(key, identity, ttl)
+        return identity
+
+    def invalidate(self, token: str) -> None:
+        self._cache.pop(_token_key(token))
+
+    def cache_stats(self) -> dict:
+        return self._cache.stats()
+
+    # ── Local verification ────────────────────────────────────────────────────
+
+    def _verify_locally(self, token: str) -> dict:
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as exc:
+            raise TokenVerificationError(f"Malformed token: {exc}")
+
+        alg = header.get("alg")
+        if alg == "HS256":
+            if not settings.SUPABASE_JWT_SECRET:
+                raise _LocalKeyUnavailable("SUPABASE_JWT_SECRET not configured")
+            key = settings.SUPABASE_JWT_SECRET
+        elif alg in _ASYMMETRIC_ALGS:
+            key = self._get_signing_key(header.get("kid"))
+        else:
+            raise _LocalKeyUnavailable(f"unsupported alg {alg!r}")
+
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=[alg],
+            audience=settings.AUTH_JWT_AUDIENCE,
+        )
+        if not claims.get("sub"):
+            raise JWTError("Token has no subject")
+        return claims
+
+    def _get_signing_key(self, kid: Optional[str]) -> dict:
+        if not kid:
+            raise _LocalKeyUnavailable("token header has no kid")
+        if self._unknown_kids.contains(kid):
+            raise _LocalKeyUnavailable(f"kid {kid!r} not in JWKS")
+        key = self._jwks_lookup(kid, refresh=False)
+        if key is None:
+            # Unknown kid — keys may have rotated since the last fetch
+            key = self._jwks_lookup(kid, refresh=True)
+        if key is None:
+            self._unknown_kids.set(kid, True)
+            raise _LocalKeyUnavailable(f"kid {kid!r} not in JWKS")
+        return key
+
+    def _jwks_lookup(self, kid: str, *, refresh: bool) -> Optional[dict]:
+        # Without keys, or looking for a new kid, wait for an in-flight fetch;
+        # otherwise keep using the current keys while another thread refreshes
+        if self._jwks_due(refresh) and self._jwks_refresh.acquire(blocking=refresh or not self._jwks_fetched_at):
+            try:
+                if self._jwks_due(refresh):  # not already done by the thread we waited for
+                    self._fetch_jwks()
+            finally:
+                self._jwks_refresh.release()
+        return self._jwks.get(kid)
+
+    def _jwks_due(self, refresh: bool) -> bool:
+        if not self._jwks_fetched_at:
+            return True
+        age = time.monotonic() - self._jwks_fetched_at
+        return age > settings.AUTH_JWKS_TTL_SECONDS or (refresh and age >= settings.AUTH_JWKS_MIN_REFRESH_SECONDS)
+
+    def _fetch_jwks(self) -> None:
+        url = f"{settings.SUPABASE_URL.rstrip('/')}/auth/v1/.well-known/jwks.json"
+        try:
+            resp = http_client.get("supabase-auth", url, headers={"apikey": settings.SUPABASE_ANON_KEY}, timeout=5)
+            resp.raise_for_status()
+            keys = resp.json().get("keys", [])
+        except Exception as exc:
+            # Keep serving the previous key set; retry on the next TTL window
+            logger.warning("[AUTH] JWKS fetch failed: %s", exc)
+            self._jwks_fetched_at = time.monotonic()
+            return
+        self._jwks = {k["kid"]: k for k in keys if isinstance(k, dict) and k.get("kid")}
+        self._jwks_fetched_at = time.monotonic()
+        logger.info("[AUTH] JWKS refreshed — %d key(s)", len(self._jwks))
+
+    # ── Remote verification ───────────────────────────────────────────────────
+
+    @staticmethod
+    def _verify_remotely(token: str) -> tuple[str, str]:
+        from app.services.supabase_client import supabase
+        try:
+            response = supabase.auth.get_user(token)
+            return str(response.user.id), response.user.email or ""
+        except Exception as exc:
+            raise TokenVerificationError(str(exc))
+
+
+token_service = TokenService()
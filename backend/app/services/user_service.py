@@ -1,4 +1,7 @@
 import logging
+from typing import Optional
+from uuid import UUID
+
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
@@ -6,10 +9,17 @@ from fastapi import HTTPException
 
 from app.services.supabase_client import supabase, supabase_admin
 from app.core.security import get_password_hash
+from app.core.cache import TTLCache
+from app.core.config import settings
 
 
 logger = logging.getLogger(__name__)
 
+# Supabase auth id → local users.id.  A cached None is a negative entry
+# (no local profile yet) and lives only AUTH_IDENTITY_NEGATIVE_TTL_SECONDS.
+_identity_cache = TTLCache(maxsize=8192, ttl=settings.AUTH_IDENTITY_CACHE_TTL_SECONDS)
+_MISS = object()
+
 
 class UserService:
     # Expose the shared clients so other modules can import via user_service
@@ -20,6 +30,50 @@ class UserService:
     def get_user_by_email(db: Session, email: str):
         return db.query(User).filter(User.email == email).first()
 
+    @staticmethod
+    def resolve_auth_user(db: Session, supabase_id: str, email: str) -> Optional[User]:
+        """Resolve a local User from a Supabase auth identity.
+
+        Primary lookup is by UUID (fast, correct for all users created after the
+        Supabase auth migration).  If that misses, fall back to email lookup so
+        that pre-migration users — whose local `users.id` was generated independently
+        and does not match their Supabase auth UUID — are still resolved correctly
+        after a password reset or token refresh.
+
+        Both outcomes are cached per Supabase id, so a warm request costs a
+        single primary-key lookup (or none at all for a known-missing user).
+        """
+        cached = _identity_cache.get(supabase_id, _MISS)
+        if cached is None:
+            return None
+        if cached is not _MISS:
+            user = db.get(User, cached)
+            if user:
+                return user
+            _identity_cache.pop(supabase_id)
+
+        user = db.query(User).filter(User.id == UUID(supabase_id)).first()
+        if not user and email:
+            logger.info("[AUTH] UUID lookup miss for %s, trying email fallback (%s)", supabase_id, email)
+            user = db.query(User).filter(User.email == email).first()
+            if user:
+                logger.info("[AUTH] Resolved user by email — local_id=%s, supabase_id=%s", user.id, supabase_id)
+            else:
+                logger.warning("[AUTH] Email fallback also missed for %s", email)
+
+        if user:
+            _identity_cache.set(supabase_id, user.id)
+        else:
+            _identity_cache.set(supabase_id, None, settings.AUTH_IDENTITY_NEGATIVE_TTL_SECONDS)
+        return user
+
+    @staticmethod
+    def invalidate_identity(user_id) -> None:
+        """Forget every cached Supabase id that resolves to this local user,
+        and any negative entry recorded under the same id."""
+        _identity_cache.pop(str(user_id))
+        _identity_cache.discard_value(user_id if isinstance(user_id, UUID) else UUID(str(user_id)))
+
     @staticmethod
     def create_user(db: Session, user_in: UserCreate):
         logger.info("[SIGNUP] New registration request for: %s", user_in.email)
@@ -100,6 +154,7 @@ class UserService:
                 db.add(new_db_user)
                 db.commit()
                 db.refresh(new_db_user)
+                UserService.invalidate_identity(new_db_user.id)
                 logger.info("[SIGNUP] Local profile saved.")
             except Exception as db_err:
                 logger.error("[SIGNUP] DB insert failed: %s", db_err)
@@ -129,6 +184,14 @@ class UserService:
             setattr(db_user, field, value)
         db.commit()
         db.refresh(db_user)
+        UserService.invalidate_identity(db_user.id)
+        return db_user
+
+    @staticmethod
+    def deactivate_user(db: Session, db_user: User) -> User:
+        db_user.is_active = False
+        db.commit()
+        UserService.invalidate_identity(db_user.id)
         return db_user
 
 
@@ -0,0 +1,200 @@
+"""
+services/watermark_service.py
+─────────────────────────────
+In-process watermark engine, the alternative to the n8n watermark workflow.
+
+With WATERMARK_ENGINE=local, deliver_task_watermark does not post to
+WATERMARK_WEBHOOK_URL and wait for one of the callback endpoints. Instead:
+
+  1. The approved submission's first image is streamed in, refusing
+     sources over WATERMARK_SOURCE_MAX_BYTES.
+  2. A preview is rendered in a process pool: downscaled to
+     WATERMARK_MAX_EDGE, with WATERMARK_TEXT tiled diagonally across it at
+     WATERMARK_OPACITY, and saved as JPEG.
+  3. The preview goes through image_callback_service.process_image_callback
+     with the pending WorkflowImageCallback token. The upload, the
+     submission paths and the record status are therefore exactly what an
+     n8n binary callback would produce.
+
+Delivery runs inside the request, so the download and the render share one
+WATERMARK_TIMEOUT_SECONDS budget. If the engine fails (Pillow missing,
+oversized or undecodable image, budget spent), delivery falls back to the
+n8n webhook when one is configured.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+try:
+    from PIL import Image, ImageDraw, ImageFont, ImageOps
+except ImportError:  # optional dependency
+    Image = ImageDraw = ImageFont = ImageOps = None
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import LatencyRecorder
+from app.core.process_pool import SpawnPool
+from app.models.task import TaskSubmission
+from app.models.workflow_image_callback import WorkflowImageCallback
+from app.services.http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+_SOURCE_ENDPOINT = "watermark-source"
+_STREAM_CHUNK = 64 * 1024
+_TILE_ANGLE = 30
+
+
+def _font(size: int):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1: fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+def _render_watermark(content: bytes, text: str, max_edge: int, opacity: int, quality: int) -> bytes:
+    """Runs in a pool process: one watermarked JPEG preview from the original image."""
+    with Image.open(io.BytesIO(content)) as source:
+        image = ImageOps.exif_transpose(source)
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        image = image.convert("RGBA")
+
+    width, height = image.size
+    font_size = max(12, min(width, height) // 12)
+    font = _font(font_size)
+    # Light text with a dark outline stays visible on both light and dark areas
+    stroke = max(1, font_size // 24)
+    left, top, right, bottom = ImageDraw.Draw(image).textbbox((0, 0), text, font=font, stroke_width=stroke)
+    text_w, text_h = right - left, bottom - top
+
+    # One rotated stamp, pasted on a staggered grid over the whole image
+    stamp = Image.new("RGBA", (text_w + 4, text_h + 4), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(stamp)
+    draw.text(
+        (2 - left, 2 - top), text, font=font,
+        fill=(255, 255, 255, opacity), stroke_width=stroke, stroke_fill=(0, 0, 0, opacity),
+    )
+    stamp = stamp.rotate(_TILE_ANGLE, expand=True, resample=Image.BICUBIC)
+
+    overlay = Image.new("RGBA", image.size, (0, 0, 0, 0))
+    step_x, step_y = stamp.width + text_h * 2, stamp.height + text_h
+    for row, y in enumerate(range(-stamp.height, height + stamp.height, step_y)):
+        shift = (step_x // 2) * (row % 2)
+        for x in range(-stamp.width + shift, width + stamp.width, step_x):
+            overlay.paste(stamp, (x, y), stamp)  # stamps never overlap
+
+    out = io.BytesIO()
+    Image.alpha_composite(image, overlay).convert("RGB").save(out, format="JPEG", quality=quality, optimize=True)
+    return out.getvalue()
+
+
+class WatermarkService:
+    def __init__(self):
+        self.metrics = LatencyRecorder()
+        self._pool = SpawnPool(lambda: settings.WATERMARK_WORKERS)
+
+    @staticmethod
+    def enabled() -> bool:
+        return settings.WATERMARK_ENGINE.lower() == "local" and Image is not None
+
+    def render(self, content: bytes, *, timeout: Optional[float] = None) -> bytes:
+        """Watermarked JPEG preview of `content`. Raises on any failure."""
+        started = time.perf_counter()
+        future = self._pool.submit(
+            _render_watermark,
+            content,
+            settings.WATERMARK_TEXT,
+            settings.WATERMARK_MAX_EDGE,
+            settings.WATERMARK_OPACITY,
+            settings.WATERMARK_QUALITY,
+        )
+        try:
+            preview = future.result(timeout=settings.WATERMARK_TIMEOUT_SECONDS if timeout is None else timeout)
+        except BrokenProcessPool:
+            self._pool.reset()
+            raise
+        self.metrics.observe(time.perf_counter() - started)
+        self.metrics.incr("bytes_in", len(content))
+        self.metrics.incr("bytes_out", len(preview))
+        return preview
+
+    @staticmethod
+    def _download(url: str, deadline: float) -> bytes:
+        """Stream the source image in, within WATERMARK_SOURCE_MAX_BYTES and the deadline."""
+        limit = settings.WATERMARK_SOURCE_MAX_BYTES
+        timeout = max(0.1, min(30.0, deadline - time.perf_counter()))
+        with http_client.get(_SOURCE_ENDPOINT, url, timeout=timeout, stream=True) as resp:
+            resp.raise_for_status()
+            length = resp.headers.get("Content-Length")
+            if length and length.isdigit() and int(length) > limit:
+                raise ValueError(f"source image is {length} bytes, over the {limit}-byte limit")
+            content = bytearray()
+            # read1 returns what has arrived, so a trickling source cannot hold a
+            # read open past the deadline the way a full 64 KiB read would
+            for chunk in iter(lambda: resp.raw.read1(_STREAM_CHUNK, decode_content=True), b""):
+                content += chunk
+                if len(content) > limit:
+                    raise ValueError(f"source image is over the {limit}-byte limit")
+                if time.perf_counter() > deadline:
+                    raise TimeoutError("source download ran past WATERMARK_TIMEOUT_SECONDS")
+        return bytes(content)
+
+    def deliver(self, db: Session, record: WorkflowImageCallback, submission: TaskSubmission) -> bool:
+        """Render and store the preview for a pending callback record.
+
+        Returns True when the record was completed, False (logged) otherwise.
+        A record that never reached the upload is marked failed, uncommitted.
+        Download and render together take at most WATERMARK_TIMEOUT_SECONDS.
+        """
+        from app.services.image_callback_service import image_callback_service
+
+        source_url = (submission.file_paths or [None])[0]
+        if not source_url:
+            return False
+        deadline = time.perf_counter() + settings.WATERMARK_TIMEOUT_SECONDS
+        try:
+            content = self._download(source_url, deadline)
+            preview = self.render(content, timeout=max(0.0, deadline - time.perf_counter()))
+            image_callback_service.process_image_callback(
+                db,
+                token=record.callback_token,
+                image_file=io.BytesIO(preview),
+                content_type="image/jpeg",
+            )
+        except Exception as e:
+            self.metrics.incr("failed")
+            if record.status == "pending_image":
+                # Nothing will ever call back on a local token; don't leave it pending
+                record.status = "failed"
+                record.error_message = f"Local watermark failed: {e}"
+            logger.error(
+                "[Watermark] Local render failed  submission_id=%s  error=%s",
+                submission.id, e,
+            )
+            return False
+        self.metrics.incr("delivered")
+        logger.info(
+            "[Watermark] Preview delivered locally  submission_id=%s  bytes=%d",
+            submission.id, len(preview),
+        )
+        return True
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def get_metrics(self) -> dict:
+        return {
+            "engine": settings.WATERMARK_ENGINE,
+            "enabled": self.enabled(),
+            "pillow_available": Image is not None,
+            **self.metrics.snapshot(),
+        }
+
+
+watermark_service = WatermarkService()
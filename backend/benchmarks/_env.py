@@ -0,0 +1,22 @@
+"""Throwaway settings so app modules import without a real environment."""
+
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='pfe-bench-')}/bench.db")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench")
+
+
+def rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:,.0f}/s" if seconds > 0 else "n/a"
+
+
+def percentiles(samples: list[float]) -> str:
+    """p50/p99 of per-call durations (seconds), in milliseconds."""
+    ordered = sorted(samples)
+
+    def at(pct: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1000
+
+    return f"p50 {at(50):.3f} ms, p99 {at(99):.3f} ms"
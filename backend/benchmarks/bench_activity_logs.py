@@ -0,0 +1,81 @@
+"""Activity log page latency by depth: OFFSET paging vs the (created_at, id) keyset cursor (user-008).
+
+Seeds activity_logs with ROWS rows (default 1,000,000; pass another count as
+the first argument) in the benchmark database, then fetches a 50-row page
+at increasing depths both ways through ActivityService.get_logs_page.
+Set DATABASE_URL to a PostgreSQL database to measure there instead of SQLite.
+"""
+
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import benchmarks._env  # noqa: F401  (throwaway settings before app imports)
+
+PAGE = 50
+BATCH = 20000
+
+
+def _seed(engine, rows: int) -> None:
+    from sqlalchemy import insert
+
+    from app.models.activity import ActivityLog
+
+    users = [uuid.uuid4() for _ in range(50)]
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as conn:
+        for offset in range(0, rows, BATCH):
+            conn.execute(insert(ActivityLog), [
+                {
+                    "id": uuid.uuid4(), "user_id": users[i % 50], "action": "update_task",
+                    "entity_type": "task", "entity_id": uuid.uuid4(),
+                    "created_at": start + timedelta(seconds=i),
+                }
+                for i in range(offset, min(rows, offset + BATCH))
+            ])
+
+
+def _ms(call) -> float:
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    from app.db.session import SessionLocal, engine
+    from app.models import user  # noqa: F401  (target of activity_logs.user_id)
+    from app.models.activity import ActivityLog
+    from app.services.activity_service import activity_service, encode_cursor
+
+    ActivityLog.__table__.drop(engine, checkfirst=True)
+    ActivityLog.__table__.create(engine)
+    started = time.perf_counter()
+    _seed(engine, rows)
+    print(f"seeded {rows:,} rows in {time.perf_counter() - started:.1f}s")
+
+    db = SessionLocal()
+    try:
+        print(f"{'depth':>10} {'OFFSET':>12} {'keyset':>12}")
+        for depth in (0, 1_000, 100_000, rows // 2, rows - PAGE):
+            if depth > rows - PAGE:
+                continue
+            before = (
+                db.query(ActivityLog)
+                .order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc())
+                .offset(depth - 1).limit(1).one()
+            ) if depth else None
+            cursor = encode_cursor(before) if before else None
+            offset_ms = _ms(lambda: activity_service.get_logs_page(db, limit=PAGE, skip=depth))
+            keyset_ms = _ms(lambda: activity_service.get_logs_page(db, limit=PAGE, cursor=cursor))
+            print(f"{depth:>10,} {offset_ms:>10.2f}ms {keyset_ms:>10.2f}ms")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Auth latency per request: Supabase get_user round-trip vs local JWT verification (user-001).
+
+"Before" is the request supabase.auth.get_user() makes (GET /auth/v1/user
+with the bearer token) against a loopback stand-in, so it is a lower bound
+for a real Supabase round-trip. "After" is token_service.verify() on an
+RS256 token checked against the stand-in's JWKS: first with a fresh token
+each call (signature check), then the same token again (cache hit).
+"""
+
+import json
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler
+
+import requests
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from benchmarks._env import percentiles
+from tests.standins import serve_http
+
+COUNT = 1000
+
+_private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+# Parsed once: loading the PEM per token would dominate the run
+_SIGNING_KEY = jwk.construct(
+    _private.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+    ),
+    "RS256",
+)
+_PUBLIC_JWK = {
+    **jwk.construct(
+        _private.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo,
+        ),
+        "RS256",
+    ).to_dict(),
+    "kid": "bench",
+}
+
+
+class _Supabase(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # or delayed ACKs add ~40 ms per keep-alive response
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.endswith("/jwks.json"):
+            body = {"keys": [_PUBLIC_JWK]}
+        else:
+            body = {"id": str(uuid.uuid4()), "email": "bench@example.com"}
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _token() -> str:
+    claims = {"sub": str(uuid.uuid4()), "email": "bench@example.com", "aud": "authenticated",
+              "exp": int(time.time()) + 3600}
+    return jwt.encode(claims, _SIGNING_KEY, algorithm="RS256", headers={"kid": "bench"})
+
+
+def _timed(call, args) -> list[float]:
+    samples = []
+    for arg in args:
+        started = time.perf_counter()
+        call(arg)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main() -> None:
+    with serve_http(_Supabase) as url:
+        from app.core.config import settings
+        from app.services.token_service import TokenService
+
+        settings.SUPABASE_URL = url
+        tokens = [_token() for _ in range(COUNT)]
+
+        session = requests.Session()
+        remote = _timed(
+            lambda token: session.get(
+                f"{url}/auth/v1/user", headers={"Authorization": f"Bearer {token}", "apikey": "bench"},
+            ).json(),
+            tokens,
+        )
+
+        service = TokenService()
+        service.verify(_token())  # first call fetches the JWKS
+        local = _timed(service.verify, tokens)
+        cached = _timed(service.verify, tokens)
+
+    print(f"remote get_user (loopback): {percentiles(remote)}")
+    print(f"local RS256 verify:         {percentiles(local)}")
+    print(f"validated-token cache hit:  {percentiles(cached)}")
+
+
+if __name__ == "__main__":
+    main()
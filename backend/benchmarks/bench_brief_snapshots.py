@@ -0,0 +1,93 @@
+"""Brief snapshot storage and submission-list cost (user-016).
+
+Seeds PROJECTS projects with ATTEMPTS submissions each, every attempt on a
+project carrying the same ~4.6 KB brief, then reports:
+  • bytes the per-submission text column held vs the brief_snapshots rows
+    plus the 64-character hash reference on each submission;
+  • one task's submission list serialised with the brief (selectinload +
+    SubmissionRead, the previous list shape) vs without (SubmissionShortRead).
+"""
+
+import json
+import time
+import uuid
+
+import benchmarks._env  # noqa: F401  (throwaway settings before app imports)
+from benchmarks._env import percentiles
+
+PROJECTS = 50
+ATTEMPTS = 8
+LISTS = 500
+
+
+def _brief(project: int) -> str:
+    lines = [f"Brief for project {project}: refresh the brand for the spring launch."]
+    lines += [f"Q{n}: {'What should the design communicate? ' * 2}\nA{n}: {f'Answer {project}-{n}, warm and playful. ' * 3}" for n in range(20)]
+    return "\n".join(lines)
+
+
+def main() -> None:
+    from sqlalchemy import func
+    from sqlalchemy.orm import selectinload
+
+    from app.db.session import Base, SessionLocal, engine
+    from app.models.brief_snapshot import BriefSnapshot
+    from app.models.project import Project
+    from app.models.task import Task, TaskSubmission
+    from app.models.user import User, UserRole
+    from app.schemas.submission import SubmissionRead, SubmissionShortRead
+    from app.services.brief_snapshot_service import brief_snapshot_service
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    manager = User(id=uuid.uuid4(), email=f"m-{uuid.uuid4().hex[:6]}@example.com", full_name="m", role=UserRole.manager)
+    db.add(manager)
+    db.flush()
+    text_bytes = 0
+    for p in range(PROJECTS):
+        project = Project(name=f"P{p}", manager_id=manager.id)
+        db.add(project)
+        db.flush()
+        task = Task(project_id=project.id, title="Design", created_by=manager.id)
+        db.add(task)
+        db.flush()
+        brief = _brief(p)
+        for a in range(ATTEMPTS):
+            text_bytes += len(brief.encode())
+            db.add(TaskSubmission(
+                task_id=task.id, submitted_by=manager.id, attempt_number=a + 1, content="done",
+                brief_snapshot_hash=brief_snapshot_service.intern(db, brief),
+            ))
+    db.commit()
+
+    rows, data_bytes = db.query(func.count(), func.sum(func.length(BriefSnapshot.data))).one()
+    stored = data_bytes + PROJECTS * ATTEMPTS * 64
+    print(f"{PROJECTS * ATTEMPTS} submissions, {rows} distinct briefs")
+    print(f"per-submission text: {text_bytes:,} bytes")
+    print(
+        f"brief_snapshots:     {data_bytes:,} bytes + {PROJECTS * ATTEMPTS * 64:,} bytes of hash references "
+        f"({(1 - stored / text_bytes) * 100:.1f}% reclaimed)"
+    )
+
+    task_id = db.query(Task.id).first()[0]
+    db.close()
+    for name, schema, options in (
+        ("with brief (previous list)", SubmissionRead, [selectinload(TaskSubmission.brief_snapshot_ref)]),
+        ("without brief (list today)", SubmissionShortRead, []),
+    ):
+        samples = []
+        for _ in range(LISTS):
+            started = time.perf_counter()
+            with SessionLocal() as session:
+                subs = (
+                    session.query(TaskSubmission).options(*options)
+                    .filter(TaskSubmission.task_id == task_id)
+                    .order_by(TaskSubmission.created_at.desc()).all()
+                )
+                body = json.dumps([schema.model_validate(s).model_dump(mode="json") for s in subs])
+            samples.append(time.perf_counter() - started)
+        print(f"list of {ATTEMPTS}, {name}: {len(body):,} bytes, {percentiles(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Submission image fetch wall time: sequential requests.get vs the concurrent pooled fetch (user-012)."""
+
+import time
+
+import requests
+
+import benchmarks._env  # noqa: F401  (throwaway settings before app imports)
+from tests.standins import ImageStandIn
+
+LATENCY = 0.05  # per-image storage round trip
+SIZE = 200_000
+
+
+def main() -> None:
+    from app.core.config import settings
+    from app.services.submission_service import _fetch_images
+
+    with ImageStandIn(latency=LATENCY) as images:
+        for count in (1, 5, 20):
+            urls = [images.url_for(SIZE, f"{i}.png") for i in range(count)]
+
+            started = time.perf_counter()
+            for url in urls:
+                # The pre-change behaviour: one bare request per image, in turn
+                requests.get(url, timeout=30).content
+            sequential = time.perf_counter() - started
+
+            started = time.perf_counter()
+            _fetch_images(urls)
+            concurrent = time.perf_counter() - started
+
+            print(
+                f"{count:>2} images: sequential {sequential * 1000:7.1f} ms, "
+                f"concurrent ({settings.SUBMISSION_IMAGE_FETCH_CONCURRENCY} workers) {concurrent * 1000:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
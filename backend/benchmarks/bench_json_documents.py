@@ -0,0 +1,99 @@
+"""Brief autosave and submission-list latency on JSON document columns (user-017).
+
+Autosave is measured two ways against a brief with ANSWERS saved fields:
+rewriting the whole saved_answers document through the ORM (the previous
+path) and merge_json_keys (the route today), with the dashboard cache
+invalidations each causes. The submission list is fetched through the API
+for a task with SUBMISSIONS reviewed submissions. Set DATABASE_URL to a
+PostgreSQL database to measure there instead of SQLite.
+"""
+
+import time
+import uuid
+
+import benchmarks._env  # noqa: F401  (throwaway settings before app imports)
+from benchmarks._env import percentiles
+
+ANSWERS = 200
+SAVES = 300
+SUBMISSIONS = 50
+LISTS = 200
+
+
+def _answer(key: str) -> dict:
+    return {"question": {"id": key, "label": f"Question {key}?", "type": "text", "options": []}, "answer": "x" * 120}
+
+
+def main() -> None:
+    from fastapi.testclient import TestClient
+    from sqlalchemy.orm import load_only
+
+    from app.api.deps import get_current_user
+    from app.db.session import Base, SessionLocal, engine
+    from app.db.types import merge_json_keys
+    from app.main import app
+    from app.models.project import BriefStatus, Project
+    from app.models.task import Task, TaskSubmission
+    from app.models.user import User, UserRole
+    from app.services.dashboard_service import dashboard_service
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal(expire_on_commit=False)  # `manager` stays usable as the API user
+    manager = User(id=uuid.uuid4(), email=f"m-{uuid.uuid4().hex[:6]}@example.com", full_name="m", role=UserRole.manager)
+    db.add(manager)
+    db.flush()
+    project = Project(
+        name="Bench", manager_id=manager.id, brief_status=BriefStatus.in_progress,
+        saved_answers={f"q{i}": _answer(f"q{i}") for i in range(ANSWERS)},
+    )
+    db.add(project)
+    db.flush()
+    task = Task(project_id=project.id, title="Bench", created_by=manager.id)
+    db.add(task)
+    db.flush()
+    for i in range(SUBMISSIONS):
+        db.add(TaskSubmission(
+            task_id=task.id, submitted_by=manager.id, attempt_number=i + 1, content="done",
+            file_paths=[f"https://cdn.example.com/{i}/{n}.png" for n in range(4)],
+            ai_analysis_result={"status": "aligns", "score": 80, "summary": "ok", "checks": [], "feedback": ["a"] * 5},
+            webhook_response={"status": "valid", "score": 80, "feedback": "fine " * 50},
+        ))
+    db.commit()
+    project_id, task_id = project.id, task.id
+    db.close()
+
+    def rewrite(key: str) -> None:
+        with SessionLocal() as session:
+            row = session.get(Project, project_id)
+            row.saved_answers = {**row.saved_answers, key: _answer(key)}
+            session.commit()
+
+    def merge(key: str) -> None:
+        with SessionLocal() as session:
+            row = session.get(Project, project_id, options=[load_only(Project.id, Project.brief_status)])
+            merge_json_keys(session, row, "saved_answers", {key: _answer(key)})
+            session.commit()
+
+    for name, save in (("whole-document rewrite", rewrite), ("merge_json_keys", merge)):
+        before = dashboard_service.metrics.snapshot().get("invalidated", 0)
+        samples = []
+        for i in range(SAVES):
+            started = time.perf_counter()
+            save(f"q{i % ANSWERS}")
+            samples.append(time.perf_counter() - started)
+        invalidated = dashboard_service.metrics.snapshot().get("invalidated", 0) - before
+        print(f"autosave, {name:<22}: {percentiles(samples)}, dashboard invalidations {invalidated}/{SAVES}")
+
+    app.dependency_overrides[get_current_user] = lambda: manager
+    client = TestClient(app)
+    samples = []
+    for _ in range(LISTS):
+        started = time.perf_counter()
+        response = client.get(f"/api/v1/submissions/{task_id}/")
+        samples.append(time.perf_counter() - started)
+        assert response.status_code == 200 and len(response.json()) == SUBMISSIONS, response.text[:300]
+    print(f"submission list ({SUBMISSIONS} rows, {len(response.content) / 1024:.0f} KB): {percentiles(samples)}")
+
+
+if __name__ == "__main__":
+    main()
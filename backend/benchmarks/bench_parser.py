@@ -0,0 +1,58 @@
+"""AI review response parsing, per corpus entry: the old inline parser vs parse_ai_response (user-019).
+
+"before" is the text path that lived in submission_service until user-019:
+three uncompiled re.sub calls and json.loads. "after" is parse_ai_response
+with the installed JSON backend, and "after (json)" the same with orjson
+switched off.
+"""
+
+import json
+import logging
+import re
+import time
+
+from benchmarks._env import rate
+from tests.ai_responses import CORPUS
+
+ROUNDS = 20000
+
+
+def _before(raw):
+    text = raw[0]["content"]["parts"][0]["text"].strip()
+    text = re.sub(r"^```json\s*", "", text)
+    text = re.sub(r"^```\s*", "", text)
+    text = re.sub(r"\s*```$", "", text)
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+def _timed(parse, raw) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        parse(raw)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    from app.services import ai_response_parser
+
+    logging.disable(logging.WARNING)  # the truncated sample logs a parse failure per call
+    print(f"{'response':<20} {'before':>12} {'after':>12} {'after (json)':>14}   backend={ai_response_parser.JSON_BACKEND}")
+    for name, raw in CORPUS.items():
+        before = _timed(_before, raw) if isinstance(raw, list) else None
+        after = _timed(ai_response_parser.parse_ai_response, raw)
+        loads, ai_response_parser._loads = ai_response_parser._loads, json.loads
+        try:
+            after_json = _timed(ai_response_parser.parse_ai_response, raw)
+        finally:
+            ai_response_parser._loads = loads
+        print(
+            f"{name:<20} {rate(ROUNDS, before) if before else '—':>12} "
+            f"{rate(ROUNDS, after):>12} {rate(ROUNDS, after_json):>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
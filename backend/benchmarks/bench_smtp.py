@@ -0,0 +1,41 @@
+"""E-mails per second: one SMTP session per message vs the pooled batch (user-004)."""
+
+import os
+import time
+
+from benchmarks._env import rate
+from tests.standins import SMTPStandIn
+
+COUNT = 300
+
+
+def main() -> None:
+    with SMTPStandIn() as server:
+        os.environ.update(
+            SMTP_SERVER="127.0.0.1", SMTP_PORT=str(server.port),
+            SMTP_USER="bench", SMTP_PASSWORD="bench", SMTP_STARTTLS="false",
+        )
+        from app.services.email_service import EmailService
+
+        batch = [(f"user{i}@example.com", "Subject", "body") for i in range(COUNT)]
+
+        service = EmailService()
+        started = time.perf_counter()
+        for email in batch:
+            # The pre-pool behaviour: connect, login, send, quit for every message
+            service.send_many([email])
+            service.close()
+        per_message = time.perf_counter() - started
+
+        service = EmailService()
+        started = time.perf_counter()
+        service.send_many(batch)
+        pooled = time.perf_counter() - started
+        service.close()
+
+    print(f"session per message: {rate(COUNT, per_message)}")
+    print(f"pooled batch:        {rate(COUNT, pooled)}")
+
+
+if __name__ == "__main__":
+    main()
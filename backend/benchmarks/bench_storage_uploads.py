@@ -0,0 +1,43 @@
+"""Uploads per second for 100 small files: bare requests.post vs the pooled storage client (user-021).
+
+The old create_client()-per-call path cannot be measured here without the
+Supabase SDK installed; the bare requests.post is the old upload_deliverable.
+"""
+
+import os
+import time
+
+import requests
+
+from benchmarks._env import rate
+from tests.standins import StorageStandIn
+
+COUNT = 100
+PAYLOAD = b"\x89PNG" + bytes(4 * 1024)
+
+
+def main() -> None:
+    with StorageStandIn() as stand_in:
+        os.environ["SUPABASE_URL"] = stand_in.url
+        from app.services.storage_service import storage_client
+
+        base = f"{stand_in.url}/storage/v1/object/bench"
+        headers = {"Authorization": "Bearer bench", "apikey": "bench", "Content-Type": "image/png"}
+
+        started = time.perf_counter()
+        for i in range(COUNT):
+            requests.post(f"{base}/bare/{i}.png", data=PAYLOAD, headers=headers, timeout=30).raise_for_status()
+        bare = time.perf_counter() - started
+        bare_connections = stand_in.connections
+
+        started = time.perf_counter()
+        for i in range(COUNT):
+            storage_client.upload("bench", f"pooled/{i}.png", PAYLOAD, "image/png")
+        pooled = time.perf_counter() - started
+
+    print(f"bare requests.post: {rate(COUNT, bare)} (connections opened: {bare_connections})")
+    print(f"pooled client:      {rate(COUNT, pooled)} (connections opened: {stand_in.connections - bare_connections})")
+
+
+if __name__ == "__main__":
+    main()
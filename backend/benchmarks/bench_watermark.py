@@ -0,0 +1,84 @@
+"""Local watermark delivery throughput by source image size (user-024).
+
+Each delivery streams the source from a local server, renders the preview in
+the process pool and hands it to the callback step (a no-op here, so the
+Storage upload is not measured). Run with Pillow installed.
+"""
+
+import io
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+from types import SimpleNamespace
+
+from PIL import Image
+
+import benchmarks._env  # noqa: F401  (throwaway settings before app imports)
+from tests.standins import serve_http
+
+SIZES = ((800, 600), (1920, 1080), (4000, 3000), (8000, 6000))
+COUNT = 12
+CONCURRENCY = 4
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    noise = Image.effect_noise((width, height), 40).convert("RGB")
+    out = io.BytesIO()
+    noise.save(out, format="JPEG", quality=90)
+    return out.getvalue()
+
+
+def main() -> None:
+    from app.core.config import settings
+    from app.services.image_callback_service import image_callback_service
+    from app.services.watermark_service import watermark_service
+
+    settings.WATERMARK_ENGINE = "local"
+    image_callback_service.process_image_callback = lambda db, **kwargs: None
+    sources = {f"/{w}x{h}.jpg": _jpeg(w, h) for w, h in SIZES}
+
+    class Source(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            body = sources[self.path]
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def deliver(url: str) -> None:
+        record = SimpleNamespace(callback_token="bench", status="pending_image", error_message=None)
+        assert watermark_service.deliver(None, record, SimpleNamespace(id=uuid.uuid4(), file_paths=[url]))
+
+    print(f"WATERMARK_WORKERS={settings.WATERMARK_WORKERS}, {COUNT} deliveries per size")
+    with serve_http(Source) as base:
+        with ThreadPoolExecutor(CONCURRENCY) as pool:  # start every pool worker
+            list(pool.map(deliver, [f"{base}{next(iter(sources))}"] * CONCURRENCY))
+        for path, body in sources.items():
+            url = f"{base}{path}"
+            started = time.perf_counter()
+            for _ in range(COUNT):
+                deliver(url)
+            sequential = time.perf_counter() - started
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(CONCURRENCY) as pool:
+                list(pool.map(deliver, [url] * COUNT))
+            concurrent = time.perf_counter() - started
+
+            print(
+                f"{path[1:-4]:>9} ({len(body) / 1e6:5.1f} MB): {sequential / COUNT * 1000:7.1f} ms each, "
+                f"{COUNT / sequential:5.1f}/s sequential, {COUNT / concurrent:5.1f}/s with {CONCURRENCY} requests at once"
+            )
+    watermark_service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Peak RSS of one review webhook by image size: buffered vs streamed relay (user-013).
+
+Each (mode, size) runs in a fresh interpreter so ru_maxrss is not carried
+over from a larger run.
+"""
+
+import resource
+import subprocess
+import sys
+import uuid
+from types import SimpleNamespace
+
+import benchmarks._env  # noqa: F401  (throwaway settings before app imports)
+
+MB = 1024 * 1024
+SIZES_MB = (1, 10, 50, 100, 200)
+
+
+def _max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def _run(mode: str, size: int) -> None:
+    from app.core.config import settings
+    from app.services.submission_service import _send_submission_webhook
+    from tests.standins import ImageStandIn, WebhookSink
+
+    settings.SUBMISSION_IMAGE_MAX_TOTAL_BYTES = 2 * size
+    settings.SUBMISSION_WEBHOOK_STREAMING = mode == "streamed"
+    settings.SUBMISSION_REVIEW_RENDITIONS = False
+    with ImageStandIn() as images, WebhookSink() as sink:
+        baseline = _max_rss_mb()
+        _send_submission_webhook(
+            webhook_url=sink.url, webhook_secret="",
+            task=SimpleNamespace(id=uuid.uuid4(), project_id=uuid.uuid4(), created_by=uuid.uuid4()),
+            submission=SimpleNamespace(id=uuid.uuid4(), attempt_number=1, content="done"),
+            submitted_by=uuid.uuid4(), employee_name="bench", project_name="bench", task_title="bench",
+            brief_snapshot="brief", file_urls=[images.url_for(size, "big.png")],
+        )
+        assert sink.bodies and sink.bodies[-1][1] > size
+    print(f"{_max_rss_mb() - baseline:.1f}")
+
+
+def main() -> None:
+    print(f"{'image':>8}  {'buffered':>12}  {'streamed':>12}   (peak RSS growth during the webhook)")
+    for size_mb in SIZES_MB:
+        row = []
+        for mode in ("buffered", "streamed"):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_webhook_streaming", mode, str(size_mb * MB)],
+                capture_output=True, text=True, check=True,
+            )
+            row.append(float(out.stdout.split()[-1]))
+        print(f"{size_mb:>5} MB  {row[0]:>9.1f} MB  {row[1]:>9.1f} MB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        _run(sys.argv[1], int(sys.argv[2]))
+    else:
+        main()
@@ -0,0 +1,30 @@
+"""Sample review webhook responses, shared by the parser tests and benchmarks/bench_parser.py."""
+
+import json
+
+VERDICT = {
+    "status": "aligns",
+    "summary": "Matches the brief.",
+    "score": 87,
+    "checks": {
+        "subject_concept": "ok", "brand_message": "ok", "target_audience": "ok", "style_mood": "ok",
+        "colors": "ok", "composition": "ok", "required_elements": "ok",
+    },
+    "feedback": ["Consider a larger logo."],
+}
+
+
+def gemini(text: str) -> list:
+    """Wrap model output the way the n8n Gemini node returns it."""
+    return [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP"}]
+
+
+CORPUS = {
+    "list_fenced": gemini("```json\n" + json.dumps(VERDICT, indent=2) + "\n```"),
+    "list_fenced_upper": gemini("```JSON\n" + json.dumps(VERDICT) + "\n```"),
+    "list_bare_fence": gemini("```\n" + json.dumps(VERDICT) + "\n```"),
+    "list_unfenced": gemini(json.dumps(VERDICT)),
+    "list_truncated": gemini("```json\n" + json.dumps(VERDICT)[:60]),
+    "legacy_valid": {"status": "valid", "score": "92.5", "feedback": "Looks good"},
+    "legacy_invalid": {"status": "invalid", "score": 140, "feedback": ""},
+}
@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+import pytest
+
+# Settings are read at import time: point the app at a throwaway SQLite file
+# and an unreachable Supabase before anything under app/ is imported.
+_TMP_DIR = tempfile.mkdtemp(prefix="pfe-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_TMP_DIR}/test.db")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test")
+
+
+@pytest.fixture
+def db():
+    """A session on freshly created tables, dropped again after the test."""
+    from app.db.session import Base, SessionLocal, engine
+    from app.models import (  # noqa: F401  (register every table on Base.metadata)
+        activity, ai_review_cache, brief_snapshot, employee_stats, notification, project, rbac,
+        review_job, storage_upload, stored_object, task, user, workflow_image_callback,
+    )
+
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def settings_override(monkeypatch):
+    """settings_override(NAME=value, …) for the duration of one test."""
+    from app.core.config import settings
+
+    def override(**values):
+        for name, value in values.items():
+            monkeypatch.setattr(settings, name, value)
+
+    return override
+
+
+@pytest.fixture
+def api(db, settings_override):
+    """(client, act_as) for the FastAPI app with authentication replaced by act_as(user)."""
+    from fastapi.testclient import TestClient
+
+    from app.api.deps import get_current_user
+    from app.main import app
+
+    settings_override(SUBMISSION_REVIEW_WEBHOOK_URL="", N8N_WORK_SUBMISSION_WEBHOOK="", SUBMISSION_REVIEW_ASYNC=False)
+    current = {}
+    app.dependency_overrides[get_current_user] = lambda: current["user"]
+    try:
+        yield TestClient(app), lambda user: current.update(user=user)
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
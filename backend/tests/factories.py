@@ -0,0 +1,32 @@
+"""Minimal rows for tests that need users, projects and tasks."""
+
+import uuid
+
+
+def user(db, name, role="employee"):
+    from app.models.user import User, UserRole
+
+    row = User(id=uuid.uuid4(), email=f"{name}-{uuid.uuid4().hex[:6]}@example.com",
+               full_name=name, role=UserRole(role))
+    db.add(row)
+    db.flush()
+    return row
+
+
+def project(db, manager, **values):
+    from app.models.project import Project
+
+    row = Project(name=values.pop("name", "Project"), manager_id=manager.id, **values)
+    db.add(row)
+    db.flush()
+    return row
+
+
+def task(db, project_row, assignee=None, **values):
+    from app.models.task import Task
+
+    row = Task(project_id=project_row.id, title=values.pop("title", "Task"),
+               created_by=project_row.manager_id, assigned_to=assignee.id if assignee else None, **values)
+    db.add(row)
+    db.flush()
+    return row
@@ -0,0 +1,377 @@
+"""
+Local stand-ins for the upstream services the backend talks to, used by the
+tests and by the scripts in benchmarks/.
+
+  • SMTPStandIn — a minimal ESMTP server (EHLO, AUTH, MAIL/RCPT/DATA, NOOP,
+    RSET, QUIT) in the spirit of aiosmtpd's Debugging handler, without TLS.
+  • ImageStandIn — a storage-like image server: /<size>/<name> returns
+    <size> bytes after an optional latency, streamed without building the
+    body in memory; counts requests, connections and peak concurrency.
+  • WebhookSink — an n8n-like webhook that drains request bodies (chunked
+    or sized) in 64 KiB reads without keeping them, recording each body's
+    content type and length.
+  • StorageStandIn — the Supabase Storage object endpoints (upload, delete)
+    after an optional latency; counts requests and connections.
+  • TUSStandIn — the Supabase Storage resumable-upload (TUS 1.0) endpoints,
+    with injectable connection drops and offset conflicts.
+  • serve_http() — a ThreadingHTTPServer on a free loopback port for a
+    BaseHTTPRequestHandler subclass.
+"""
+
+from __future__ import annotations
+
+import json
+import socketserver
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class SMTPStandIn:
+    """Counts connections and accepted messages.
+
+    reject: recipient addresses answered with 550 at RCPT TO.
+    drop_after: close a connection after that many messages on it.
+    """
+
+    def __init__(self, *, reject=(), drop_after=None):
+        self.reject = {address.lower() for address in reject}
+        self.drop_after = drop_after
+        self.connections = 0
+        self.messages: list[tuple[list[str], bytes]] = []
+        self._lock = threading.Lock()
+        stand_in = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line: str) -> None:
+                self.wfile.write(line.encode() + b"\r\n")
+                self.wfile.flush()
+
+            def handle(self):
+                with stand_in._lock:
+                    stand_in.connections += 1
+                delivered = 0
+                recipients: list[str] = []
+                self.reply("220 stand-in ESMTP")
+                for raw in self.rfile:
+                    command = raw.decode().rstrip("\r\n")
+                    verb = command.split(" ", 1)[0].upper()
+                    if verb in ("EHLO", "HELO"):
+                        self.reply("250-stand-in\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME")
+                    elif verb == "AUTH":
+                        self.reply("235 2.7.0 Authentication successful")
+                    elif verb == "MAIL":
+                        recipients = []
+                        self.reply("250 OK")
+                    elif verb == "RCPT":
+                        address = command.split(":", 1)[1].strip().strip("<>").lower()
+                        if address in stand_in.reject:
+                            self.reply("550 5.1.1 No such user")
+                        else:
+                            recipients.append(address)
+                            self.reply("250 OK")
+                    elif verb == "DATA":
+                        self.reply("354 End data with <CR><LF>.<CR><LF>")
+                        body = []
+                        for line in self.rfile:
+                            if line == b".\r\n":
+                                break
+                            body.append(line)
+                        with stand_in._lock:
+                            stand_in.messages.append((recipients, b"".join(body)))
+                        self.reply("250 OK queued")
+                        delivered += 1
+                        if stand_in.drop_after and delivered >= stand_in.drop_after:
+                            return  # hang up without QUIT
+                    elif verb in ("NOOP", "RSET"):
+                        self.reply("250 OK")
+                    elif verb == "QUIT":
+                        self.reply("221 Bye")
+                        return
+                    else:
+                        self.reply("502 Command not implemented")
+
+        class Server(socketserver.ThreadingTCPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self.port = self._server.server_address[1]
+
+    def __enter__(self) -> "SMTPStandIn":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@contextmanager
+def serve_http(handler_cls):
+    """Yield the base URL of `handler_cls` served on a free loopback port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler_cls)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class ImageStandIn:
+    """Serves /<size>/<name> as <size> bytes of image/png after `latency` seconds."""
+
+    CHUNK = 64 * 1024
+
+    def __init__(self, *, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        self.connections = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with stand_in._lock:
+                    stand_in.connections += 1
+
+            def do_GET(self):
+                with stand_in._lock:
+                    stand_in.requests += 1
+                    stand_in._in_flight += 1
+                    stand_in.max_in_flight = max(stand_in.max_in_flight, stand_in._in_flight)
+                try:
+                    time.sleep(stand_in.latency)
+                    size = int(self.path.split("/")[1])
+                    self.send_response(200)
+                    self.send_header("Content-Type", "image/png")
+                    self.send_header("Content-Length", str(size))
+                    self.end_headers()
+                    block = stand_in.pattern(min(size, stand_in.CHUNK))
+                    for offset in range(0, size, stand_in.CHUNK):
+                        self.wfile.write(block[:min(stand_in.CHUNK, size - offset)])
+                finally:
+                    with stand_in._lock:
+                        stand_in._in_flight -= 1
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @staticmethod
+    def pattern(size: int) -> bytes:
+        """The bytes served for an image of `size` (a repeating 0..255 ramp)."""
+        return (bytes(range(256)) * (size // 256 + 1))[:size]
+
+    def url_for(self, size: int, name: str = "image.png") -> str:
+        return f"{self.url}/{size}/{name}"
+
+    def __enter__(self) -> "ImageStandIn":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class WebhookSink:
+    """Accepts POSTs, answers `reply` as JSON, and records (content type, length) per body."""
+
+    CHUNK = 64 * 1024
+
+    def __init__(self, *, reply: dict | None = None):
+        self.reply = json.dumps(reply or {"status": "valid"}).encode()
+        self.bodies: list[tuple[str, int]] = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _drain(self, remaining: int) -> int:
+                drained = 0
+                while remaining > drained:
+                    piece = self.rfile.read(min(stand_in.CHUNK, remaining - drained))
+                    if not piece:
+                        break
+                    drained += len(piece)
+                return drained
+
+            def do_POST(self):
+                if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                    length = 0
+                    while True:
+                        size = int(self.rfile.readline().split(b";")[0], 16)
+                        length += self._drain(size)
+                        self.rfile.readline()  # CRLF after the chunk (or the empty trailer)
+                        if not size:
+                            break
+                else:
+                    length = self._drain(int(self.headers.get("Content-Length") or 0))
+                stand_in.bodies.append((self.headers.get("Content-Type", ""), length))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(stand_in.reply)))
+                self.end_headers()
+                self.wfile.write(stand_in.reply)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/webhook"
+
+    def __enter__(self) -> "WebhookSink":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class StorageStandIn:
+    """Serves /storage/v1/object/<bucket>/<path> uploads and deletes; use .url as SUPABASE_URL."""
+
+    def __init__(self, *, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        self.connections = 0
+        self.objects: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with stand_in._lock:
+                    stand_in.connections += 1
+
+            def respond(self, payload) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _body(self) -> bytes:
+                time.sleep(stand_in.latency)
+                with stand_in._lock:
+                    stand_in.requests += 1
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+            def do_POST(self):
+                data = self._body()
+                key = self.path.split("/storage/v1/object/", 1)[1]
+                with stand_in._lock:
+                    stand_in.objects[key] = data
+                self.respond({"Key": key})
+
+            def do_DELETE(self):
+                bucket = self.path.rsplit("/", 1)[-1]
+                prefixes = json.loads(self._body())["prefixes"]
+                with stand_in._lock:
+                    removed = [stand_in.objects.pop(f"{bucket}/{path}", None) for path in prefixes]
+                self.respond([{"name": p} for p, data in zip(prefixes, removed) if data is not None])
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self) -> "StorageStandIn":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class TUSStandIn:
+    """Serves /storage/v1/upload/resumable; use .url as SUPABASE_URL.
+
+    drop_patches: 1-based PATCH numbers whose chunk is stored but whose
+    connection is then closed without a response (a lost acknowledgement).
+    conflict_patches: PATCH numbers answered 409 without storing anything.
+    """
+
+    def __init__(self, *, drop_patches=(), conflict_patches=()):
+        self.drop_patches = set(drop_patches)
+        self.conflict_patches = set(conflict_patches)
+        self.patches = 0
+        self.uploads: dict[str, bytearray] = {}
+        self._lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def respond(self, status: int, **headers) -> None:
+                self.send_response(status)
+                for name, value in {"Content-Length": "0", "Tus-Resumable": "1.0.0", **headers}.items():
+                    self.send_header(name, value)
+                self.end_headers()
+
+            def do_POST(self):
+                with stand_in._lock:
+                    upload_id = f"u{len(stand_in.uploads) + 1}"
+                    stand_in.uploads[upload_id] = bytearray()
+                self.respond(201, Location=f"/storage/v1/upload/resumable/{upload_id}")
+
+            def do_HEAD(self):
+                data = stand_in.uploads.get(self.path.rsplit("/", 1)[-1])
+                if data is None:
+                    self.respond(404)
+                else:
+                    self.respond(200, **{"Upload-Offset": str(len(data))})
+
+            def do_PATCH(self):
+                chunk = self.rfile.read(int(self.headers["Content-Length"]))
+                data = stand_in.uploads[self.path.rsplit("/", 1)[-1]]
+                with stand_in._lock:
+                    stand_in.patches += 1
+                    number = stand_in.patches
+                if number in stand_in.conflict_patches or int(self.headers["Upload-Offset"]) != len(data):
+                    self.respond(409)
+                    return
+                data.extend(chunk)
+                if number in stand_in.drop_patches:
+                    self.close_connection = True
+                    return
+                self.respond(204, **{"Upload-Offset": str(len(data))})
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self) -> "TUSStandIn":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,82 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tests import factories
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _seed(db, user, other):
+    from app.models.activity import ActivityLog
+
+    task_id = uuid.uuid4()
+    rows = []
+    for i in range(25):
+        rows.append(ActivityLog(
+            id=uuid.uuid4(),
+            user_id=user.id if i % 5 else other.id,
+            action="update_task" if i % 2 else "submit_work",
+            entity_type="task",
+            entity_id=task_id if i < 10 else uuid.uuid4(),
+            # pairs of rows share a timestamp, so the id breaks ties
+            created_at=T0 + timedelta(minutes=i // 2),
+        ))
+    db.add_all(rows)
+    db.commit()
+    return rows, task_id
+
+
+def _key(log):
+    from app.db.dialect import as_utc
+
+    return as_utc(log.created_at), str(log.id)
+
+
+def test_keyset_pages_cover_every_row_once_newest_first(db):
+    from app.services.activity_service import activity_service
+
+    rows, _ = _seed(db, factories.user(db, "a"), factories.user(db, "b"))
+    seen, cursor, sizes = [], None, []
+    while True:
+        page, cursor = activity_service.get_logs_page(db, limit=10, cursor=cursor)
+        sizes.append(len(page))
+        seen.extend(page)
+        if cursor is None:
+            break
+
+    assert sizes == [10, 10, 5]
+    assert sorted(log.id for log in seen) == sorted(row.id for row in rows)
+    keys = [_key(log) for log in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_filters_narrow_the_page(db):
+    from app.services.activity_service import activity_service
+
+    user, other = factories.user(db, "a"), factories.user(db, "b")
+    rows, task_id = _seed(db, user, other)
+
+    def ids(**filters):
+        page, _ = activity_service.get_logs_page(db, limit=100, **filters)
+        return sorted(log.id for log in page)
+
+    def expected(predicate):
+        return sorted(row.id for row in rows if predicate(row))
+
+    assert ids(user_id=other.id) == expected(lambda r: r.user_id == other.id)
+    assert ids(entity_type="task", entity_id=task_id) == expected(lambda r: r.entity_id == task_id)
+    assert ids(action="submit_work") == expected(lambda r: r.action == "submit_work")
+    since, until = T0 + timedelta(minutes=3), T0 + timedelta(minutes=6)
+    assert ids(since=since, until=until) == expected(lambda r: since <= _key(r)[0] < until)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "Zm9v"])
+def test_bad_cursor_is_a_400(db, api, cursor):
+    client, act_as = api
+    act_as(factories.user(db, "boss", role="manager"))
+    db.commit()
+
+    response = client.get("/api/v1/management/logs", params={"cursor": cursor})
+    assert response.status_code == 400
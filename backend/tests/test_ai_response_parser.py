@@ -0,0 +1,54 @@
+import pytest
+
+from app.services.ai_response_parser import CHECK_KEYS, parse_ai_response, strip_code_fence
+from tests.ai_responses import CORPUS, VERDICT, gemini
+
+
+@pytest.mark.parametrize("name", ["list_fenced", "list_fenced_upper", "list_bare_fence", "list_unfenced"])
+def test_list_format_yields_the_model_verdict(name):
+    assert parse_ai_response(CORPUS[name]) == VERDICT
+
+
+def test_opening_fence_language_tag_is_case_insensitive():
+    assert strip_code_fence("```JSON\n{}\n```") == "{}"
+    assert strip_code_fence("```Json {}```") == "{}"
+
+
+def test_truncated_json_is_an_error_verdict():
+    result = parse_ai_response(CORPUS["list_truncated"])
+    assert result["status"] == "error"
+    assert result["summary"] == "AI analysis JSON could not be parsed."
+    assert set(result["checks"]) == set(CHECK_KEYS)
+
+
+@pytest.mark.parametrize("raw, summary", [
+    (gemini("```json\n```"), "AI analysis returned an empty response."),
+    ([{"content": {}}], "AI response structure was unrecognized."),
+    (gemini("[1, 2]"), "AI analysis JSON could not be parsed."),
+])
+def test_unusable_list_responses_are_error_verdicts(raw, summary):
+    result = parse_ai_response(raw)
+    assert (result["status"], result["summary"]) == ("error", summary)
+
+
+def test_legacy_dict_format_is_normalized():
+    valid = parse_ai_response(CORPUS["legacy_valid"])
+    assert (valid["status"], valid["score"], valid["summary"]) == ("aligns", 92, "Looks good")
+    assert valid["feedback"] == ["Looks good"]
+
+    invalid = parse_ai_response(CORPUS["legacy_invalid"])
+    assert (invalid["status"], invalid["score"], invalid["feedback"]) == ("does_not_align", 100, [])
+
+
+def test_partial_checks_are_filled_without_touching_the_input():
+    raw = {"status": "needs_revision", "checks": {"colors": "off"}, "feedback": "Fix colors"}
+    result = parse_ai_response(raw)
+    assert result["checks"]["colors"] == "off"
+    assert result["checks"]["composition"] == "unknown"
+    assert raw["checks"] == {"colors": "off"}
+    assert result["feedback"] == ["Fix colors"]
+
+
+@pytest.mark.parametrize("raw", [None, [], {}, "text"])
+def test_empty_or_foreign_responses_are_unparseable(raw):
+    assert parse_ai_response(raw) is None
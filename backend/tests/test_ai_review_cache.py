@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta, timezone
+
+
+def _key(**overrides):
+    from app.services.ai_review_cache_service import ai_review_cache_service
+
+    args = {"task_title": "Logo", "project_name": "Acme", **overrides}
+    return ai_review_cache_service.key_for([b"img"], "brief", "text", **args).cache_key
+
+
+def test_key_covers_task_title_and_project_name():
+    assert _key() == _key()
+    assert _key(task_title="Banner") != _key()
+    assert _key(project_name="Globex") != _key()
+
+
+def test_store_leaves_expired_entries_to_purge_expired(db):
+    from app.models.ai_review_cache import AIReviewCache
+    from app.services.ai_review_cache_service import ai_review_cache_service
+
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    for i in range(3):
+        db.add(AIReviewCache(cache_key=f"{i:064d}", workflow_version="v", files_hash="f", brief_hash="b",
+                             result={"status": "approved"}, expires_at=past))
+    db.commit()
+
+    key = ai_review_cache_service.key_for([b"img"], "brief", "text", task_title="t", project_name="p")
+    ai_review_cache_service.store(db, key, {"status": "approved"}, None)
+    db.commit()
+    assert db.query(AIReviewCache).count() == 4
+
+    assert ai_review_cache_service.purge_expired(dry_run=True) == 3
+    assert ai_review_cache_service.purge_expired() == 3
+    assert [row.cache_key for row in db.query(AIReviewCache)] == [key.cache_key]
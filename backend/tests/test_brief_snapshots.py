@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import event
+
+from tests import factories
+
+BRIEF = "Brief: a spring campaign for the bakery.\n" + "Q: Tone?\nA: Warm, playful.\n" * 40
+
+
+@pytest.fixture
+def statements():
+    """SQL statements run while the test body executes."""
+    from app.db.session import engine
+
+    seen = []
+
+    def executed(conn, cursor, statement, *args):
+        seen.append(statement)
+
+    event.listen(engine, "before_cursor_execute", executed)
+    yield seen
+    event.remove(engine, "before_cursor_execute", executed)
+
+
+def _submissions(db, count):
+    from app.models.task import TaskSubmission
+    from app.services.brief_snapshot_service import brief_snapshot_service
+
+    manager = factories.user(db, "boss", role="manager")
+    task = factories.task(db, factories.project(db, manager), assignee=manager)
+    rows = [
+        TaskSubmission(
+            task_id=task.id, submitted_by=manager.id, attempt_number=n + 1, content=f"attempt {n + 1}",
+            brief_snapshot_hash=brief_snapshot_service.intern(db, BRIEF),
+        )
+        for n in range(count)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return manager, task.id, [row.id for row in rows]
+
+
+def test_attempts_share_one_snapshot_row(db):
+    from app.models.brief_snapshot import BriefSnapshot
+
+    _submissions(db, 5)
+
+    [snapshot] = db.query(BriefSnapshot).all()
+    assert snapshot.text == BRIEF
+    assert len(snapshot.data) < len(BRIEF.encode()) // 4  # stored compressed
+
+
+@pytest.mark.parametrize("path", ["/api/v1/submissions/{task_id}/", "/api/v1/tasks/{task_id}/submissions"])
+def test_list_endpoints_leave_the_brief_out(db, api, statements, path):
+    client, act_as = api
+    manager, task_id, _ = _submissions(db, 5)
+    act_as(manager)
+
+    statements.clear()
+    response = client.get(path.format(task_id=task_id))
+
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == 5
+    assert all("brief_snapshot" not in row for row in response.json())
+    assert not [sql for sql in statements if "brief_snapshots" in sql]
+
+
+def test_detail_read_returns_the_brief(db, api):
+    client, act_as = api
+    manager, _, ids = _submissions(db, 2)
+    act_as(manager)
+
+    response = client.get(f"/api/v1/submissions/single/{ids[0]}")
+
+    assert response.status_code == 200, response.text
+    assert response.json()["brief_snapshot"] == BRIEF
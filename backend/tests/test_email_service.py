@@ -0,0 +1,52 @@
+import pytest
+
+from app.services.email_service import EmailService
+from tests.standins import SMTPStandIn
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    def make(**kwargs):
+        stand_in = SMTPStandIn(**kwargs)
+        monkeypatch.setenv("SMTP_SERVER", "127.0.0.1")
+        monkeypatch.setenv("SMTP_PORT", str(stand_in.port))
+        monkeypatch.setenv("SMTP_USER", "user")
+        monkeypatch.setenv("SMTP_PASSWORD", "secret")
+        monkeypatch.setenv("SMTP_STARTTLS", "false")
+        return stand_in
+
+    return make
+
+
+def _batch(recipients):
+    return [(to, f"Subject {i}", "body") for i, to in enumerate(recipients)]
+
+
+def test_batch_goes_through_one_session(smtp):
+    with smtp() as server:
+        service = EmailService()
+        assert service.send_many(_batch([f"u{i}@example.com" for i in range(20)])) == [True] * 20
+        assert service.send_notification_email("late@example.com", "Hi", "body") is True
+        service.close()
+    assert server.connections == 1
+    assert len(server.messages) == 21
+
+
+def test_rejected_recipient_keeps_the_session_and_is_not_resent(smtp):
+    with smtp(reject={"bad@example.com"}) as server:
+        service = EmailService()
+        results = service.send_many(_batch(["a@example.com", "bad@example.com", "b@example.com"]))
+        service.close()
+    assert results == [True, False, True]
+    assert server.connections == 1
+    assert [recipients for recipients, _ in server.messages] == [["a@example.com"], ["b@example.com"]]
+
+
+def test_dropped_session_reconnects_and_resends_once(smtp):
+    with smtp(drop_after=2) as server:
+        service = EmailService()
+        results = service.send_many(_batch([f"u{i}@example.com" for i in range(5)]))
+        service.close()
+    assert results == [True] * 5
+    assert len(server.messages) == 5
+    assert server.connections == 3
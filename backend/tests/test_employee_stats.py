@@ -0,0 +1,29 @@
+import uuid
+
+from sqlalchemy.dialects import postgresql
+
+from tests import factories
+
+
+def test_commit_refreshes_the_rollup_of_touched_employees(db):
+    from app.models.employee_stats import EmployeeStats
+    from app.models.task import TaskStatus
+    from app.services import employee_stats_service  # noqa: F401  (registers the commit hooks)
+
+    alice = factories.user(db, "alice")
+    project = factories.project(db, factories.user(db, "manager", role="manager"))
+    factories.task(db, project, alice)
+    factories.task(db, project, alice, status=TaskStatus.completed)
+    db.commit()
+
+    stats = db.get(EmployeeStats, alice.id)
+    assert (stats.total_tasks, stats.completed_tasks) == (2, 1)
+
+
+def test_recompute_locks_rows_in_user_id_order():
+    from app.services.employee_stats_service import _lock_statement
+
+    ids = [uuid.uuid4() for _ in range(3)]
+    sql = str(_lock_statement(ids).compile(dialect=postgresql.dialect()))
+    assert "ORDER BY employee_stats.user_id" in sql
+    assert sql.rstrip().endswith("FOR UPDATE")
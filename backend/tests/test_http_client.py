@@ -0,0 +1,79 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.http_client import CircuitOpenError, HTTPClient, _CircuitBreaker
+
+RESET_SECONDS = 0.2
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client():
+    client = HTTPClient()
+    client.endpoint("test").breaker = _CircuitBreaker(threshold=1, reset_seconds=RESET_SECONDS)
+    return client
+
+
+def _failing_body():
+    raise ValueError("body generator failed")
+    yield b""  # pragma: no cover
+
+
+def test_breaker_recovers_after_failed_half_open_probe(client, server_url):
+    breaker = client.endpoint("test").breaker
+
+    # closed → open: one connection error trips a threshold-1 breaker
+    with pytest.raises(Exception):
+        client.get("test", "http://127.0.0.1:9/", idempotent=False, timeout=1)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        client.get("test", server_url)
+
+    # half-open probe fails with a caller-side error: not counted against the
+    # endpoint, and the probe slot is free again
+    time.sleep(RESET_SECONDS)
+    assert breaker.state == "half_open"
+    with pytest.raises(ValueError):
+        client.post("test", server_url, data=_failing_body())
+    assert breaker.state == "half_open"
+
+    # next probe succeeds and closes the circuit
+    resp = client.get("test", server_url, timeout=5)
+    assert resp.status_code == 200
+    assert breaker.state == "closed"
+    assert client.get("test", server_url, timeout=5).status_code == 200
+
+
+def test_caller_errors_do_not_trip_a_closed_breaker(client, server_url):
+    breaker = client.endpoint("test").breaker
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            client.post("test", server_url, data=_failing_body())
+    assert breaker.state == "closed"
+    assert client.endpoint("test").metrics.snapshot().get("errors", 0) == 0
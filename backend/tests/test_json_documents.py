@@ -0,0 +1,83 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from tests import factories
+
+
+@pytest.fixture
+def invalidations(monkeypatch):
+    from app.services.dashboard_service import dashboard_service
+
+    calls = []
+    monkeypatch.setattr(dashboard_service, "invalidate", lambda: calls.append(1))
+    return calls
+
+
+def test_autosave_merges_answers_without_invalidating_the_dashboard(db, api, invalidations):
+    from app.models.project import BriefStatus, Project
+
+    client, act_as = api
+    manager = factories.user(db, "boss", role="manager")
+    client_user = factories.user(db, "client", role="client")
+    project = factories.project(
+        db, manager, client_id=client_user.id, brief_status=BriefStatus.draft,
+        saved_answers={"budget": {"question": {"id": "budget"}, "answer": "10k"}},
+    )
+    db.commit()
+    project_id = project.id
+    act_as(client_user)
+    invalidations.clear()
+
+    def autosave(key, answer):
+        response = client.post("/api/v1/brief/autosave", json={
+            "sessionId": str(project_id), "fieldKey": key, "question": {"id": key}, "answer": answer,
+        })
+        assert response.status_code == 200, response.text
+
+    autosave("goal", "more leads")
+    assert len(invalidations) == 1  # draft → in_progress is a dashboard change
+    autosave("audience", "SMBs")
+    autosave("goal", "brand awareness")
+    assert len(invalidations) == 1  # answers alone are not
+
+    db.expire_all()
+    saved = db.get(Project, project_id)
+    assert saved.brief_status == BriefStatus.in_progress
+    assert saved.saved_answers == {
+        "budget": {"question": {"id": "budget"}, "answer": "10k"},
+        "goal": {"question": {"id": "goal"}, "answer": "brand awareness"},
+        "audience": {"question": {"id": "audience"}, "answer": "SMBs"},
+    }
+
+
+def test_merge_json_keys_updates_the_object_without_dirtying_it(db):
+    from app.db.types import merge_json_keys
+    from app.models.project import Project
+
+    project = factories.project(db, factories.user(db, "boss", role="manager"), saved_answers={"a": 1})
+    db.commit()
+
+    merge_json_keys(db, project, "saved_answers", {"b": 2})
+    assert project not in db.dirty
+    assert project.saved_answers == {"a": 1, "b": 2}
+    db.commit()
+    db.expire_all()
+    assert db.get(Project, project.id).saved_answers == {"a": 1, "b": 2}
+
+
+@pytest.mark.parametrize("stored, returned", [
+    (None, None),
+    (["https://cdn/x.png"], '["https://cdn/x.png"]'),
+    ({"status": "aligns"}, '{"status": "aligns"}'),
+    ("raw text reply", '"raw text reply"'),  # a JSON string document is encoded too
+])
+def test_json_documents_are_always_returned_as_json_text(stored, returned):
+    from app.schemas.submission import SubmissionRead
+
+    read = SubmissionRead.model_validate({
+        "id": uuid.uuid4(), "task_id": uuid.uuid4(), "submitted_by": uuid.uuid4(),
+        "created_at": datetime.now(timezone.utc), "webhook_response": stored,
+    })
+    assert read.webhook_response == returned
@@ -0,0 +1,65 @@
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler
+
+from app.db.dialect import as_utc
+from tests import factories
+from tests.standins import serve_http
+
+
+def test_inline_review_webhook_runs_outside_a_transaction(db, settings_override):
+    from app.schemas.submission import SubmissionCreateRequest
+    from app.services.submission_service import SubmissionService
+
+    seen = []
+
+    class Webhook(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            seen.append(db.in_transaction())
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            body = json.dumps({"status": "approved", "score": 90, "feedback": "ok"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    employee = factories.user(db, "worker")
+    task = factories.task(db, factories.project(db, factories.user(db, "boss", role="manager")), employee)
+    db.commit()
+
+    with serve_http(Webhook) as url:
+        settings_override(SUBMISSION_REVIEW_WEBHOOK_URL=url, SUBMISSION_REVIEW_ASYNC=False)
+        SubmissionService.create_submission(
+            db, SubmissionCreateRequest(task_id=task.id, content="done"), employee.id,
+        )
+
+    assert seen == [False]
+
+
+def test_running_job_lease_is_renewed(db, settings_override):
+    from app.models.review_job import ReviewJob
+    from app.models.task import TaskSubmission
+    from app.services.review_job_service import review_job_service
+
+    settings_override(REVIEW_JOB_LEASE_SECONDS=3)
+    employee = factories.user(db, "worker")
+    task = factories.task(db, factories.project(db, factories.user(db, "boss", role="manager")), employee)
+    submission = TaskSubmission(id=uuid.uuid4(), task_id=task.id, submitted_by=employee.id)
+    db.add(submission)
+    job = ReviewJob(id=uuid.uuid4(), submission_id=submission.id, status="running",
+                    lease_expires_at=datetime.now(timezone.utc))
+    db.add(job)
+    db.commit()
+    claimed_until = as_utc(job.lease_expires_at)
+
+    with review_job_service._lease_renewed(job.id):
+        time.sleep(1.3)
+
+    db.expire_all()
+    assert as_utc(db.get(ReviewJob, job.id).lease_expires_at) > claimed_until
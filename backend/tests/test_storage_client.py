@@ -0,0 +1,48 @@
+import threading
+
+from tests.standins import StorageStandIn
+
+
+def test_uploads_and_deletes_reuse_one_kept_alive_connection(db, settings_override):
+    from app.services.storage_service import DELIVERABLES_BUCKET, delete_deliverable, upload_deliverable
+
+    with StorageStandIn() as stand_in:
+        settings_override(SUPABASE_URL=stand_in.url)
+        paths = [
+            upload_deliverable(
+                file_source=f"image {i}".encode(), content_type="image/png",
+                project_id="p", task_id="t", submission_id="s", file_type="image",
+            )[0]
+            for i in range(20)
+        ]
+        delete_deliverable(paths[0])
+
+    assert stand_in.requests == 21
+    assert stand_in.connections == 1
+    assert sorted(stand_in.objects) == sorted(f"{DELIVERABLES_BUCKET}/{path}" for path in paths[1:])
+
+
+def test_the_shared_client_is_safe_across_threads(settings_override):
+    from app.core.config import settings
+    from app.services.storage_service import storage_client
+
+    errors = []
+
+    def upload(worker):
+        try:
+            for i in range(10):
+                storage_client.upload("bucket", f"{worker}/{i}.png", f"{worker}:{i}".encode(), "image/png")
+        except Exception as exc:
+            errors.append(exc)
+
+    with StorageStandIn(latency=0.01) as stand_in:
+        settings_override(SUPABASE_URL=stand_in.url)
+        threads = [threading.Thread(target=upload, args=(w,)) for w in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
+    assert stand_in.objects == {f"bucket/{w}/{i}.png": f"{w}:{i}".encode() for w in range(8) for i in range(10)}
+    assert stand_in.connections <= min(8, settings.STORAGE_POOL_MAXSIZE)
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+
+def _listed(path):
+    old = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
+    return (path, 10, old)
+
+
+def test_dedup_hit_during_listing_keeps_its_object(db, monkeypatch, settings_override):
+    from app.models.stored_object import StoredObject
+    from app.services import storage_reconciler as reconciler_module
+    from app.services.storage_service import DELIVERABLES_BUCKET, storage_client
+
+    settings_override(STORAGE_RECONCILE_MIN_AGE_SECONDS=3600)
+    stale = datetime.now(timezone.utc) - timedelta(days=2)
+    for name in ("shared", "orphan"):
+        db.add(StoredObject(
+            bucket=DELIVERABLES_BUCKET, sha256=name * 8, object_path=f"sha256/aa/{name}.png",
+            size_bytes=10, ref_count=1, last_referenced_at=stale,
+        ))
+    db.commit()
+
+    def list_objects(bucket):
+        yield _listed("sha256/aa/shared.png")
+        # an upload of the same bytes re-references the object mid-listing
+        db.execute(
+            update(StoredObject)
+            .where(StoredObject.object_path == "sha256/aa/shared.png")
+            .values(ref_count=2, last_referenced_at=datetime.now(timezone.utc))
+        )
+        db.commit()
+        yield _listed("sha256/aa/orphan.png")
+        yield _listed("sha256/aa/never-indexed.png")
+        yield _listed("legacy/task/final-20240101T000000.png")
+
+    removed = []
+    monkeypatch.setattr(storage_client, "list_objects", list_objects)
+    monkeypatch.setattr(storage_client, "remove", lambda bucket, paths: removed.extend(paths))
+
+    report = reconciler_module.StorageReconciler().reconcile(dry_run=False)
+
+    assert sorted(removed) == ["legacy/task/final-20240101T000000.png", "sha256/aa/orphan.png"]
+    assert report["deleted_objects"] == 2
+    db.expire_all()
+    assert db.get(StoredObject, (DELIVERABLES_BUCKET, "shared" * 8)).ref_count == 2
+    assert db.get(StoredObject, (DELIVERABLES_BUCKET, "orphan" * 8)) is None
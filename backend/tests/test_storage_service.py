@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tests.standins import TUSStandIn
+
+
+def _index(db, refs):
+    from app.models.stored_object import StoredObject
+    from app.services.storage_service import DELIVERABLES_BUCKET
+
+    db.add(StoredObject(
+        bucket=DELIVERABLES_BUCKET, sha256="ab" * 32, object_path="sha256/ab/obj.png",
+        size_bytes=10, ref_count=refs,
+    ))
+    db.commit()
+
+
+def test_release_keeps_shared_objects(db, monkeypatch):
+    from app.models.stored_object import StoredObject
+    from app.services.storage_service import DELIVERABLES_BUCKET, storage_client
+
+    _index(db, refs=2)
+    removed = []
+    monkeypatch.setattr(storage_client, "remove", lambda bucket, paths: removed.extend(paths))
+
+    storage_client.release(DELIVERABLES_BUCKET, "sha256/ab/obj.png")
+
+    assert removed == []
+    db.expire_all()
+    assert db.get(StoredObject, (DELIVERABLES_BUCKET, "ab" * 32)).ref_count == 1
+
+
+def test_last_release_removes_the_object_before_dropping_its_row(db, monkeypatch):
+    from app.db.session import SessionLocal
+    from app.models.stored_object import StoredObject
+    from app.services.storage_service import DELIVERABLES_BUCKET, storage_client
+
+    _index(db, refs=1)
+    seen_during_remove = []
+
+    def remove(bucket, paths):
+        other = SessionLocal()
+        try:
+            seen_during_remove.append(other.get(StoredObject, (bucket, "ab" * 32)) is not None)
+        finally:
+            other.close()
+
+    monkeypatch.setattr(storage_client, "remove", remove)
+    storage_client.release(DELIVERABLES_BUCKET, "sha256/ab/obj.png")
+
+    assert seen_during_remove == [True]
+    db.expire_all()
+    assert db.get(StoredObject, (DELIVERABLES_BUCKET, "ab" * 32)) is None
+
+
+def test_failed_remove_keeps_the_reference(db, monkeypatch):
+    from app.models.stored_object import StoredObject
+    from app.services.storage_service import DELIVERABLES_BUCKET, storage_client
+
+    _index(db, refs=1)
+
+    def remove(bucket, paths):
+        raise RuntimeError("storage down")
+
+    monkeypatch.setattr(storage_client, "remove", remove)
+    with pytest.raises(RuntimeError):
+        storage_client.release(DELIVERABLES_BUCKET, "sha256/ab/obj.png")
+
+    db.expire_all()
+    assert db.get(StoredObject, (DELIVERABLES_BUCKET, "ab" * 32)).ref_count == 1
+
+
+def _resumable(stand_in, settings_override, payload):
+    from app.services.storage_service import storage_client
+
+    settings_override(SUPABASE_URL=stand_in.url, STORAGE_TUS_CHUNK_BYTES=1024, STORAGE_TUS_MAX_RESUMES=2)
+    return storage_client.upload_resumable(
+        "deliverables", "sha256/ab/obj.bin", payload, len(payload), "application/octet-stream",
+        resume_key="test-upload",
+    )
+
+
+def test_resumable_upload_survives_dropped_acknowledgements(db, settings_override):
+    from app.models.storage_upload import StorageUpload
+
+    payload = bytes(range(256)) * 20  # 5 chunks
+    with TUSStandIn(drop_patches={2, 4}) as stand_in:
+        assert _resumable(stand_in, settings_override, payload) == "sha256/ab/obj.bin"
+
+    assert bytes(stand_in.uploads["u1"]) == payload
+    assert stand_in.patches == 5  # dropped chunks had landed; none was sent twice
+    assert db.get(StorageUpload, "test-upload") is None
+
+
+def test_resumable_upload_gives_up_on_repeated_conflicts(db, settings_override):
+    from app.models.storage_upload import StorageUpload
+
+    with TUSStandIn(conflict_patches=range(1, 100)) as stand_in:
+        with pytest.raises(RuntimeError, match="kept conflicting"):
+            _resumable(stand_in, settings_override, b"x" * 4096)
+
+    assert stand_in.patches == 3
+    assert db.get(StorageUpload, "test-upload").offset == 0
+
+
+def test_reconciler_prunes_idle_uploads(db, monkeypatch, settings_override):
+    from app.models.storage_upload import StorageUpload
+    from app.services.storage_reconciler import StorageReconciler
+    from app.services.storage_service import storage_client
+
+    settings_override(STORAGE_RECONCILE_UPLOAD_TTL_SECONDS=3600)
+    idle = datetime.now(timezone.utc) - timedelta(hours=2)
+    for key, updated_at in (("idle", idle), ("active", datetime.now(timezone.utc))):
+        db.add(StorageUpload(resume_key=key, bucket="deliverables", object_path=f"sha256/aa/{key}",
+                             upload_url="http://x", total_bytes=1, offset=0, updated_at=updated_at))
+    db.commit()
+    monkeypatch.setattr(storage_client, "list_objects", lambda bucket: iter(()))
+
+    report = StorageReconciler().reconcile(dry_run=False)
+
+    assert report["pruned_uploads"] == 1
+    db.expire_all()
+    assert [row.resume_key for row in db.query(StorageUpload)] == ["active"]
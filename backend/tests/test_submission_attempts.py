@@ -0,0 +1,79 @@
+import importlib.util
+import pathlib
+import threading
+
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from tests import factories
+
+_MIGRATION = pathlib.Path(__file__).parents[1] / "alembic" / "versions" / "011_submission_attempt_counters.py"
+
+
+def test_parallel_submits_get_distinct_attempt_numbers(db, settings_override):
+    from app.db.session import SessionLocal
+    from app.models.task import TaskSubmission
+    from app.schemas.submission import SubmissionCreateRequest
+    from app.services.submission_service import SubmissionService
+
+    settings_override(SUBMISSION_REVIEW_WEBHOOK_URL="", N8N_WORK_SUBMISSION_WEBHOOK="", SUBMISSION_REVIEW_ASYNC=False)
+    employee = factories.user(db, "worker")
+    task = factories.task(db, factories.project(db, factories.user(db, "boss", role="manager")), employee)
+    db.commit()
+    task_id, employee_id = task.id, employee.id
+
+    workers = 8
+    barrier = threading.Barrier(workers)
+    errors = []
+
+    def submit():
+        session = SessionLocal()
+        try:
+            barrier.wait()
+            SubmissionService.create_submission(
+                session, SubmissionCreateRequest(task_id=task_id, content="v"), employee_id,
+            )
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=submit) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    attempts = sorted(db.scalars(sa.select(TaskSubmission.attempt_number).where(TaskSubmission.task_id == task_id)))
+    assert attempts == list(range(1, workers + 1))
+
+
+def test_migration_renumbers_duplicates_and_adds_the_index_outside_postgresql(tmp_path):
+    spec = importlib.util.spec_from_file_location("migration_011", _MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    engine = sa.create_engine(f"sqlite:///{tmp_path}/m.db")
+    with engine.begin() as conn:
+        conn.execute(sa.text("CREATE TABLE users (id CHAR(32) PRIMARY KEY)"))
+        conn.execute(sa.text("CREATE TABLE tasks (id CHAR(32) PRIMARY KEY)"))
+        conn.execute(sa.text(
+            "CREATE TABLE task_submissions (id INTEGER PRIMARY KEY, task_id CHAR(32), "
+            "submitted_by CHAR(32), attempt_number INTEGER, created_at TIMESTAMP)"
+        ))
+        conn.execute(sa.text(
+            "INSERT INTO task_submissions VALUES "
+            "(1, 't', 'u', 1, '2026-01-01'), (2, 't', 'u', 1, '2026-01-02'), (3, 't', 'u', 2, '2026-01-03')"
+        ))
+        migration.op = Operations(MigrationContext.configure(conn))
+        migration.upgrade()
+
+        numbers = conn.execute(sa.text("SELECT attempt_number FROM task_submissions ORDER BY id")).scalars().all()
+        counter = conn.execute(sa.text("SELECT last_attempt FROM submission_attempt_counters")).scalar_one()
+        indexes = {ix["name"]: ix["unique"] for ix in sa.inspect(conn).get_indexes("task_submissions")}
+
+    assert numbers == [1, 2, 3]
+    assert counter == 3
+    assert indexes == {"uq_task_submissions_attempt": 1}
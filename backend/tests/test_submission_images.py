@@ -0,0 +1,84 @@
+import json
+import time
+from http.server import BaseHTTPRequestHandler
+
+from tests.standins import ImageStandIn, serve_http
+
+LATENCY = 0.2
+
+
+def test_images_are_fetched_concurrently_in_order_over_kept_alive_connections(settings_override):
+    from app.services.submission_service import _fetch_images
+
+    settings_override(SUBMISSION_IMAGE_FETCH_CONCURRENCY=4)
+    with ImageStandIn(latency=LATENCY) as images:
+        urls = [images.url_for(1000 + i, f"{i}.png") for i in range(8)]
+        started = time.perf_counter()
+        fetched = _fetch_images(urls)
+        elapsed = time.perf_counter() - started
+        again = _fetch_images(urls)
+
+    assert [img.content for img in fetched] == [ImageStandIn.pattern(1000 + i) for i in range(8)]
+    assert [img.filename for img in fetched] == [f"{i}.png" for i in range(8)]
+    assert images.max_in_flight == 4
+    assert elapsed < 8 * LATENCY / 2  # two rounds of four, not eight in a row
+    assert len(again) == 8 and images.connections <= 8  # the second batch reuses the pool
+
+
+def test_byte_budget_skips_what_does_not_fit_and_refunds_partial_downloads(settings_override):
+    from app.services.submission_service import _fetch_images
+
+    settings_override(SUBMISSION_IMAGE_FETCH_CONCURRENCY=1, SUBMISSION_IMAGE_MAX_TOTAL_BYTES=300_000)
+    with ImageStandIn() as images:
+        fetched = _fetch_images([
+            images.url_for(100_000), images.url_for(150_000), images.url_for(200_000), images.url_for(40_000),
+        ])
+
+    assert [img.content is not None for img in fetched] == [True, True, False, True]
+
+
+def test_json_fallback_reuses_the_downloaded_images(settings_override):
+    from app.services.submission_service import _send_submission_webhook
+
+    received = []
+
+    class Webhook(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            if self.headers["Content-Type"].startswith("multipart/"):
+                self.close_connection = True  # n8n dropped the multipart request
+                return
+            received.append(json.loads(body))
+            reply = b'{"status": "valid", "score": 80}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(reply)))
+            self.end_headers()
+            self.wfile.write(reply)
+
+    settings_override(SUBMISSION_WEBHOOK_STREAMING=False, SUBMISSION_REVIEW_RENDITIONS=False)
+    with ImageStandIn() as images, serve_http(Webhook) as webhook_url:
+        urls = [images.url_for(5000, "a.png"), images.url_for(6000, "b.png")]
+        reply = _send_submission_webhook(**_webhook_args(webhook_url, urls))
+
+    assert reply == {"status": "valid", "score": 80}
+    assert images.requests == 2  # fetched once, used by both encodings
+    assert [img["filename"] for img in received[0]["images"]] == ["a.png", "b.png"]
+
+
+def _webhook_args(webhook_url, file_urls):
+    import uuid
+    from types import SimpleNamespace
+
+    task = SimpleNamespace(id=uuid.uuid4(), project_id=uuid.uuid4(), created_by=uuid.uuid4())
+    submission = SimpleNamespace(id=uuid.uuid4(), attempt_number=1, content="done")
+    return dict(
+        webhook_url=webhook_url, webhook_secret="", task=task, submission=submission,
+        submitted_by=uuid.uuid4(), employee_name="w", project_name="p", task_title="t",
+        brief_snapshot="brief", file_urls=file_urls,
+    )
@@ -0,0 +1,75 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from tests.standins import serve_http
+
+FETCH_SECONDS = 0.5
+
+
+@pytest.fixture
+def jwks_server(settings_override):
+    """A JWKS endpoint that takes FETCH_SECONDS and serves kids k1 and k2."""
+    state = {"requests": 0, "started": threading.Event()}
+
+    class JWKS(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            state["requests"] += 1
+            state["started"].set()
+            time.sleep(FETCH_SECONDS)
+            body = json.dumps({"keys": [{"kid": "k1", "kty": "RSA"}, {"kid": "k2", "kty": "RSA"}]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    with serve_http(JWKS) as url:
+        settings_override(SUPABASE_URL=url, AUTH_JWKS_TTL_SECONDS=60, AUTH_JWKS_MIN_REFRESH_SECONDS=30)
+        yield state
+
+
+def _service_with_stale_keys():
+    from app.services.token_service import TokenService
+
+    service = TokenService()
+    service._jwks = {"k1": {"kid": "k1", "kty": "RSA"}}
+    service._jwks_fetched_at = time.monotonic() - 3600
+    return service
+
+
+def _refresh_in_background(service, state):
+    refresher = threading.Thread(target=service._jwks_lookup, args=("k1",), kwargs={"refresh": False})
+    refresher.start()
+    assert state["started"].wait(5)
+    return refresher
+
+
+def test_known_kid_is_served_from_stale_keys_during_a_refresh(jwks_server):
+    service = _service_with_stale_keys()
+    refresher = _refresh_in_background(service, jwks_server)
+
+    started = time.perf_counter()
+    assert service._jwks_lookup("k1", refresh=False)["kid"] == "k1"
+    assert time.perf_counter() - started < FETCH_SECONDS / 2
+
+    refresher.join()
+    assert jwks_server["requests"] == 1
+
+
+def test_unknown_kid_waits_for_the_in_flight_refresh(jwks_server):
+    service = _service_with_stale_keys()
+    refresher = _refresh_in_background(service, jwks_server)
+
+    assert service._jwks_lookup("k2", refresh=True)["kid"] == "k2"
+
+    refresher.join()
+    assert jwks_server["requests"] == 1
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import event
+
+from tests import factories
+
+
+@pytest.fixture
+def commits():
+    """commits(request) → (COMMITs, COMMITs of transactions that wrote) while it runs."""
+    from app.db.session import engine
+
+    counts = {"all": 0, "writes": 0}
+
+    def executed(conn, cursor, statement, *args):
+        if not statement.lstrip().upper().startswith(("SELECT", "PRAGMA")):
+            conn.info["wrote"] = True
+
+    def committed(conn):
+        counts["all"] += 1
+        counts["writes"] += bool(conn.info.pop("wrote", False))
+
+    def rolled_back(conn):
+        conn.info.pop("wrote", None)
+
+    listeners = [("before_cursor_execute", executed), ("commit", committed), ("rollback", rolled_back)]
+    for name, listener in listeners:
+        event.listen(engine, name, listener)
+
+    def measure(request):
+        before = dict(counts)
+        response = request()
+        assert response.status_code < 300, response.text
+        return counts["all"] - before["all"], counts["writes"] - before["writes"]
+
+    try:
+        yield measure
+    finally:
+        for name, listener in listeners:
+            event.remove(engine, name, listener)
+
+
+def test_task_and_submission_endpoints_commit_once_per_unit_of_work(db, api, commits):
+    client, act_as = api
+    manager = factories.user(db, "boss", role="manager")
+    employee = factories.user(db, "worker")
+    project = factories.project(db, manager)
+    db.commit()
+    project_id, employee_id = str(project.id), str(employee.id)
+
+    act_as(manager)
+    created = {}
+
+    def create():
+        response = client.post("/api/v1/tasks/", json={
+            "project_id": project_id, "title": "Logo", "assigned_to": employee_id,
+        })
+        created.update(response.json())
+        return response
+
+    assert commits(create) == (1, 1)
+    assert commits(lambda: client.patch(
+        f"/api/v1/tasks/{created['id']}", json={"title": "Logo v2", "priority": "high"},
+    )) == (1, 1)
+
+    act_as(employee)
+    # Submission, task status and activity log in one transaction; the review
+    # outcome (here: the owner's "pending" notification) in a second one after
+    # the webhook, whose read transaction is ended by a COMMIT that writes nothing
+    assert commits(lambda: client.post(
+        f"/api/v1/submissions/{created['id']}/submit", json={"content": "first draft"},
+    )) == (3, 2)
@@ -0,0 +1,104 @@
+import io
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler
+from types import SimpleNamespace
+
+import pytest
+
+from tests.standins import ImageStandIn, serve_http
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _png(width: int, height: int) -> bytes:
+    out = io.BytesIO()
+    Image.linear_gradient("L").resize((width, height)).convert("RGB").save(out, format="PNG")
+    return out.getvalue()
+
+
+def _pending(source_url: str):
+    record = SimpleNamespace(callback_token="token", status="pending_image", error_message=None)
+    return record, SimpleNamespace(id=uuid.uuid4(), file_paths=[source_url])
+
+
+@pytest.fixture
+def callbacks(monkeypatch):
+    from app.services.image_callback_service import image_callback_service
+
+    received = []
+    monkeypatch.setattr(
+        image_callback_service, "process_image_callback",
+        lambda db, *, token, image_file, content_type: received.append((token, image_file.read(), content_type)),
+    )
+    return received
+
+
+def test_deliver_renders_and_completes_the_callback(callbacks):
+    from app.services.watermark_service import watermark_service
+
+    source = _png(2400, 1600)
+
+    class Source(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(source)))
+            self.end_headers()
+            self.wfile.write(source)
+
+    with serve_http(Source) as url:
+        record, submission = _pending(f"{url}/photo.png")
+        assert watermark_service.deliver(None, record, submission) is True
+
+    [(token, preview, content_type)] = callbacks
+    assert (token, content_type) == ("token", "image/jpeg")
+    with Image.open(io.BytesIO(preview)) as image:
+        assert image.format == "JPEG" and max(image.size) == 1600
+
+
+def test_deliver_refuses_sources_over_the_byte_cap(callbacks, settings_override):
+    from app.services.watermark_service import watermark_service
+
+    settings_override(WATERMARK_SOURCE_MAX_BYTES=1024 * 1024)
+    with ImageStandIn() as images:
+        record, submission = _pending(images.url_for(8 * 1024 * 1024, "huge.png"))
+        assert watermark_service.deliver(None, record, submission) is False
+
+    assert callbacks == []
+    assert record.status == "failed" and "limit" in record.error_message
+
+
+def test_deliver_gives_up_on_a_slow_source_within_the_time_budget(callbacks, settings_override):
+    from app.services.watermark_service import watermark_service
+
+    class Drip(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(10 * 1024 * 1024))
+            self.end_headers()
+            try:
+                for _ in range(200):
+                    self.wfile.write(b"\0" * 1024)
+                    self.wfile.flush()
+                    time.sleep(0.05)
+            except OSError:
+                pass
+
+    settings_override(WATERMARK_TIMEOUT_SECONDS=1.0)
+    with serve_http(Drip) as url:
+        record, submission = _pending(f"{url}/slow.png")
+        started = time.perf_counter()
+        assert watermark_service.deliver(None, record, submission) is False
+        elapsed = time.perf_counter() - started
+
+    assert elapsed < 3
+    assert callbacks == []
+    assert record.status == "failed" and "WATERMARK_TIMEOUT_SECONDS" in record.error_message
@@ -0,0 +1,52 @@
+import tracemalloc
+
+from tests.standins import ImageStandIn, WebhookSink
+
+MB = 1024 * 1024
+
+
+def _streamed_peak(images: ImageStandIn, sink: WebhookSink, size: int) -> int:
+    from app.services.submission_service import _post_webhook_streaming
+
+    tracemalloc.start()
+    try:
+        reply = _post_webhook_streaming(
+            sink.url, {}, {"task_id": "t", "brief": "brief"}, "brief", [images.url_for(size, "big.png")],
+        )
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        assert reply == {"status": "valid"}
+
+
+def test_streamed_webhook_memory_stays_flat_as_images_grow(settings_override):
+    settings_override(SUBMISSION_IMAGE_MAX_TOTAL_BYTES=256 * MB)
+    with ImageStandIn() as images, WebhookSink() as sink:
+        small = _streamed_peak(images, sink, 1 * MB)
+        large = _streamed_peak(images, sink, 64 * MB)
+
+    assert [length > size for (_, length), size in zip(sink.bodies, (1 * MB, 64 * MB))] == [True, True]
+    assert all(content_type.startswith("multipart/form-data") for content_type, _ in sink.bodies)
+    assert large < 2 * MB  # a handful of 64 KiB chunks in flight, not the image
+    assert large - small < MB
+
+
+def test_streamed_json_fallback_encodes_without_buffering(settings_override):
+    from app.services import submission_service
+
+    settings_override(SUBMISSION_IMAGE_MAX_TOTAL_BYTES=256 * MB)
+    with ImageStandIn() as images:
+        tracemalloc.start()
+        try:
+            chunks = 0
+            length = 0
+            for chunk in submission_service._iter_json_b64({"task_id": "t"}, [images.url_for(32 * MB)]):
+                chunks += 1
+                length += len(chunk)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert length > 32 * MB * 4 // 3
+    assert chunks > 100
+    assert peak < 2 * MB
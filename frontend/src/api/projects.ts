@@ -242,6 +242,12 @@ export const projectsService = {
         return response.data;
     },
 
+    // List reads leave out brief_snapshot; this one includes it
+    async getSubmission(submissionId: string): Promise<TaskSubmission> {
+        const response = await api.get<TaskSubmission>(`/submissions/single/${submissionId}`);
+        return response.data;
+    },
+
     async sendTaskFeedback(taskId: string, feedbackData: Partial<TaskFeedback>): Promise<TaskFeedback> {
         const response = await api.post<TaskFeedback>(`/tasks/${taskId}/feedback`, feedbackData);
         return response.data;
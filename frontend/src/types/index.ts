@@ -178,7 +178,7 @@ export interface TaskSubmission {
     watermarked_file_paths?: string; // JSON string (Public URLs)
     watermark_file_path?: string;    // Raw storage path (e.g. task-submissions/preview/...)
     submission_status: SubmissionStatus;
-    brief_snapshot?: string;  // Brief content captured at submission time
+    brief_snapshot?: string;  // Brief content captured at submission time (detail reads only)
     webhook_response?: string;      // Raw JSON from n8n
     ai_analysis_result?: string;    // Normalized JSON: AIAnalysisResult
     ai_score?: number;
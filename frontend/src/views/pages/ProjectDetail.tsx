@@ -224,6 +224,11 @@ const ProjectDetail: React.FC = () => {
                 projectsService.getTaskSubmissions(task.id),
                 projectsService.getTaskFeedbacks(task.id),
             ]);
+            // The list has no brief_snapshot; fetch it for the submission shown below
+            const shown = subs[subs.length - 1];
+            if (shown) {
+                subs[subs.length - 1] = await projectsService.getSubmission(shown.id).catch(() => shown);
+            }
             setDetailSubs(subs);
             setDetailFeedbacks(feedbacks);
         } catch {